@@ -0,0 +1,101 @@
+"""Bytes and allocation time per run event: legacy dataclass vs RuntimeEvent.
+
+    python benchmarks/event_records.py [count]
+
+The legacy layout is the previous `RuntimeEvent` dataclass, built the way the
+execution context used to build it (aware `datetime.now` per event). Payloads
+are shared between all layouts so only the record itself is measured. The
+tuple row is a plain tuple subclass holding the same fields, for reference.
+
+Measured on CPython 3.11 (100k events), RuntimeEvent takes about 160 B per
+event against 216 B (1.35x) and allocates 2-3x faster, depending on the
+machine; the saving per event is short of 3x. A tuple-backed record
+allocates faster still but takes 176 B: the sequence id and the ns reading
+are separate int objects in any per-record layout.
+"""
+
+import sys
+import time
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from synthflow.runtime.models import RunClock, RuntimeEvent
+
+
+@dataclass
+class LegacyEvent:
+    run_id: str
+    sequence_id: int
+    timestamp: datetime
+    event: str
+    data: object = None
+    node_id: str | None = None
+    node_type: str | None = None
+
+
+RUN_ID = "run-1"
+PAYLOAD = {"text": "x"}
+CLOCK = RunClock()
+
+
+def legacy(count):
+    return [
+        LegacyEvent(
+            run_id=RUN_ID,
+            sequence_id=index,
+            timestamp=datetime.now(timezone.utc),
+            event="token",
+            data=PAYLOAD,
+            node_id="writer",
+            node_type="Writer",
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def compact(count):
+    return [
+        RuntimeEvent(RUN_ID, index, None, "token", PAYLOAD, "writer", "Writer", time.monotonic_ns(), CLOCK)
+        for index in range(1, count + 1)
+    ]
+
+
+class TupleEvent(tuple):
+    __slots__ = ()
+
+
+def tuple_backed(count):
+    return [
+        TupleEvent((RUN_ID, index, "token", PAYLOAD, "writer", "Writer", time.monotonic_ns(), CLOCK))
+        for index in range(1, count + 1)
+    ]
+
+
+def bytes_per_event(build, count):
+    tracemalloc.start()
+    events = build(count)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # The list holding the events is not part of a record.
+    return (size - sys.getsizeof(events)) / count
+
+
+def ns_per_event(build, count):
+    return min(timeit.repeat(lambda: build(count), number=1, repeat=5)) / count * 1e9
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = []
+    for name, build in (("legacy dataclass", legacy), ("RuntimeEvent", compact), ("tuple-backed", tuple_backed)):
+        rows.append((name, bytes_per_event(build, count), ns_per_event(build, count)))
+    for name, size, elapsed in rows:
+        print(f"{name:<18} {size:7.1f} B/event {elapsed:8.1f} ns/event")
+    (_, old_size, old_time), (_, new_size, new_time) = rows[:2]
+    print(f"{'RuntimeEvent gain':<18} {old_size / new_size:7.2f}x        {old_time / new_time:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
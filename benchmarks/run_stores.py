@@ -0,0 +1,81 @@
+"""Append and replay throughput of the RunStore backends.
+
+    python benchmarks/run_stores.py [events]
+
+Each store receives `events` token events spread over 8 interleaved runs,
+then every run is replayed with `list_events` and the tail of one run is
+paged the way a reconnecting client would.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from synthflow.runtime.models import RunClock, RunRecord, RuntimeEvent
+from synthflow.runtime.segments import SegmentedRunStore
+from synthflow.runtime.sqlite import SQLiteRunStore
+from synthflow.runtime.store import InMemoryRunStore
+
+RUNS = 8
+
+
+def make_events(count):
+    clock = RunClock()
+    return [
+        RuntimeEvent(
+            f"run-{index % RUNS}",
+            index // RUNS + 1,
+            None,
+            "token",
+            {"text": f"token {index}"},
+            "writer",
+            "Writer",
+            clock.monotonic_ns + index,
+            clock,
+        )
+        for index in range(count)
+    ]
+
+
+def measure(store, events):
+    for run in range(RUNS):
+        store.create_run(RunRecord(run_id=f"run-{run}", flow_name="Flow", status="running"))
+    started = time.perf_counter()
+    for event in events:
+        store.append_event(event)
+    appended = time.perf_counter()
+    replayed = sum(len(store.list_events(f"run-{run}")) for run in range(RUNS))
+    replay_done = time.perf_counter()
+    tail = len(events) // RUNS - 100
+    for _ in range(100):
+        store.page_events("run-0", after_sequence_id=tail, limit=100)
+    paged = time.perf_counter()
+    assert replayed == len(events)
+    return (
+        len(events) / (appended - started),
+        replayed / (replay_done - appended),
+        (paged - replay_done) / 100 * 1e6,
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    events = make_events(count)
+    with tempfile.TemporaryDirectory() as directory:
+        stores = (
+            ("InMemoryRunStore", InMemoryRunStore()),
+            ("SegmentedRunStore", SegmentedRunStore(os.path.join(directory, "segments"), segment_bytes=8 << 20)),
+            ("SQLiteRunStore", SQLiteRunStore(os.path.join(directory, "runs.db"))),
+        )
+        print(f"{'store':<18} {'append ev/s':>12} {'replay ev/s':>12} {'tail page us':>13}")
+        for name, store in stores:
+            append_rate, replay_rate, page_us = measure(store, events)
+            print(f"{name:<18} {append_rate:12,.0f} {replay_rate:12,.0f} {page_us:13.1f}")
+            close = getattr(store, "close", None)
+            if close is not None:
+                close()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,7 @@ from fastapi.responses import HTMLResponse, StreamingResponse
 
 from synthflow.core.flow import Flow
 from synthflow.core.node import Node, ResultRef
+from synthflow.execution.stream import CoalesceRule
 
 
 class LoadConfig(Node):
@@ -93,7 +94,9 @@ def build_chat_flow(message: str) -> Flow:
         >> StreamDeepSeek(id="assistant").input(
             config=ResultRef("config"),
             prompt=ResultRef("prompt"),
-        )
+        ),
+        # Batch per-delta tokens into ~30ms chunks to cut events and SSE writes.
+        coalesce={"token": CoalesceRule(window=0.03, max_size=256)},
     )
 
 
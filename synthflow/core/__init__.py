@@ -1,7 +1,8 @@
 from synthflow.core.condition import IF, OR, SWITCH, If, Switch
-from synthflow.core.dsl import PARALLEL
+from synthflow.core.dsl import MAP, PARALLEL
 from synthflow.core.flow import Flow
 from synthflow.core.node import Node, ResultRef
+from synthflow.core.mapping import Map
 from synthflow.core.parallel import Parallel
 
 __all__ = [
@@ -9,10 +10,12 @@ __all__ = [
     "Node",
     "ResultRef",
     "Parallel",
+    "Map",
     "If",
     "Switch",
     "IF",
     "OR",
     "SWITCH",
     "PARALLEL",
+    "MAP",
 ]
@@ -0,0 +1,148 @@
+from synthflow.core.datastore import MISSING
+from synthflow.core.ref import ResultRef
+from synthflow.types.field import validate_params
+
+
+class InputBinder:
+    """Argument builder compiled once from a node's `.input(...)` declaration.
+
+    ResultRef placeholders are located up front; subtrees without any
+    placeholder are reused as-is on every execution instead of being rebuilt.
+    """
+
+    def __init__(self, node, args=(), kwargs=None):
+        kwargs = kwargs or {}
+        self.node = node
+        self.inputs = tuple((dtype, dtype.__name__) for dtype in node.inputs)
+        self.schema = getattr(node, "params_schema", None) or None
+
+        self.args = _compile(tuple(args))
+        self.static_kwargs = {}
+        self.dynamic_kwargs = []
+        for key, value in kwargs.items():
+            slot = _compile(value)
+            if _is_slot(slot):
+                self.dynamic_kwargs.append((key, slot))
+            else:
+                self.static_kwargs[key] = value
+
+    def refs(self):
+        """Yield every ResultRef placeholder recorded at compile time."""
+        if _is_slot(self.args):
+            yield from self.args.refs()
+        for _, slot in self.dynamic_kwargs:
+            yield from slot.refs()
+
+    def bind(self, store):
+        node = self.node
+        kwargs = {}
+        if self.inputs:
+            missing = []
+            for dtype, name in self.inputs:
+                value = store.get(dtype, MISSING)
+                if value is MISSING:
+                    missing.append(name)
+                else:
+                    kwargs[name] = value
+            if missing:
+                raise Exception(f"{node.id or node.__class__.__name__} missing inputs: {missing}")
+
+        args = self.args(store) if _is_slot(self.args) else self.args
+        if node.params:
+            kwargs.update(node.params)
+        if self.static_kwargs:
+            kwargs.update(self.static_kwargs)
+        for key, slot in self.dynamic_kwargs:
+            kwargs[key] = slot(store)
+        if self.schema:
+            validate_params(self.schema, kwargs)
+
+        return args, kwargs
+
+
+class _RefSlot:
+    __slots__ = ("ref",)
+
+    def __init__(self, ref):
+        self.ref = ref
+
+    def __call__(self, store):
+        return resolve_ref(self.ref, store)
+
+    def refs(self):
+        yield self.ref
+
+
+class _ContainerSlot:
+    # Rebuilds a list/tuple/dict by copying a template and filling only the
+    # positions that hold placeholders.
+    __slots__ = ("factory", "template", "slots")
+
+    def __init__(self, factory, template, slots):
+        self.factory = factory
+        self.template = template
+        self.slots = slots
+
+    def __call__(self, store):
+        filled = self.template.copy()
+        for position, slot in self.slots:
+            filled[position] = slot(store)
+        if self.factory is None:
+            return filled
+        return self.factory(filled)
+
+    def refs(self):
+        for _, slot in self.slots:
+            yield from slot.refs()
+
+
+def _compile(value):
+    """Return `value` itself when it holds no ResultRef, else a resolver."""
+    if isinstance(value, ResultRef):
+        return _RefSlot(value)
+    if isinstance(value, dict):
+        template = dict(value)
+        slots = _compile_children(template, value.items())
+        if not slots:
+            return value
+        return _ContainerSlot(None if type(value) is dict else type(value), template, slots)
+    if isinstance(value, (list, tuple)):
+        template = list(value)
+        slots = _compile_children(template, enumerate(value))
+        if not slots:
+            return value
+        return _ContainerSlot(None if type(value) is list else type(value), template, slots)
+    return value
+
+
+def _compile_children(template, items):
+    slots = []
+    for position, child in items:
+        compiled = _compile(child)
+        if _is_slot(compiled):
+            slots.append((position, compiled))
+            template[position] = None
+    return slots
+
+
+def _is_slot(value):
+    return isinstance(value, (_RefSlot, _ContainerSlot))
+
+
+def resolve_ref(ref: ResultRef, store):
+    # Resolve from most-specific to most-generic lookup path.
+    value = store.lookup_result(ref.node_id, ref.output_type)
+    if value is MISSING:
+        raise Exception(f"ResultRef from node '{ref.node_id}' not found in store")
+
+    # Optional index extraction applies to sequence-like node outputs.
+    if isinstance(value, (list, tuple)) and ref.output_index is not None:
+        try:
+            value = value[ref.output_index]
+        except IndexError:
+            raise Exception(f"ResultRef index {ref.output_index} out of range for node '{ref.node_id}'")
+
+    if ref.transform is not None:
+        value = ref.transform(value)
+
+    return value
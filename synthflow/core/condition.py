@@ -1,5 +1,3 @@
-import asyncio
-
 from synthflow.core.node import Node
 
 
@@ -10,23 +8,10 @@ class If(Node):
         self.then_node = then_node
         self.else_node = else_node
 
-    async def execute(self, store):
-        self._record_node_event(store, "started", "Node execution started")
-        try:
-            # Evaluate condition once against current store snapshot.
-            target = self.then_node if self.condition(store) else self.else_node
-            if target is not None:
-                store = await target.execute(store)
-            self._record_node_event(store, "succeeded", "Node execution succeeded")
-            if self.next_node:
-                return await self.next_node.execute(store)
-            return store
-        except asyncio.CancelledError:
-            self._record_node_event(store, "cancelled", "Node execution cancelled")
-            raise
-        except Exception as exc:
-            self._record_node_event(store, "failed", f"Node execution failed: {exc}")
-            raise
+    def select_branch(self, store):
+        # Evaluate condition once against current store snapshot; the compiled
+        # plan maps True/False onto the then/else branch bodies.
+        return bool(self.condition(store))
 
 
 class Switch(Node):
@@ -36,24 +21,9 @@ class Switch(Node):
         self.cases = cases
         self.default = default
 
-    async def execute(self, store):
-        self._record_node_event(store, "started", "Node execution started")
-        try:
-            # Missing key falls back to default branch (if provided).
-            key = self.selector(store)
-            target = self.cases.get(key, self.default)
-            if target is not None:
-                store = await target.execute(store)
-            self._record_node_event(store, "succeeded", "Node execution succeeded")
-            if self.next_node:
-                return await self.next_node.execute(store)
-            return store
-        except asyncio.CancelledError:
-            self._record_node_event(store, "cancelled", "Node execution cancelled")
-            raise
-        except Exception as exc:
-            self._record_node_event(store, "failed", f"Node execution failed: {exc}")
-            raise
+    def select_branch(self, store):
+        # Missing key falls back to default branch (if provided) in the plan.
+        return self.selector(store)
 
 
 def OR(*conditions):
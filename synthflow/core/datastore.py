@@ -1,10 +1,17 @@
+# Returned by `lookup_result` so a stored `None` is distinguishable from a miss.
+MISSING = object()
+
+
 class DataStore:
-    def __init__(self):
+    def __init__(self, parent=None):
+        # With a `parent`, this store is a copy-on-write overlay: reads fall
+        # through to the parent and the local dicts only hold this layer's writes.
+        self._parent = parent
         self._data = {}
         self._source = {}
         self._by_node = {}
         self._node_result = {}
-        self._execution_context = None
+        self._execution_context = parent._execution_context if parent is not None else None
 
     def set(self, dtype, value, source=None):
         # `dtype` (usually a class) acts as the typed data channel key.
@@ -20,51 +27,85 @@ class DataStore:
             self._node_result[node_id] = value
 
     def get_node_result(self, node_id):
-        return self._node_result.get(node_id)
+        return self._lookup("_node_result", node_id, None)
+
+    def has_node_result(self, node_id):
+        return self._lookup("_node_result", node_id, MISSING) is not MISSING
 
-    def get(self, dtype):
-        return self._data.get(dtype)
+    def node_writes(self, node_id):
+        """This layer's node result for `node_id` (or MISSING) and the typed outputs it wrote."""
+        return self._node_result.get(node_id, MISSING), dict(self._by_node.get(node_id, ()))
+
+    def get(self, dtype, default=None):
+        return self._lookup("_data", dtype, default)
 
     def has(self, dtype):
-        return dtype in self._data
+        return self._lookup("_data", dtype, MISSING) is not MISSING
 
     def get_from_node(self, node_id, output_type=None):
         # Node-scoped lookup is used by ResultRef(node_id=...).
-        node_outputs = self._by_node.get(node_id, {})
-        if output_type is not None:
-            return node_outputs.get(output_type)
-        for _, value in node_outputs.items():
-            return value
-        return None
+        value = self._node_output(node_id, output_type)
+        return None if value is MISSING else value
+
+    def lookup_result(self, node_id, output_type=None):
+        # ResultRef resolution path, most-specific first. Every step is a hash
+        # lookup per layer: `_by_node` is the source-id index kept up to date by `set`.
+        value = self._lookup("_node_result", node_id, MISSING)
+        if value is MISSING:
+            value = self._node_output(node_id, output_type)
+        if value is MISSING and output_type is not None:
+            value = self._lookup("_data", output_type, MISSING)
+        return value
+
+    def seed(self, values):
+        """Pre-populate a run: str keys become node results, other keys typed channels."""
+        for key, value in values.items():
+            if isinstance(key, str):
+                self.set_node_result(key, value)
+            else:
+                self.set(key, value)
+
+    def overlay(self):
+        """Return a branch store that reads through to this one and records only its own writes."""
+        return DataStore(parent=self)
 
     def merge(self, other, on_conflict="overwrite"):
         # Used by Parallel to fold branch stores into a single parent store.
+        # For an overlay branch only its own writes are visited, so the cost
+        # scales with what the branch produced rather than with store size.
         if on_conflict not in {"overwrite", "keep", "error"}:
             raise ValueError(f"Unsupported merge conflict policy: {on_conflict}")
 
         for dtype, value in other._data.items():
-            if dtype in self._data:
+            current = self.get(dtype, MISSING)
+            if current is not MISSING:
                 if on_conflict == "keep":
                     continue
-                if on_conflict == "error" and self._data[dtype] != value:
+                if on_conflict == "error" and current != value:
                     raise ValueError(f"Data conflict on dtype '{dtype}' during parallel merge")
 
             source = other._source.get(dtype)
             self.set(dtype, value, source=source)
         for node_id, value in other._node_result.items():
-            if node_id in self._node_result:
+            current = self._lookup("_node_result", node_id, MISSING)
+            if current is not MISSING:
                 if on_conflict == "keep":
                     continue
-                if on_conflict == "error" and self._node_result[node_id] != value:
+                if on_conflict == "error" and current != value:
                     raise ValueError(f"Node result conflict on node '{node_id}' during parallel merge")
             self._node_result[node_id] = value
 
     def copy(self):
-        new = DataStore()
-        new._data = self._data.copy()
-        new._source = self._source.copy()
-        new._by_node = {node_id: bucket.copy() for node_id, bucket in self._by_node.items()}
-        new._node_result = self._node_result.copy()
+        # Always returns a flat, independent store, even when called on an overlay.
+        if self._parent is not None:
+            new = self._parent.copy()
+        else:
+            new = DataStore()
+        new._data.update(self._data)
+        new._source.update(self._source)
+        for node_id, bucket in self._by_node.items():
+            new._by_node.setdefault(node_id, {}).update(bucket)
+        new._node_result.update(self._node_result)
         new._execution_context = self._execution_context
         return new
 
@@ -74,3 +115,37 @@ class DataStore:
 
     def get_execution_context(self):
         return self._execution_context
+
+    def _lookup(self, attr, key, default):
+        layer = self
+        while layer is not None:
+            values = getattr(layer, attr)
+            if key in values:
+                return values[key]
+            layer = layer._parent
+        return default
+
+    def _node_output(self, node_id, output_type):
+        if output_type is None:
+            # "First output" follows the order the node's outputs were first
+            # written, which lives in the outermost layer that saw the node.
+            output_type = self._first_output_type(node_id)
+            if output_type is MISSING:
+                return MISSING
+        layer = self
+        while layer is not None:
+            bucket = layer._by_node.get(node_id)
+            if bucket and output_type in bucket:
+                return bucket[output_type]
+            layer = layer._parent
+        return MISSING
+
+    def _first_output_type(self, node_id):
+        first = MISSING
+        layer = self
+        while layer is not None:
+            bucket = layer._by_node.get(node_id)
+            if bucket:
+                first = next(iter(bucket))
+            layer = layer._parent
+        return first
@@ -1,5 +1,6 @@
 from synthflow.core.condition import IF, OR, SWITCH, If, Switch
 from synthflow.core.flow import Flow
+from synthflow.core.mapping import Map
 from synthflow.core.node import ResultRef
 from synthflow.core.parallel import Parallel
 
@@ -8,14 +9,20 @@ def PARALLEL(*nodes, id=None, on_conflict="overwrite"):
     return Parallel(*nodes, id=id, on_conflict=on_conflict)
 
 
+def MAP(items, template, concurrency=8, collect=None, id=None):
+    return Map(items, template, concurrency=concurrency, collect=collect, id=id)
+
+
 __all__ = [
     "Flow",
     "IF",
+    "MAP",
     "OR",
     "PARALLEL",
     "SWITCH",
     "If",
     "Switch",
+    "Map",
     "Parallel",
     "ResultRef",
 ]
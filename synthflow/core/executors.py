@@ -0,0 +1,101 @@
+import asyncio
+import contextvars
+import inspect
+import pickle
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+
+_process_pool = None
+
+
+def resolve_call(node):
+    """Pick the innermost call for `node` once, from its `executor` setting.
+
+    `executor` may be "inline", "thread", "process" or a concurrent.futures
+    Executor. When unset, coroutine `run` methods (also behind `functools.wraps`
+    decorators) stay on the event loop and plain `def run` methods are
+    offloaded to the default thread pool. A thread call that returns an
+    awaitable is awaited back on the caller's loop.
+    """
+    executor = getattr(node, "executor", None)
+    if executor is None:
+        executor = INLINE if inspect.iscoroutinefunction(inspect.unwrap(node.run)) else THREAD
+    if executor == INLINE:
+        return call_inline
+    if executor == THREAD:
+        return partial(call_in_thread, None)
+    if executor == PROCESS or isinstance(executor, ProcessPoolExecutor):
+        return partial(call_in_process, executor if isinstance(executor, Executor) else None)
+    if isinstance(executor, Executor):
+        return partial(call_in_thread, executor)
+    raise ValueError(f"Unsupported node executor: {executor!r}")
+
+
+async def call_inline(node, args, kwargs):
+    result = node.run(*args, **kwargs)
+    if inspect.iscoroutine(result):
+        return await result
+    return result
+
+
+async def call_in_thread(executor, node, args, kwargs):
+    # Copy the context so `emit_event` keeps working from the worker thread.
+    context = contextvars.copy_context()
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(executor, partial(context.run, node.run, *args, **kwargs))
+    if inspect.isawaitable(result):
+        # Loop-bound clients, locks and queues only work on the caller's loop.
+        return await result
+    return result
+
+
+async def call_in_process(executor, node, args, kwargs):
+    # Pickle up front so unserializable inputs fail with the node named,
+    # instead of surfacing as an opaque error from inside the pool.
+    node_name = node.id or node.__class__.__name__
+    try:
+        payload = pickle.dumps((_detached(node), args, kwargs))
+    except Exception as exc:
+        raise TypeError(f"{node_name} arguments cannot be sent to a process pool: {exc}") from exc
+
+    loop = asyncio.get_running_loop()
+    packed = await loop.run_in_executor(executor or _get_process_pool(), _run_pickled, payload, node_name)
+    return pickle.loads(packed)
+
+
+def _run_pickled(payload, node_name):
+    node, args, kwargs = pickle.loads(payload)
+    result = node.run(*args, **kwargs)
+    if inspect.iscoroutine(result):
+        # A child process has no caller loop to hand the coroutine back to.
+        result = asyncio.run(result)
+    try:
+        return pickle.dumps(result)
+    except Exception as exc:
+        raise TypeError(f"{node_name} result cannot be returned from a process pool: {exc}") from None
+
+
+def _detached(node):
+    # Ship the node without its graph links, plugins, input declarations or
+    # compiled helpers; the resolved args travel separately.
+    clone = object.__new__(node.__class__)
+    clone.__dict__.update(node.__dict__)
+    clone.next_node = None
+    clone.plugins = []
+    clone._plugin_chain = None
+    clone._input_args = ()
+    clone._input_kwargs = {}
+    clone._input_binder = None
+    clone._execute_plan = None
+    return clone
+
+
+def _get_process_pool():
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor()
+    return _process_pool
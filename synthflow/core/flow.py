@@ -1,18 +1,50 @@
+from synthflow.core.mapping import Map
 from synthflow.core.parallel import Parallel
 from synthflow.core.condition import If, Switch
 import asyncio
+from synthflow.execution.batch import BatchRun
 from synthflow.execution.context import ExecutionContext
 from synthflow.execution.engine import Engine
-from synthflow.runtime.store import InMemoryRunStore
+from synthflow.execution.hub import EventHub
+from synthflow.execution.plan import compile_plan, graph_signature
+from synthflow.runtime.models import INPUTS_CHECKPOINT
+from synthflow.runtime.store import InMemoryRunStore, RunRetention
 from synthflow.visualization.graphviz import to_dot
 
 class Flow:
-    def __init__(self, start_node, engine=None, run_store=None):
+    def __init__(
+        self,
+        start_node,
+        engine=None,
+        run_store=None,
+        event_level="full",
+        coalesce=None,
+        event_retention=None,
+        checkpoint=False,
+        max_runs=1000,
+    ):
         self.start_node = self._normalize_start(start_node)
+        # The node graph is compiled into a flat plan that the scheduler walks
+        # in a loop; `plan` recompiles it when the wiring changes afterwards.
+        self._plan = compile_plan(self.start_node)
         self.engine = engine or Engine()
         # The store is injected at the flow level so multiple executions can be
-        # queried later by run_id through a shared persistence backend.
-        self.run_store = run_store or InMemoryRunStore()
+        # queried later by run_id through a shared persistence backend. The
+        # default one keeps the latest `max_runs` finished runs (None keeps all)
+        # so long-lived workers stay bounded; `max_runs` does not apply to a
+        # `run_store` passed in.
+        self.run_store = run_store or InMemoryRunStore(run_retention=RunRetention(max_runs=max_runs))
+        # Live events of this flow's runs for `subscribe`; replay comes from run_store.
+        self.hub = EventHub(self.run_store)
+        # off | flow | node | full; see ExecutionContext.event_level.
+        self.event_level = event_level
+        # Per-event-name CoalesceRule, e.g. {"token": CoalesceRule(window=0.05)}.
+        self.coalesce = coalesce or {}
+        # EventRetention for each run's in-context event log (None keeps all).
+        self.event_retention = event_retention
+        # Save each succeeded node's results through run_store so failed runs
+        # can be continued with `resume(run_id)`.
+        self.checkpoint = checkpoint
         self.last_execution = None
 
     def _normalize_start(self, start_node):
@@ -20,32 +52,100 @@ class Flow:
             if not start_node:
                 raise ValueError("Flow requires at least one node")
             root = start_node[0]
+            # Track the tail while linking so building long lists stays linear.
+            tail = root
             for node in start_node[1:]:
-                root >> node
+                while tail.next_node is not None:
+                    tail = tail.next_node
+                tail.next_node = node
             return root
         return start_node
 
-    async def run(self, return_context=False):
-        # Keep backwards compatibility: by default return DataStore.
-        # `last_execution` is set before run so failures still leave diagnostics.
-        context = ExecutionContext(run_store=self.run_store, flow_name=self.__class__.__name__)
+    @property
+    def plan(self):
+        # Checking the wiring is a walk over the graph, far cheaper than a
+        # compile; an unchanged graph keeps its plan and cached DAG.
+        if self._plan.signature != graph_signature(self.start_node):
+            self._plan = compile_plan(self.start_node)
+        return self._plan
+
+    def compile(self):
+        self._plan = compile_plan(self.start_node)
+        return self._plan
+
+    def _new_context(self, run_id=None, inputs=None, stream=False, resume=None, **stream_options):
+        # `resume` is (run, checkpoints, plan) from `resume`.
+        options = {
+            "run_store": self.run_store,
+            "flow_name": self.__class__.__name__,
+            "event_level": self.event_level,
+            "coalesce": self.coalesce,
+            "event_retention": self.event_retention,
+            "hub": self.hub,
+            "checkpoint": self.checkpoint or resume is not None,
+            "stream_enabled": stream,
+            **stream_options,
+        }
+        if run_id is not None:
+            options["run_id"] = run_id
+        context = ExecutionContext(**options)
         context.attach_loop(asyncio.get_running_loop())
+        if resume is not None:
+            run, checkpoints, plan = resume
+            context.resume_run(run, checkpoints, plan.nodes())
+            return context
+        if inputs:
+            context.store.seed(inputs)
         context.initialize_run()
+        context.checkpoint_inputs(inputs or {})
+        return context
+
+    async def run(self, return_context=False, inputs=None):
+        # Keep backwards compatibility: by default return DataStore.
+        # `last_execution` is set before run so failures still leave diagnostics.
+        context = self._new_context(inputs=inputs)
         self.last_execution = context
-        await self.engine.run(self.start_node, context=context)
+        await self.engine.run(self.plan, context=context)
         if return_context:
             return context
         return context.store
 
-    async def run_stream(self):
-        context = ExecutionContext(run_store=self.run_store, flow_name=self.__class__.__name__)
-        context.attach_loop(asyncio.get_running_loop())
-        context.initialize_run()
+    async def resume(self, run_id: str, return_context=False):
+        """Continue a failed, cancelled or interrupted run under the same run_id.
+
+        The DataStore is rebuilt from the run's checkpoints (see `checkpoint`)
+        and every node that already succeeded, including completed Parallel
+        branches and nodes inside If/Switch branches, is skipped. Map items
+        are not checkpointed individually: an unfinished Map runs again.
+        Raises KeyError for an unknown run and ValueError for a run that
+        succeeded, is still live or was run without checkpointing.
+        """
+        run = await self.run_store.aget_run(run_id)
+        if run is None:
+            raise KeyError(f"Unknown run: {run_id}")
+        if run.status == "succeeded" or self.hub.is_live(run_id):
+            raise ValueError(f"Run {run_id} is {run.status} and cannot be resumed")
+        checkpoints = await self.run_store.aload_checkpoints(run_id)
+        if INPUTS_CHECKPOINT not in checkpoints:
+            # Every checkpointed run saves its inputs first, even when empty.
+            raise ValueError(f"Run {run_id} has no checkpoints; run it with checkpoint=True to resume it")
+        plan = self.plan
+        context = self._new_context(run_id=run_id, resume=(run, checkpoints, plan))
+        self.last_execution = context
+        await self.engine.run(plan, context=context)
+        if return_context:
+            return context
+        return context.store
+
+    async def run_stream(self, max_queue_size=None, policy="block"):
+        # `max_queue_size` bounds queued token/custom events for slow consumers;
+        # `policy` is "block", "drop_oldest" or "coalesce" (see StreamBuffer).
+        context = self._new_context(stream=True, stream_max_size=max_queue_size, stream_policy=policy)
         self.last_execution = context
 
         async def runner():
             try:
-                await self.engine.run(self.start_node, context=context)
+                await self.engine.run(self.plan, context=context)
             finally:
                 context.close_stream()
 
@@ -63,12 +163,25 @@ class Flow:
 
         await task
 
+    def run_many(self, inputs, concurrency=10):
+        # Every run shares the compiled plan and run store; `inputs` is an
+        # iterable of per-run seeds (see `DataStore.seed`).
+        return BatchRun(self, inputs, concurrency=concurrency)
+
     def get_run(self, run_id: str):
         return self.run_store.get_run(run_id)
 
     def get_run_events(self, run_id: str, after_sequence_id: int | None = None):
         return self.run_store.list_events(run_id, after_sequence_id=after_sequence_id)
 
+    def get_run_events_page(self, run_id: str, after_sequence_id: int | None = None, limit: int = 500):
+        # Bounded catch-up for polling clients; see EventPage.next_cursor.
+        return self.run_store.page_events(run_id, after_sequence_id=after_sequence_id, limit=limit)
+
+    def subscribe(self, run_id: str, after_sequence_id: int | None = None, max_buffer: int = 1000):
+        # Any number of clients can follow a run; see Subscription.
+        return self.hub.subscribe(run_id, after_sequence_id=after_sequence_id, max_buffer=max_buffer)
+
     def get_run_snapshot(self, run_id: str):
         # Snapshot access is the read path used by reconnecting frontends.
         return self.run_store.get_snapshot(run_id)
@@ -92,6 +205,8 @@ class Flow:
         if isinstance(node, Parallel):
             for idx, sub in enumerate(node.nodes, start=1):
                 children.append((f"parallel-{idx}", sub))
+        if isinstance(node, Map):
+            children.append(("map", node.template))
         if isinstance(node, If):
             children.append(("then", node.then_node))
             if node.else_node:
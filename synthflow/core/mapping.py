@@ -0,0 +1,38 @@
+from .binder import resolve_ref
+from .node import Node
+from .ref import ResultRef
+
+
+class Map(Node):
+    def __init__(self, items, template, concurrency=8, collect=None, id=None):
+        if not id:
+            raise ValueError("Map requires an id; template nodes read the current item via ResultRef(id)")
+        if concurrency < 1:
+            raise ValueError("Map concurrency must be >= 1")
+        super().__init__(id=id)
+        # `items` is usually a ResultRef to an upstream iterable; plain iterables also work.
+        self.items = items
+        self.template = template
+        self.concurrency = concurrency
+        # Per-item result defaults to the template chain's last node result.
+        self.collect = collect or ResultRef(_tail(template).id)
+
+    def resolve_items(self, store):
+        if isinstance(self.items, ResultRef):
+            return resolve_ref(self.items, store)
+        return self.items
+
+    def bind_item(self, store, item):
+        # Inside an item branch, ResultRef(map_id) resolves to the current item.
+        store.set_node_result(self.id, item)
+
+    def collect_result(self, store):
+        return resolve_ref(self.collect, store)
+
+
+def _tail(node):
+    while node.next_node is not None:
+        node = node.next_node
+    if not node.id:
+        raise ValueError("Map template tail node needs an id, or pass collect=ResultRef(...)")
+    return node
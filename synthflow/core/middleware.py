@@ -0,0 +1,82 @@
+import inspect
+from functools import partial
+
+from .executors import call_inline
+
+# `argc` of runners that take the resolved call inputs as well.
+_WITH_INPUTS = -1
+
+
+class PluginChain:
+    """Onion-style plugin middleware resolved once and reused across executions.
+
+    Each plugin is reduced to a `(runner, argc)` pair when the chain is built,
+    so executing a node never inspects plugin signatures again. The first
+    registered plugin is outermost. Plugins that set `wants_inputs = True`
+    are called as `(call_next, store, node, args, kwargs)` with the resolved
+    inputs of the call, e.g. to key a cache.
+    """
+
+    __slots__ = ("plugins", "call", "_runners")
+
+    def __init__(self, plugins=(), call=call_inline):
+        self.plugins = tuple(plugins)
+        # `call(node, args, kwargs)` is the innermost layer that invokes run().
+        self.call = call
+        self._runners = tuple(_resolve_runner(plugin) for plugin in self.plugins)
+
+    def __len__(self):
+        return len(self._runners)
+
+    async def invoke(self, node, store, args, kwargs):
+        if not self._runners:
+            return await self.call(node, args, kwargs)
+        return await _Invocation(self, node, store, args, kwargs).call(0)
+
+
+class _Invocation:
+    # Per-call state shared by every layer so the chain itself stays immutable.
+    __slots__ = ("chain", "runners", "node", "store", "args", "kwargs")
+
+    def __init__(self, chain, node, store, args, kwargs):
+        self.chain = chain
+        self.runners = chain._runners
+        self.node = node
+        self.store = store
+        self.args = args
+        self.kwargs = kwargs
+
+    async def call(self, index):
+        if index == len(self.runners):
+            return await self.chain.call(self.node, self.args, self.kwargs)
+
+        runner, argc = self.runners[index]
+        call_next = partial(self.call, index + 1)
+        # Support simple plugin forms while keeping a stable call_next contract.
+        if argc == _WITH_INPUTS:
+            outcome = runner(call_next, self.store, self.node, self.args, self.kwargs)
+        elif argc >= 3:
+            outcome = runner(call_next, self.store, self.node)
+        elif argc == 2:
+            outcome = runner(call_next, self.store)
+        elif argc == 1:
+            outcome = runner(call_next)
+        else:
+            outcome = runner()
+
+        if inspect.iscoroutine(outcome):
+            return await outcome
+        return outcome
+
+
+def _resolve_runner(plugin):
+    runner = getattr(plugin, "run", None)
+    if runner is None and callable(plugin):
+        runner = plugin
+    if runner is None:
+        raise TypeError(f"Plugin {plugin!r} must be callable or define run(...)")
+    if getattr(plugin, "wants_inputs", False):
+        # Opt-in rather than inferred from the signature, so plugins with
+        # extra optional parameters keep their usual form.
+        return runner, _WITH_INPUTS
+    return runner, len(inspect.signature(runner).parameters)
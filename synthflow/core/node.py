@@ -1,49 +1,37 @@
 import asyncio
 import contextvars
 import inspect
+import sys
+from .binder import InputBinder
 from .datastore import DataStore
-from synthflow.types.validator import validate_node_output, validate_node_params
+from .executors import resolve_call
+from .middleware import PluginChain
+from .ref import ResultRef
+from synthflow.types.validator import validate_node_output
 
 
 _current_execution_context = contextvars.ContextVar("synthflow_execution_context", default=None)
 
 
-class ResultRef:
-    def __init__(self, node_id, output_type=None, output_index=None, transform=None):
-        self.node_id = node_id
-        self.output_type = output_type
-        self.output_index = output_index
-        self.transform = transform
-
-    def map(self, transform):
-        # Compose transforms so chained .map() calls are evaluated in declaration order.
-        if self.transform is None:
-            chained = transform
-        else:
-            def chained(value):
-                return transform(self.transform(value))
-        return ResultRef(
-            node_id=self.node_id,
-            output_type=self.output_type,
-            output_index=self.output_index,
-            transform=chained,
-        )
-
-    def item(self, index):
-        return self.map(lambda value: value[index])
-
-
 class Node:
     inputs = []
     outputs = []
+    # None offloads sync `run` methods to threads and keeps async ones inline;
+    # see synthflow.core.executors for "inline" / "thread" / "process".
+    executor = None
 
     def __init__(self, id=None, **params):
-        self.id = id
+        # Interned because every event and stored record of this node refers to it.
+        self.id = sys.intern(id) if isinstance(id, str) else id
         self.params = params
         self.next_node = None
         self.plugins = []
+        self._plugin_chain = None
         self._input_args = ()
         self._input_kwargs = {}
+        self._input_binder = None
+        # Plan for `execute` with this node as start; see graph_signature.
+        self._execute_plan = None
 
     def __rshift__(self, other):
         # Allow `a >> b >> c` style chaining by always appending to tail.
@@ -55,20 +43,44 @@ class Node:
 
     def use(self, plugin):
         self.plugins.append(plugin)
+        self.compile_plugins()
+        return self
+
+    def with_executor(self, executor):
+        """Override the class-level executor for this node instance."""
+        self.executor = executor
+        self.compile_plugins()
         return self
 
     def input(self, *args, **kwargs):
         """Dynamic args/kwargs for run(); values can include ResultRef placeholders."""
         self._input_args = args
         self._input_kwargs = kwargs
+        self.compile_inputs()
         return self
 
     async def execute(self, store: DataStore):
+        # Run this node and its successors through the same loop-based executor
+        # Flow uses. Imported lazily because the execution package imports core.
+        from synthflow.execution.plan import compile_plan, graph_signature
+        from synthflow.execution.scheduler import Scheduler
+
+        plan = self._execute_plan
+        if plan is None or plan.signature != graph_signature(self):
+            plan = self._execute_plan = compile_plan(self)
+        return await Scheduler().execute_plan(plan, store)
+
+    async def _execute_step(self, store: DataStore):
+        # Execute only this node; chaining to `next_node` is owned by the plan.
         # Emit lifecycle events for observability when flow runs via execution engine.
         self._record_node_event(store, "started", "Node execution started")
-        token = _current_execution_context.set(store.get_execution_context())
+        context = store.get_execution_context()
+        # The context var only serves `emit_event`; skip it when custom events are off.
+        token = None
+        if context is not None and context.custom_events_enabled:
+            token = _current_execution_context.set(context)
         try:
-            args, kwargs = await self._collect_inputs(store)
+            args, kwargs = self._collect_inputs(store)
             result = await self._invoke_with_plugins(store, args, kwargs)
             store.set_node_result(self.id, result)
             self._persist_result(store, result)
@@ -81,66 +93,21 @@ class Node:
         else:
             self._record_node_event(store, "succeeded", "Node execution succeeded")
         finally:
-            _current_execution_context.reset(token)
-
-        if self.next_node:
-            return await self.next_node.execute(store)
+            if token is not None:
+                _current_execution_context.reset(token)
         return store
 
-    async def _collect_inputs(self, store: DataStore):
+    def _collect_inputs(self, store: DataStore):
         """Collect run() args and resolve ResultRef placeholders."""
-        kwargs = {dtype.__name__: store.get(dtype) for dtype in self.inputs if store.has(dtype)}
-        missing = [dtype.__name__ for dtype in self.inputs if not store.has(dtype)]
-        if missing:
-            raise Exception(f"{self.id or self.__class__.__name__} missing inputs: {missing}")
-
-        args = self._resolve_results(self._input_args, store)
-        kwargs.update(self.params)
-        resolved_kwargs = self._resolve_results(self._input_kwargs, store)
-        kwargs.update(resolved_kwargs)
-        validate_node_params(self, kwargs)
-
-        return args, kwargs
-
-    def _resolve_results(self, value, store: DataStore):
-        """Recursively resolve ResultRef placeholders."""
-        if isinstance(value, ResultRef):
-            return self._resolve_single_result(value, store)
-        if isinstance(value, (list, tuple)):
-            return type(value)(self._resolve_results(v, store) for v in value)
-        if isinstance(value, dict):
-            return {k: self._resolve_results(v, store) for k, v in value.items()}
-        return value
-
-    def _resolve_single_result(self, nr: ResultRef, store: DataStore):
-        # Resolve from most-specific to most-generic lookup path.
-        value = store.get_node_result(nr.node_id)
-        if value is None:
-            value = store.get_from_node(nr.node_id, nr.output_type)
-        if value is None:
-            value = store.get(nr.output_type) if nr.output_type else None
-
-        if value is None:
-            for dtype, val in store._data.items():
-                source = store._source.get(dtype)
-                if getattr(source, "id", None) == nr.node_id:
-                    value = val
-                    break
-
-        if value is None:
-            raise Exception(f"ResultRef from node '{nr.node_id}' not found in store")
-
-        # Optional index extraction applies to sequence-like node outputs.
-        if isinstance(value, (list, tuple)) and nr.output_index is not None:
-            try:
-                value = value[nr.output_index]
-            except IndexError:
-                raise Exception(f"ResultRef index {nr.output_index} out of range for node '{nr.node_id}'")
-
-        if nr.transform is not None:
-            value = nr.transform(value)
-
-        return value
+        binder = self._input_binder
+        if binder is None:
+            binder = self.compile_inputs()
+        return binder.bind(store)
+
+    def compile_inputs(self):
+        """Locate ResultRef placeholders once so executions only fill them in."""
+        self._input_binder = InputBinder(self, self._input_args, self._input_kwargs)
+        return self._input_binder
 
     def _persist_result(self, store: DataStore, result):
         validate_node_output(self, result)
@@ -168,54 +135,23 @@ class Node:
                 store.set(dtype, value, source=self)
 
     async def _invoke_with_plugins(self, store: DataStore, args, kwargs):
-        async def base_call():
-            result = self.run(*args, **kwargs)
-            if inspect.iscoroutine(result):
-                return await result
-            return result
-
-        # Build onion-style middleware chain: first registered plugin is outermost.
-        call_next = base_call
-        for plugin in reversed(self.plugins):
-            prev = call_next
-
-            async def wrapped(plugin=plugin, prev=prev):
-                return await self._run_plugin(plugin, prev, store)
-
-            call_next = wrapped
-
-        return await call_next()
-
-    async def _run_plugin(self, plugin, call_next, store: DataStore):
-        runner = getattr(plugin, "run", None)
-        if runner is None and callable(plugin):
-            runner = plugin
-        if runner is None:
-            raise TypeError(f"Plugin {plugin!r} must be callable or define run(...)")
-
-        sig = inspect.signature(runner)
-        argc = len(sig.parameters)
-
-        # Support simple plugin forms while keeping a stable call_next contract.
-        if argc >= 3:
-            outcome = runner(call_next, store, self)
-        elif argc == 2:
-            outcome = runner(call_next, store)
-        elif argc == 1:
-            outcome = runner(call_next)
-        else:
-            outcome = runner()
+        chain = self._plugin_chain
+        # `plugins` is a public list; rebuild if it was mutated outside `.use()`.
+        if chain is None or len(chain) != len(self.plugins):
+            chain = self.compile_plugins()
+        return await chain.invoke(self, store, args, kwargs)
 
-        if inspect.iscoroutine(outcome):
-            return await outcome
-        return outcome
+    def compile_plugins(self):
+        """Resolve plugin runners once so executions reuse the same chain."""
+        self._plugin_chain = PluginChain(self.plugins, call=resolve_call(self))
+        return self._plugin_chain
 
     async def run(self, *args, **kwargs):
         raise NotImplementedError
 
     def emit_event(self, event: str, data=None):
         context = _current_execution_context.get()
-        if context is None:
+        if context is None or not context.custom_events_enabled:
             return None
         return context.emit_stream_event(
             event,
@@ -224,9 +160,17 @@ class Node:
             node_type=self.__class__.__name__,
         )
 
+    async def emit_event_async(self, event: str, data=None):
+        """Like `emit_event`, but waits for room when the stream uses the "block" policy."""
+        context = _current_execution_context.get()
+        if context is None or not context.custom_events_enabled:
+            return None
+        await context.wait_stream_capacity()
+        return self.emit_event(event, data)
+
     def _record_node_event(self, store: DataStore, state: str, message: str):
         context = store.get_execution_context()
-        if context is None:
+        if context is None or not context.node_events_enabled:
             return
         node_id = self.id or self.__class__.__name__
         context.record_node_event(
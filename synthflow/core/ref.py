@@ -0,0 +1,37 @@
+from operator import itemgetter
+
+
+class ResultRef:
+    def __init__(self, node_id, output_type=None, output_index=None, transform=None):
+        self.node_id = node_id
+        self.output_type = output_type
+        self.output_index = output_index
+        self.transforms = () if transform is None else (transform,)
+        self.transform = transform
+
+    def map(self, transform):
+        # Transforms are kept as a flat tuple and applied in declaration order by
+        # one composed callable, so long .map()/.item() chains never nest closures.
+        ref = ResultRef(
+            node_id=self.node_id,
+            output_type=self.output_type,
+            output_index=self.output_index,
+        )
+        ref.transforms = self.transforms + (transform,)
+        ref.transform = _compose(ref.transforms)
+        return ref
+
+    def item(self, index):
+        return self.map(itemgetter(index))
+
+
+def _compose(transforms):
+    if len(transforms) == 1:
+        return transforms[0]
+
+    def apply(value):
+        for transform in transforms:
+            value = transform(value)
+        return value
+
+    return apply
@@ -0,0 +1,215 @@
+import pickle
+import struct
+from dataclasses import dataclass, field
+from functools import partial
+
+from synthflow.runtime.models import decode_type_key, encode_type_key
+
+from .datastore import DataStore
+
+SNAPSHOT_VERSION = 1
+# Framing for `StoreSnapshot.to_bytes`: magic, version, sequence, base (-1 for
+# a full snapshot) and buffer count, then the byte length of the payload and of
+# each buffer, then the payload and buffers themselves.
+_HEADER = struct.Struct("<4sHqqI")
+_LENGTH = struct.Struct("<Q")
+_MAGIC = b"SFDS"
+_UNSEEN = object()
+
+
+@dataclass(slots=True)
+class SourceRef:
+    # Stands in for the node that wrote a value when a snapshot is restored
+    # without the live node objects; DataStore only needs its `id`.
+    id: str
+
+
+@dataclass(slots=True)
+class StoreSnapshot:
+    # Encoded DataStore state. `payload` is a pickle (protocol 5) stream and
+    # `buffers` the out-of-band buffers it refers to, in order; large binary
+    # values live there uncopied. A delta (`base` is set) only holds what
+    # changed since the snapshot numbered `base`.
+    payload: bytes
+    buffers: list = field(default_factory=list)
+    sequence: int = 0
+    base: int | None = None
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.payload) + sum(_raw(buffer).nbytes for buffer in self.buffers)
+
+    def to_bytes(self) -> bytes:
+        views = [_raw(buffer) for buffer in self.buffers]
+        parts = [
+            _HEADER.pack(_MAGIC, SNAPSHOT_VERSION, self.sequence, -1 if self.base is None else self.base, len(views)),
+            _LENGTH.pack(len(self.payload)),
+            *(_LENGTH.pack(view.nbytes) for view in views),
+            self.payload,
+            *views,
+        ]
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data) -> "StoreSnapshot":
+        # Buffers are slices of `data` (e.g. an mmap), not copies.
+        view = memoryview(data).cast("B")
+        magic, version, sequence, base, count = _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise ValueError("Not a DataStore snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported DataStore snapshot version: {version}")
+        offset = _HEADER.size
+        lengths = []
+        for _ in range(count + 1):
+            lengths.append(_LENGTH.unpack_from(view, offset)[0])
+            offset += _LENGTH.size
+        chunks = []
+        for length in lengths:
+            chunks.append(view[offset : offset + length])
+            offset += length
+        return cls(bytes(chunks[0]), chunks[1:], sequence, None if base < 0 else base)
+
+
+class StoreSnapshotter:
+    """Encode successive snapshots of one DataStore.
+
+    The first `snapshot()` is full; later ones are deltas holding only entries
+    whose value object changed since the previous snapshot, so values must be
+    replaced rather than mutated in place to be picked up. Type keys are
+    written as "module:qualname" and writing nodes as their ids, so snapshots
+    do not pickle classes or live nodes. Stored `bytes` values of at least
+    `out_of_band_threshold` bytes are passed out of band instead of being
+    copied into the payload, as are numpy arrays and other objects that
+    support pickle protocol 5 buffers.
+    """
+
+    def __init__(self, store: DataStore, out_of_band_threshold: int = 1 << 16):
+        self.store = store
+        self.out_of_band_threshold = out_of_band_threshold
+        self.sequence = 0
+        # What the previous snapshot saw, compared by identity.
+        self._data = {}
+        self._outputs = {}
+        self._results = {}
+
+    def snapshot(self, full: bool = False) -> StoreSnapshot:
+        data, sources, outputs, results = _flatten(self.store)
+        delta = self.sequence > 0 and not full
+        seen_data = self._data if delta else {}
+        seen_outputs = self._outputs if delta else {}
+        seen_results = self._results if delta else {}
+
+        blobs = {}
+        pack = partial(_pack, self.out_of_band_threshold, blobs)
+        data_rows = []
+        for key, value in data.items():
+            source_id = sources[key]
+            seen_value, seen_source = seen_data.get(key, (_UNSEEN, None))
+            if seen_value is not value or seen_source != source_id:
+                data_rows.append((*encode_type_key(key), pack(value), source_id))
+        output_rows = []
+        for node_id, bucket in outputs.items():
+            seen = seen_outputs.get(node_id, {})
+            for key, value in bucket.items():
+                if seen.get(key, _UNSEEN) is not value:
+                    output_rows.append((node_id, *encode_type_key(key), pack(value)))
+        result_rows = [
+            (node_id, pack(value))
+            for node_id, value in results.items()
+            if seen_results.get(node_id, _UNSEEN) is not value
+        ]
+
+        buffers = []
+        payload = pickle.dumps((data_rows, output_rows, result_rows), protocol=5, buffer_callback=buffers.append)
+
+        base = self.sequence if delta else None
+        self.sequence += 1
+        self._data = {key: (value, sources[key]) for key, value in data.items()}
+        self._outputs = outputs
+        self._results = results
+        return StoreSnapshot(payload, buffers, self.sequence, base)
+
+
+def restore_snapshot(snapshots, store: DataStore | None = None, nodes=None) -> DataStore:
+    """Apply a full snapshot and the deltas that follow it, in order.
+
+    `nodes` maps node ids to the node objects to record as value sources;
+    ids without a node are restored as `SourceRef`s. Raises ValueError when a
+    delta does not follow the snapshot before it.
+    """
+    store = DataStore() if store is None else store
+    nodes = nodes or {}
+    types = {}
+    previous = None
+    for snapshot in snapshots:
+        if snapshot.base != previous:
+            raise ValueError(
+                f"DataStore snapshot {snapshot.sequence} follows {snapshot.base}, not {previous}"
+            )
+        previous = snapshot.sequence
+        data_rows, output_rows, result_rows = pickle.loads(snapshot.payload, buffers=snapshot.buffers)
+        for is_type, key, value, source_id in data_rows:
+            key = decode_type_key(is_type, key, types)
+            store._data[key] = value
+            store._source[key] = None if source_id is None else nodes.get(source_id) or SourceRef(source_id)
+        for node_id, is_type, key, value in output_rows:
+            store._by_node.setdefault(node_id, {})[decode_type_key(is_type, key, types)] = value
+        for node_id, value in result_rows:
+            store._node_result[node_id] = value
+    return store
+
+
+class _Blob:
+    # Pickles a large bytes value as an out-of-band buffer. Pickle never asks
+    # plain bytes how to reduce themselves, hence the wrapper; one wrapper per
+    # value keeps values stored under several keys to a single buffer.
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __reduce_ex__(self, protocol):
+        return _restore_bytes, (pickle.PickleBuffer(self.value),)
+
+
+def _pack(threshold, blobs, value):
+    if type(value) is not bytes or len(value) < threshold:
+        return value
+    blob = blobs.get(id(value))
+    if blob is None:
+        blob = blobs[id(value)] = _Blob(value)
+    return blob
+
+
+def _restore_bytes(buffer):
+    # The original object when restoring in memory; one copy out of a larger
+    # buffer (e.g. a slice of a file) otherwise.
+    view = _raw(buffer)
+    if type(view.obj) is bytes and view.nbytes == len(view.obj):
+        return view.obj
+    return view.tobytes()
+
+
+def _raw(buffer):
+    if isinstance(buffer, pickle.PickleBuffer):
+        return buffer.raw()
+    return memoryview(buffer).cast("B")
+
+
+def _flatten(store):
+    # Overlays are flattened root first, so upper layers win, as in `copy()`.
+    layers = []
+    layer = store
+    while layer is not None:
+        layers.append(layer)
+        layer = layer._parent
+    data, sources, outputs, results = {}, {}, {}, {}
+    for layer in reversed(layers):
+        data.update(layer._data)
+        for key, source in layer._source.items():
+            sources[key] = getattr(source, "id", None) or None
+        for node_id, bucket in layer._by_node.items():
+            outputs.setdefault(node_id, {}).update(bucket)
+        results.update(layer._node_result)
+    return data, sources, outputs, results
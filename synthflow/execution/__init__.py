@@ -1,4 +1,6 @@
+from synthflow.execution.batch import BatchRun, BatchStats
 from synthflow.execution.context import (
+    EventLevel,
     ExecutionContext,
     ExecutionEvent,
     ExecutionState,
@@ -6,14 +8,27 @@ from synthflow.execution.context import (
     StreamEvent,
 )
 from synthflow.execution.engine import Engine
+from synthflow.execution.hub import EventHub, Subscription
+from synthflow.execution.plan import ExecutionPlan, PlanStep, compile_plan
 from synthflow.execution.scheduler import Scheduler
+from synthflow.execution.stream import CoalesceRule, StreamBuffer
 
 __all__ = [
+    "BatchRun",
+    "BatchStats",
+    "EventLevel",
     "ExecutionContext",
     "ExecutionEvent",
     "ExecutionState",
     "NodeExecutionEvent",
     "StreamEvent",
     "Engine",
+    "EventHub",
+    "Subscription",
+    "ExecutionPlan",
+    "PlanStep",
+    "compile_plan",
     "Scheduler",
+    "CoalesceRule",
+    "StreamBuffer",
 ]
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from uuid import uuid4
+
+
+@dataclass
+class BatchStats:
+    # Aggregate numbers for one `Flow.run_many` call, filled in as runs finish.
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    latencies_ms: list[float] = field(default_factory=list, repr=False)
+
+    @property
+    def throughput(self) -> float:
+        """Finished runs per second of wall-clock time."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.total / self.elapsed_seconds
+
+    @property
+    def latency_mean_ms(self) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        return sum(self.latencies_ms) / len(self.latencies_ms)
+
+    def latency_percentile_ms(self, percentile: float) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        index = min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class BatchRun:
+    """Async iterator over many runs of one compiled flow, in completion order.
+
+    Yields `(index, context)` pairs where `index` is the position of the input
+    in `inputs`. Failed runs are yielded with their context in the failed
+    state instead of aborting the batch. `stats` is complete once iteration ends.
+    """
+
+    def __init__(self, flow, inputs, concurrency=10):
+        if concurrency < 1:
+            raise ValueError("run_many concurrency must be >= 1")
+        self.flow = flow
+        self.inputs = inputs
+        self.concurrency = concurrency
+        self.stats = BatchStats()
+        # One random prefix per batch; per-run ids only add a counter.
+        self._run_prefix = uuid4().hex
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        iterator = enumerate(self.inputs)
+        # Bounded so slow consumers apply backpressure to the workers.
+        finished = asyncio.Queue(maxsize=self.concurrency)
+        done_marker = object()
+        started = time.perf_counter()
+        plan = self.flow.plan
+
+        async def worker():
+            signal = done_marker
+            try:
+                for index, run_inputs in iterator:
+                    context = self.flow._new_context(run_id=f"{self._run_prefix}-{index}", inputs=run_inputs)
+                    run_started = time.perf_counter()
+                    try:
+                        await self.flow.engine.run(plan, context=context)
+                    except Exception:
+                        self.stats.failed += 1
+                    else:
+                        self.stats.succeeded += 1
+                    self.stats.total += 1
+                    self.stats.latencies_ms.append((time.perf_counter() - run_started) * 1000)
+                    await finished.put((index, context))
+            except BaseException as exc:
+                # e.g. a failing `inputs` iterator; re-raised by the consumer.
+                signal = exc
+                if not isinstance(exc, Exception):
+                    raise
+            finally:
+                # Always signal, or the consumer would wait for this worker forever;
+                # once it is closing nobody reads the queue any more.
+                if not closing:
+                    await finished.put(signal)
+
+        closing = False
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        remaining = len(workers)
+        try:
+            while remaining:
+                item = await finished.get()
+                if item is done_marker:
+                    remaining -= 1
+                    continue
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            closing = True
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self.stats.elapsed_seconds = time.perf_counter() - started
@@ -1,11 +1,17 @@
 import asyncio
+import threading
+import time
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from datetime import datetime
 from enum import Enum
 from uuid import uuid4
 
-from synthflow.core.datastore import DataStore
-from synthflow.runtime.models import RunRecord, RuntimeEvent
+from synthflow.core.datastore import MISSING, DataStore
+from synthflow.execution.hub import EventHub
+from synthflow.execution.stream import CLOSED, CONTROL_EVENTS, CoalesceRule, StreamBuffer
+from synthflow.runtime.log import EventLog, EventRetention
+from synthflow.runtime.models import INPUTS_CHECKPOINT, NodeCheckpoint, RunClock, RunRecord, RuntimeEvent
 from synthflow.runtime.store import InMemoryRunStore, RunStore
 
 
@@ -17,7 +23,15 @@ class ExecutionState(str, Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass
+class EventLevel(str, Enum):
+    # How much observability a run records; each level includes the previous.
+    OFF = "off"
+    FLOW = "flow"
+    NODE = "node"
+    FULL = "full"
+
+
+@dataclass(slots=True)
 class ExecutionEvent:
     # Flow-level lifecycle transition.
     timestamp: datetime
@@ -25,7 +39,7 @@ class ExecutionEvent:
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeExecutionEvent:
     # Per-node lifecycle transition emitted by Node.execute().
     timestamp: datetime
@@ -35,41 +49,103 @@ class NodeExecutionEvent:
     message: str
 
 
-@dataclass
-class StreamEvent:
-    # These fields let clients correlate streamed events back to a durable run.
-    run_id: str
-    sequence_id: int
-    timestamp: datetime
-    event: str
-    data: object = None
-    node_id: str | None = None
-    node_type: str | None = None
+# Streamed events are the same objects the run store keeps: run_id and
+# sequence_id let clients correlate them back to a durable run.
+StreamEvent = RuntimeEvent
 
 
 @dataclass
 class ExecutionContext:
     # Mutable execution bag for one flow run.
-    # `events` tracks flow-level state; `node_events` tracks per-node state.
+    # `events` tracks flow-level state; `node_events` and `stream_events` are
+    # views over this run's event log. An InMemoryRunStore keeps its own log
+    # of the same event objects, not a copy of each payload.
     run_id: str = field(default_factory=lambda: str(uuid4()))
     store: DataStore = field(default_factory=DataStore)
     state: ExecutionState = ExecutionState.PENDING
     started_at: datetime | None = None
     finished_at: datetime | None = None
     events: list[ExecutionEvent] = field(default_factory=list)
-    node_events: list[NodeExecutionEvent] = field(default_factory=list)
-    stream_events: list[StreamEvent] = field(default_factory=list)
     error: Exception | None = None
     run_store: RunStore = field(default_factory=InMemoryRunStore)
     flow_name: str = "Flow"
+    # "off" keeps only the run record status; "flow" adds flow_state events;
+    # "node" adds node_state events; "full" also keeps custom node events.
+    event_level: EventLevel = EventLevel.FULL
+    # Flow.run() has no stream consumer, so it skips queueing stream items.
+    stream_enabled: bool = True
+    # Bound on queued data events for the live stream; see StreamBuffer.
+    stream_max_size: int | None = None
+    stream_policy: str = "block"
+    # Per-event-name emission batching, e.g. {"token": CoalesceRule(window=0.05)}.
+    # Merged events are what stream_events, the run store and the live stream see.
+    coalesce: dict[str, CoalesceRule] = field(default_factory=dict)
+    # Bounds what this context keeps in memory (ring buffer / token payloads).
+    event_retention: EventRetention | None = None
+    # Live fan-out to subscribers of this run_id; see EventHub.
+    hub: EventHub | None = None
+    # Save each succeeded node's writes through the run store (see Flow.resume);
+    # `resumed_nodes` are restored from such checkpoints and not run again.
+    checkpoint: bool = False
+    resumed_nodes: frozenset = field(default_factory=frozenset)
+    flow_events_enabled: bool = field(default=True, init=False, repr=False)
+    node_events_enabled: bool = field(default=True, init=False, repr=False)
+    custom_events_enabled: bool = field(default=True, init=False, repr=False)
     _sequence_id: int = field(default=0, init=False, repr=False)
-    _stream_queue: asyncio.Queue = field(default_factory=asyncio.Queue, init=False, repr=False)
+    _stream_buffer: StreamBuffer | None = field(default=None, init=False, repr=False)
+    _log: EventLog | None = field(default=None, init=False, repr=False)
+    # Events keep monotonic ns readings; this anchor converts them to datetimes.
+    _clock: RunClock = field(default_factory=RunClock, init=False, repr=False)
     _stream_closed: bool = field(default=False, init=False, repr=False)
-    _stream_sentinel: object = field(default_factory=object, init=False, repr=False)
+    # Events emitted on the loop into a full "block" stream (sync emit_event,
+    # coalesced flushes) cannot wait there; they queue here, in order, for the
+    # drainer task to hand over. The bound is soft on this path only.
+    _deferred: deque = field(default_factory=deque, init=False, repr=False)
+    _drainer: asyncio.Task | None = field(default=None, init=False, repr=False)
+    _pending: dict | None = field(default=None, init=False, repr=False)
+    _pending_generation: int = field(default=0, init=False, repr=False)
+    _pending_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    # Nodes in worker threads emit concurrently with the loop; sequence ids,
+    # the log, the store and the hub must all see events in one order.
+    _emit_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
     _loop: asyncio.AbstractEventLoop | None = field(default=None, init=False, repr=False)
+    _loop_thread: int | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.set_event_level(self.event_level)
+        self._stream_buffer = StreamBuffer(maxsize=self.stream_max_size, policy=self.stream_policy)
+        self._log = EventLog(self.event_retention)
+
+    @property
+    def stream_events(self) -> list[StreamEvent]:
+        return self._log.events()
+
+    @property
+    def node_events(self) -> list[NodeExecutionEvent]:
+        # Derived on read so node transitions are only stored once.
+        return [
+            NodeExecutionEvent(
+                timestamp=event.timestamp,
+                node_id=event.node_id,
+                node_type=event.node_type,
+                state=event.data["state"],
+                message=event.data["message"],
+            )
+            for event in self._log
+            if event.event == "node_state" and event.data is not None
+        ]
+
+    def set_event_level(self, level):
+        # Resolve the level into plain flags once so hot paths test a bool.
+        self.event_level = EventLevel(level)
+        rank = list(EventLevel).index(self.event_level)
+        self.flow_events_enabled = rank >= 1
+        self.node_events_enabled = rank >= 2
+        self.custom_events_enabled = rank >= 3
 
     def attach_loop(self, loop: asyncio.AbstractEventLoop):
         self._loop = loop
+        self._loop_thread = threading.get_ident()
 
     def initialize_run(self):
         # Persist an initial run record before execution starts so callers can
@@ -83,17 +159,66 @@ class ExecutionContext:
             error=self._stringify_error(self.error),
         )
         self.run_store.create_run(run)
+        if self.hub is not None:
+            self.hub.open(self.run_id)
+
+    def resume_run(self, run: RunRecord, checkpoints: dict[str, NodeCheckpoint], nodes):
+        # Continue a stored run under its run_id: sequence ids carry on after
+        # its last event and the store is rebuilt from its checkpoints, in
+        # plan order so overlapping typed outputs resolve as they did.
+        self._sequence_id = run.last_sequence_id
+        self.started_at = run.started_at
+        inputs = checkpoints.get(INPUTS_CHECKPOINT)
+        if inputs is not None:
+            self.store.seed(inputs.outputs)
+        restored = set()
+        for node in nodes:
+            checkpoint = checkpoints.get(node.id)
+            if checkpoint is None:
+                continue
+            if checkpoint.has_result:
+                self.store.set_node_result(node.id, checkpoint.result)
+            for dtype, value in checkpoint.outputs.items():
+                self.store.set(dtype, value, source=node)
+            restored.add(node.id)
+        self.resumed_nodes = frozenset(restored)
+        self.run_store.update_run(
+            self.run_id, status=self.state.value, finished_at=None, error=None
+        )
+        if self.hub is not None:
+            self.hub.open(self.run_id)
+
+    def checkpoint_inputs(self, inputs: dict):
+        if self.checkpoint:
+            self.run_store.save_checkpoint(self.run_id, NodeCheckpoint(INPUTS_CHECKPOINT, outputs=dict(inputs)))
+
+    def checkpoint_node(self, node, store: DataStore):
+        node_id = node.id
+        if not node_id:
+            # Without an id a node cannot be matched on resume; it runs again.
+            return
+        result, outputs = store.node_writes(node_id)
+        checkpoint = NodeCheckpoint(node_id, outputs=outputs)
+        if result is not MISSING:
+            checkpoint.result = result
+            checkpoint.has_result = True
+        self.run_store.save_checkpoint(self.run_id, checkpoint)
 
     def transition(self, state: ExecutionState, message: str):
         # Keep explicit start/end timestamps for latency and troubleshooting.
-        now = datetime.now(timezone.utc)
+        monotonic_ns = time.monotonic_ns()
+        now = self._clock.to_datetime(monotonic_ns)
         if self.started_at is None and state == ExecutionState.RUNNING:
             self.started_at = now
-        if state in {ExecutionState.SUCCEEDED, ExecutionState.FAILED, ExecutionState.CANCELLED}:
+        terminal = state in {ExecutionState.SUCCEEDED, ExecutionState.FAILED, ExecutionState.CANCELLED}
+        if terminal:
             self.finished_at = now
         self.state = state
-        self.events.append(ExecutionEvent(timestamp=now, state=state, message=message))
-        self.emit_stream_event("flow_state", {"state": state.value, "message": message}, timestamp=now)
+        if self.flow_events_enabled:
+            self.events.append(ExecutionEvent(timestamp=now, state=state, message=message))
+            self.emit_stream_event(
+                "flow_state", {"state": state.value, "message": message}, monotonic_ns=monotonic_ns
+            )
         self.run_store.update_run(
             self.run_id,
             status=state.value,
@@ -101,24 +226,22 @@ class ExecutionContext:
             finished_at=self.finished_at,
             error=self._stringify_error(self.error),
         )
+        if state == ExecutionState.SUCCEEDED and self.checkpoint:
+            # A succeeded run cannot be resumed, so its checkpoints are dead weight.
+            self.run_store.delete_checkpoints(self.run_id)
+        if terminal and self.hub is not None:
+            # Buffered text must reach subscribers before their iteration ends.
+            self.flush_coalesced()
+            self._call_on_loop(self.hub.close, self.run_id)
 
     def record_node_event(self, node_id: str, node_type: str, state: str, message: str):
-        now = datetime.now(timezone.utc)
-        self.node_events.append(
-            NodeExecutionEvent(
-                timestamp=now,
-                node_id=node_id,
-                node_type=node_type,
-                state=state,
-                message=message,
-            )
-        )
+        if not self.node_events_enabled:
+            return
         self.emit_stream_event(
             "node_state",
             {"state": state, "message": message},
             node_id=node_id,
             node_type=node_type,
-            timestamp=now,
         )
 
     def emit_stream_event(
@@ -128,59 +251,186 @@ class ExecutionContext:
         *,
         node_id: str | None = None,
         node_type: str | None = None,
-        timestamp: datetime | None = None,
+        monotonic_ns: int | None = None,
+    ) -> StreamEvent:
+        if self.coalesce:
+            rule = self.coalesce.get(event)
+            if rule is not None and self._coalesce_event(rule, event, data, node_id, node_type, monotonic_ns):
+                return None
+            if self._pending is not None:
+                # Keep order: buffered text is emitted before any other event.
+                self.flush_coalesced()
+        return self._emit(event, data, node_id=node_id, node_type=node_type, monotonic_ns=monotonic_ns)
+
+    def flush_coalesced(self):
+        with self._pending_lock:
+            pending = self._pending
+            self._pending = None
+        return self._emit_pending(pending)
+
+    def _emit_pending(self, pending):
+        if pending is None:
+            return None
+        data = dict(pending["data"])
+        data[pending["field"]] = "".join(pending["parts"])
+        return self._emit(
+            pending["event"],
+            data,
+            node_id=pending["node_id"],
+            node_type=pending["node_type"],
+            monotonic_ns=pending["monotonic_ns"],
+        )
+
+    def _coalesce_event(self, rule, event, data, node_id, node_type, monotonic_ns):
+        if not isinstance(data, dict) or not isinstance(data.get(rule.field), str):
+            return False
+        text = data[rule.field]
+        key = (event, node_id)
+        generation = None
+        with self._pending_lock:
+            stale = None
+            pending = self._pending
+            if pending is not None and pending["key"] != key:
+                stale, pending = pending, None
+            if pending is None:
+                self._pending_generation += 1
+                generation = self._pending_generation
+                pending = self._pending = {
+                    "key": key,
+                    "generation": generation,
+                    "event": event,
+                    "field": rule.field,
+                    "data": {},
+                    "parts": [],
+                    "size": 0,
+                    "node_id": node_id,
+                    "node_type": node_type,
+                    "monotonic_ns": monotonic_ns or time.monotonic_ns(),
+                }
+            pending["parts"].append(text)
+            pending["size"] += len(text)
+            pending["data"].update(data)
+            full = pending["size"] >= rule.max_size
+        # A batch from another node/event is emitted before this one can be.
+        self._emit_pending(stale)
+        if full:
+            self.flush_coalesced()
+        elif generation is not None and rule.window > 0 and self._loop is not None:
+            self._schedule_flush(rule.window, generation)
+        return True
+
+    def _schedule_flush(self, delay, generation):
+        def flush_if_current():
+            # Stale timers are ignored: that batch was already flushed early.
+            pending = self._pending
+            if pending is not None and pending["generation"] == generation:
+                self.flush_coalesced()
+
+        if threading.get_ident() == self._loop_thread:
+            self._loop.call_later(delay, flush_if_current)
+        else:
+            self._loop.call_soon_threadsafe(self._loop.call_later, delay, flush_if_current)
+
+    def _emit(
+        self,
+        event: str,
+        data: object = None,
+        *,
+        node_id: str | None = None,
+        node_type: str | None = None,
+        monotonic_ns: int | None = None,
     ) -> StreamEvent:
         # Sequence ids make replay and reconnect deterministic even if a client
         # disconnects in the middle of a long-running stream.
-        sequence_id = self._next_sequence_id()
-        stream_event = StreamEvent(
-            run_id=self.run_id,
-            sequence_id=sequence_id,
-            timestamp=timestamp or datetime.now(timezone.utc),
-            event=event,
-            data=data,
-            node_id=node_id,
-            node_type=node_type,
-        )
-        self.stream_events.append(stream_event)
-        self.run_store.append_event(
-            RuntimeEvent(
-                run_id=stream_event.run_id,
-                sequence_id=stream_event.sequence_id,
-                timestamp=stream_event.timestamp,
-                event=stream_event.event,
-                data=stream_event.data,
-                node_id=stream_event.node_id,
-                node_type=stream_event.node_type,
+        with self._emit_lock:
+            self._sequence_id += 1
+            stream_event = StreamEvent(
+                self.run_id,
+                self._sequence_id,
+                None,
+                event,
+                data,
+                node_id,
+                node_type,
+                monotonic_ns or time.monotonic_ns(),
+                self._clock,
             )
-        )
+            self._log.append(stream_event)
+            self.run_store.append_event(stream_event)
+            if self.hub is not None:
+                # Published after the store append so subscribers can replay from the store.
+                self._call_on_loop(self.hub.publish, stream_event)
+        # Outside the lock: a worker thread may wait here for stream capacity.
         self._queue_item(stream_event)
         return stream_event
 
+    async def wait_stream_capacity(self):
+        # Lets async emitters honour the "block" policy before emitting.
+        if self.stream_enabled and (self._loop is None or threading.get_ident() == self._loop_thread):
+            while self._drainer is not None:
+                # Shielded: a cancelled emitter must not cancel the handoff.
+                await asyncio.shield(self._drainer)
+            await self._stream_buffer.wait_writable()
+
     async def stream(self):
-        while True:
-            item = await self._stream_queue.get()
-            if item is self._stream_sentinel:
-                break
-            yield item
+        try:
+            while True:
+                item = await self._stream_buffer.get()
+                if item is CLOSED:
+                    break
+                yield item
+        finally:
+            # A consumer that stops early must not leave producers waiting for room.
+            self._stream_buffer.close()
 
     def close_stream(self):
         if self._stream_closed:
             return
+        self.flush_coalesced()
         self._stream_closed = True
-        self._queue_item(self._stream_sentinel)
+        self._call_on_loop(self._close_buffer)
+
+    def _close_buffer(self):
+        # With deferred items still waiting, the drainer closes the buffer after them.
+        if self._drainer is None:
+            self._stream_buffer.close()
 
     def _queue_item(self, item):
-        if self._stream_closed and item is not self._stream_sentinel:
+        if not self.stream_enabled or self._stream_closed:
             return
-        if self._loop is None:
-            self._stream_queue.put_nowait(item)
+        # Only events emitted from worker threads need a thread-safe handoff.
+        if self._loop is None or threading.get_ident() == self._loop_thread:
+            if self._deferred and item.event not in CONTROL_EVENTS:
+                self._deferred.append(item)
+                return
+            try:
+                self._stream_buffer.put_nowait(item)
+            except asyncio.QueueFull:
+                if self._loop is None:
+                    raise
+                self._deferred.append(item)
+                self._drainer = self._loop.create_task(self._drain_deferred())
             return
-        self._loop.call_soon_threadsafe(self._stream_queue.put_nowait, item)
+        if self._stream_buffer.policy == "block" and item.event not in CONTROL_EVENTS:
+            # Worker threads can afford to wait, so they get real backpressure.
+            asyncio.run_coroutine_threadsafe(self._stream_buffer.put(item), self._loop).result()
+            return
+        self._loop.call_soon_threadsafe(self._stream_buffer.put_nowait, item)
+
+    async def _drain_deferred(self):
+        buffer = self._stream_buffer
+        while self._deferred:
+            await buffer.put(self._deferred[0])
+            self._deferred.popleft()
+        self._drainer = None
+        if self._stream_closed:
+            buffer.close()
 
-    def _next_sequence_id(self) -> int:
-        self._sequence_id += 1
-        return self._sequence_id
+    def _call_on_loop(self, callback, *args):
+        if self._loop is None or threading.get_ident() == self._loop_thread:
+            callback(*args)
+        else:
+            self._loop.call_soon_threadsafe(callback, *args)
 
     def _stringify_error(self, error: Exception | None) -> str | None:
         if error is None:
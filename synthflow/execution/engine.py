@@ -6,7 +6,8 @@ class Engine:
     def __init__(self, scheduler=None):
         self.scheduler = scheduler or Scheduler()
 
-    async def run(self, start_node, context: ExecutionContext | None = None):
+    async def run(self, start, context: ExecutionContext | None = None):
+        # `start` is either a start node or an already compiled ExecutionPlan.
         run_context = context or ExecutionContext()
-        await self.scheduler.run(start_node, run_context)
+        await self.scheduler.run(start, run_context)
         return run_context
@@ -0,0 +1,150 @@
+import asyncio
+from collections import deque
+
+from synthflow.runtime.store import RunStore
+
+# Events replayed from the run store per page while a subscriber catches up.
+REPLAY_PAGE_SIZE = 500
+
+
+class Subscription:
+    """One client following one run through an EventHub.
+
+    Iterate it with `async for`. Events arrive in sequence order with no gaps
+    or duplicates: everything after `after_sequence_id` is first replayed from
+    the run store, then live events follow. Live events wait in a buffer of at
+    most `max_buffer` events; when a slow client lets it fill up, the buffer is
+    discarded and the client catches up from the run store again (`resyncs`
+    counts this), so publishing never waits on or grows with any subscriber.
+    Iteration ends once the run has finished and every event was delivered.
+    """
+
+    def __init__(self, hub, run_id, after_sequence_id=None, max_buffer=1000):
+        if max_buffer < 1:
+            raise ValueError("Subscription max_buffer must be >= 1")
+        self.hub = hub
+        self.run_id = run_id
+        self.max_buffer = max_buffer
+        self.last_sequence_id = after_sequence_id or 0
+        self.resyncs = 0
+        self._buffer = deque()
+        # Every subscriber starts by catching up from the store.
+        self._resync = True
+        self._closed = False
+        self._ready = asyncio.Event()
+
+    def __aiter__(self):
+        return self._iterate()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def close(self):
+        """Stop following the run; iteration ends after the current event."""
+        self.hub._detach(self)
+        self._finish()
+
+    def _publish(self, event):
+        if self._closed or self._resync:
+            # A resync re-reads the store, which already holds this event.
+            return
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.clear()
+            self._resync = True
+            self.resyncs += 1
+        else:
+            self._buffer.append(event)
+        self._ready.set()
+
+    def _finish(self):
+        self._closed = True
+        self._ready.set()
+
+    async def _iterate(self):
+        try:
+            while True:
+                if self._resync:
+                    self._resync = False
+                    self._buffer.clear()
+                    async for event in self._replay():
+                        yield event
+                    # Anything published during the replay is in the buffer
+                    # (or the store, if the buffer overflowed again).
+                    continue
+                buffer = self._buffer
+                while buffer and not self._resync:
+                    event = buffer.popleft()
+                    if event.sequence_id > self.last_sequence_id:
+                        self.last_sequence_id = event.sequence_id
+                        yield event
+                if self._resync:
+                    continue
+                if self._closed:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+        finally:
+            self.hub._detach(self)
+
+    async def _replay(self):
+        store = self.hub.run_store
+        while True:
+            page = await store.apage_events(self.run_id, after_sequence_id=self.last_sequence_id, limit=REPLAY_PAGE_SIZE)
+            for event in page.events:
+                self.last_sequence_id = event.sequence_id
+                yield event
+            if not page.has_more:
+                return
+
+
+class EventHub:
+    """Fan-out of live run events to any number of subscribers per run_id.
+
+    Runs publish through `publish` once their channel is `open`; `close` ends
+    every subscription of a run after it has drained. Replay for late or
+    reconnecting subscribers comes from `run_store`, which must receive each
+    event before it is published (ExecutionContext appends, then publishes).
+    All methods run on the event loop; the execution context hands events from
+    worker threads over with `call_soon_threadsafe`.
+    """
+
+    def __init__(self, run_store: RunStore):
+        self.run_store = run_store
+        self._channels: dict[str, list[Subscription]] = {}
+
+    def open(self, run_id: str):
+        self._channels.setdefault(run_id, [])
+
+    def is_live(self, run_id: str) -> bool:
+        return run_id in self._channels
+
+    def subscriber_count(self, run_id: str) -> int:
+        return len(self._channels.get(run_id, ()))
+
+    def publish(self, event):
+        subscribers = self._channels.get(event.run_id)
+        if subscribers:
+            for subscription in subscribers:
+                subscription._publish(event)
+
+    def close(self, run_id: str):
+        for subscription in self._channels.pop(run_id, ()):
+            subscription._finish()
+
+    def subscribe(self, run_id: str, after_sequence_id: int | None = None, max_buffer: int = 1000) -> Subscription:
+        subscribers = self._channels.get(run_id)
+        if subscribers is None and not self.run_store.has_run(run_id):
+            raise KeyError(f"Unknown run: {run_id}")
+        subscription = Subscription(self, run_id, after_sequence_id=after_sequence_id, max_buffer=max_buffer)
+        if subscribers is None:
+            # Finished (or another process's) run: replay the store and stop.
+            subscription._closed = True
+        else:
+            subscribers.append(subscription)
+        return subscription
+
+    def _detach(self, subscription):
+        subscribers = self._channels.get(subscription.run_id)
+        if subscribers is not None and subscription in subscribers:
+            subscribers.remove(subscription)
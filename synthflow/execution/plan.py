@@ -0,0 +1,314 @@
+from dataclasses import dataclass, field
+
+from synthflow.core.condition import If, Switch
+from synthflow.core.mapping import Map
+from synthflow.core.parallel import Parallel
+from synthflow.core.ref import ResultRef
+
+OP_NODE = "node"
+OP_BRANCH = "branch"
+OP_JUMP = "jump"
+OP_EXIT = "exit"
+OP_PARALLEL = "parallel"
+OP_MAP = "map"
+
+_DEFAULT_CASE = object()
+
+
+@dataclass(slots=True)
+class PlanStep:
+    # One flat instruction; only the fields relevant to `op` are populated.
+    op: str
+    node: object = None
+    # Branch table maps selector results to step indexes; `default` covers misses.
+    table: dict = field(default_factory=dict)
+    default: int | None = None
+    target: int | None = None
+    branches: tuple = ()
+
+
+@dataclass(slots=True)
+class DagUnit:
+    # A top-level span of plan steps scheduled as one unit in "dag" mode.
+    start: int
+    stop: int
+    deps: tuple = ()
+
+
+@dataclass
+class ExecutionPlan:
+    # Flat instruction list compiled from a `start_node` graph. Control nodes
+    # become branch/jump/exit steps and parallel/map groups carry sub-plans,
+    # so executing it never recurses through `next_node`.
+    steps: list[PlanStep] = field(default_factory=list)
+    # Wiring the plan was compiled from; see `graph_signature`.
+    signature: tuple = field(default=(), repr=False)
+    _dag: list | None = field(default=None, init=False, repr=False)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def nodes(self):
+        """Nodes that run as one step, in plan order; Map templates are excluded."""
+        for step in self.steps:
+            if step.op == OP_PARALLEL:
+                for branch in step.branches:
+                    yield from branch.nodes()
+            if step.op in (OP_NODE, OP_PARALLEL, OP_MAP):
+                yield step.node
+
+    def dag(self) -> list[DagUnit]:
+        """Data dependencies between top-level units, derived once and cached."""
+        if self._dag is None:
+            self._dag = _build_dag(self)
+        return self._dag
+
+
+def compile_plan(start_node) -> ExecutionPlan:
+    """Compile a node graph into a flat, loop-executable plan."""
+    plan = _compile(start_node, path=set())
+    plan.signature = graph_signature(start_node)
+    return plan
+
+
+def graph_signature(start_node) -> tuple:
+    """Cheap fingerprint of a node graph's wiring, to tell when a plan is stale.
+
+    Covers `next_node` links and Parallel/Map/If/Switch targets, so `>>` or
+    branch rewiring after compiling changes it; node settings do not.
+    """
+    edges = []
+    seen = set()
+    pending = [start_node]
+    while pending:
+        node = pending.pop()
+        if node is None or id(node) in seen:
+            continue
+        seen.add(id(node))
+        children = _children(node)
+        edges.append((id(node), id(node.next_node), tuple((key, id(child)) for key, child in children)))
+        pending.append(node.next_node)
+        pending.extend(child for _, child in children)
+    return tuple(edges)
+
+
+def _children(node):
+    if isinstance(node, Parallel):
+        return tuple(enumerate(node.nodes))
+    if isinstance(node, Map):
+        return ((None, node.template),)
+    if isinstance(node, (If, Switch)):
+        cases, default_node = _branch_cases(node)
+        return (*cases, (_DEFAULT_CASE, default_node))
+    return ()
+
+
+def _compile(start_node, path):
+    plan = ExecutionPlan()
+    _compile_chain(start_node, plan.steps, path)
+    return plan
+
+
+def _compile_chain(node, steps, path):
+    # `path` holds the nodes on the current chain/branch nesting so a node that
+    # links back to an ancestor is reported instead of compiling forever.
+    # Sibling branches may still share node objects; they are simply inlined.
+    entered = []
+    try:
+        while node is not None:
+            key = id(node)
+            if key in path:
+                raise ValueError(f"Flow graph contains a cycle at node '{_node_name(node)}'")
+            path.add(key)
+            entered.append(key)
+
+            if isinstance(node, Parallel):
+                branches = tuple(_compile(sub, path) for sub in node.nodes)
+                steps.append(PlanStep(op=OP_PARALLEL, node=node, branches=branches))
+            elif isinstance(node, Map):
+                template = _compile(node.template, path)
+                steps.append(PlanStep(op=OP_MAP, node=node, branches=(template,)))
+            elif isinstance(node, (If, Switch)):
+                _compile_branch(node, steps, path)
+            else:
+                # Freezing the flow also freezes each node's plugins and inputs.
+                node.compile_plugins()
+                node.compile_inputs()
+                steps.append(PlanStep(op=OP_NODE, node=node))
+            node = node.next_node
+    finally:
+        for key in entered:
+            path.discard(key)
+
+
+def _compile_branch(node, steps, path):
+    branch = PlanStep(op=OP_BRANCH, node=node)
+    steps.append(branch)
+    jumps = []
+    cases, default_node = _branch_cases(node)
+
+    def emit(target):
+        start = len(steps)
+        _compile_chain(target, steps, path)
+        jump = PlanStep(op=OP_JUMP)
+        steps.append(jump)
+        jumps.append(jump)
+        return start
+
+    for key, target in cases:
+        if target is not None:
+            branch.table[key] = emit(target)
+    if default_node is not None:
+        branch.default = emit(default_node)
+
+    # The last branch body falls through straight into the exit step.
+    if jumps and steps[-1] is jumps[-1]:
+        steps.pop()
+        jumps.pop()
+
+    exit_index = len(steps)
+    steps.append(PlanStep(op=OP_EXIT, node=node))
+    for jump in jumps:
+        jump.target = exit_index
+    if branch.default is None:
+        branch.default = exit_index
+
+
+def _branch_cases(node):
+    if isinstance(node, If):
+        return [(True, node.then_node), (False, node.else_node)], None
+    return list(node.cases.items()), node.default
+
+
+def _build_dag(plan):
+    # Each top-level node, Parallel or Map step is one unit; an If/Switch span
+    # is one unit too. Edges come from ResultRef node ids and typed channels:
+    # read-after-write, write-after-write and write-after-read on the same key
+    # keep the declared `>>` order wherever it is observable. Branch selectors
+    # read the store arbitrarily, so conditional units act as full barriers.
+    # Nodes without declared `outputs` may return a dict of typed values, so
+    # they count as writing every typed channel: they run after earlier typed
+    # reads and writes, and later typed accesses wait for them.
+    units = []
+    last_writer = {}
+    readers = {}
+    barrier = None
+    since_barrier = []
+    typed_since_barrier = []
+    unknown_since_barrier = []
+    index = 0
+    while index < len(plan.steps):
+        stop = _unit_stop(plan.steps, index)
+        reads, typed_inputs, writes, is_barrier = _unit_access(plan.steps[index:stop])
+        unknown_writes = _writes_unknown(plan.steps[index:stop])
+        typed_access = any(key[0] == "type" for key in reads | writes)
+        position = len(units)
+        # Typed inputs without a declared producer may come from a dict-returning
+        # node anywhere upstream, so they wait for everything before them.
+        unknown_read = any(key not in last_writer for key in typed_inputs)
+        deps = set()
+        if barrier is not None:
+            deps.add(barrier)
+        if is_barrier or unknown_read:
+            # Everything before the previous barrier is already covered by it.
+            deps.update(since_barrier)
+        for key in reads:
+            if key in last_writer:
+                deps.add(last_writer[key])
+        for key in writes:
+            if key in last_writer:
+                deps.add(last_writer[key])
+            deps.update(readers.get(key, ()))
+        if typed_access:
+            deps.update(unknown_since_barrier)
+        if unknown_writes:
+            deps.update(typed_since_barrier)
+        deps.discard(position)
+
+        for key in reads:
+            readers.setdefault(key, []).append(position)
+        for key in writes:
+            last_writer[key] = position
+            readers[key] = []
+        if is_barrier:
+            barrier = position
+            since_barrier = []
+            typed_since_barrier = []
+            unknown_since_barrier = []
+        else:
+            since_barrier.append(position)
+            if typed_access:
+                typed_since_barrier.append(position)
+            if unknown_writes:
+                unknown_since_barrier.append(position)
+        units.append(DagUnit(start=index, stop=stop, deps=tuple(sorted(deps))))
+        index = stop
+    return units
+
+
+def _unit_stop(steps, index):
+    if steps[index].op != OP_BRANCH:
+        return index + 1
+    depth = 0
+    for position in range(index, len(steps)):
+        op = steps[position].op
+        if op == OP_BRANCH:
+            depth += 1
+        elif op == OP_EXIT:
+            depth -= 1
+            if depth == 0:
+                return position + 1
+    return len(steps)
+
+
+def _unit_access(steps):
+    reads = set()
+    typed_inputs = set()
+    writes = set()
+    is_barrier = False
+    for node in _iter_nodes(steps):
+        if isinstance(node, (If, Switch)):
+            is_barrier = True
+        if node.id:
+            writes.add(("id", node.id))
+        for dtype in node.outputs:
+            writes.add(("type", dtype))
+        for dtype in node.inputs:
+            typed_inputs.add(("type", dtype))
+        refs = list(node._input_binder.refs()) if node._input_binder is not None else []
+        if isinstance(node, Map):
+            refs.append(node.collect)
+            if isinstance(node.items, ResultRef):
+                refs.append(node.items)
+        for ref in refs:
+            reads.add(("id", ref.node_id))
+            if ref.output_type is not None:
+                reads.add(("type", ref.output_type))
+    # References satisfied inside the unit itself (e.g. a Map item or a
+    # sibling step in a branch chain) are not cross-unit dependencies.
+    typed_inputs -= writes
+    reads = (reads - writes) | typed_inputs
+    return reads, typed_inputs, writes, is_barrier
+
+
+def _writes_unknown(steps):
+    # Map items run on overlays that are dropped after collecting, so only
+    # nodes writing to the unit's own store are considered.
+    for step in steps:
+        if step.op == OP_NODE and not step.node.outputs:
+            return True
+        if step.op == OP_PARALLEL and any(_writes_unknown(branch.steps) for branch in step.branches):
+            return True
+    return False
+
+
+def _iter_nodes(steps):
+    for step in steps:
+        if step.node is not None:
+            yield step.node
+        for branch in step.branches:
+            yield from _iter_nodes(branch.steps)
+
+
+def _node_name(node):
+    return node.id or node.__class__.__name__
@@ -1,16 +1,39 @@
 import asyncio
 
 from synthflow.execution.context import ExecutionContext, ExecutionState
+from synthflow.execution.plan import (
+    OP_BRANCH,
+    OP_EXIT,
+    OP_JUMP,
+    OP_MAP,
+    OP_NODE,
+    OP_PARALLEL,
+    ExecutionPlan,
+    compile_plan,
+)
 
 
 class Scheduler:
-    async def run(self, start_node, context: ExecutionContext):
+    MODES = ("sequential", "dag")
+
+    def __init__(self, mode="sequential"):
+        # "sequential" follows the declared `>>` order; "dag" starts each
+        # top-level unit as soon as its inferred data dependencies finished.
+        if mode not in self.MODES:
+            raise ValueError(f"Unsupported scheduler mode: {mode}")
+        self.mode = mode
+
+    async def run(self, start, context: ExecutionContext):
         # Single-run state machine: pending -> running -> terminal.
         # Context is attached to store so deep node calls can publish events.
+        plan = start if isinstance(start, ExecutionPlan) else compile_plan(start)
         context.store.attach_execution_context(context)
         context.transition(ExecutionState.RUNNING, "Flow execution started")
         try:
-            await start_node.execute(context.store)
+            if self.mode == "dag":
+                await self.execute_dag(plan, context.store)
+            else:
+                await self.execute_plan(plan, context.store)
         except asyncio.CancelledError as exc:
             context.error = exc
             context.transition(ExecutionState.CANCELLED, "Flow execution cancelled")
@@ -22,3 +45,193 @@ class Scheduler:
         else:
             context.transition(ExecutionState.SUCCEEDED, "Flow execution succeeded")
             return context.store
+
+    async def execute_plan(self, plan: ExecutionPlan, store, start=0, stop=None, checkpoint=True):
+        # Walk the flat step list with a program counter so frame depth stays
+        # constant regardless of chain length. `blocks` tracks the If/Switch
+        # nodes whose branch is currently running so a failure inside a branch
+        # is also reported on every enclosing control node.
+        steps = plan.steps
+        end = len(steps) if stop is None else stop
+        # Checkpointing runs save each succeeded step and, when resumed, skip
+        # the steps that already succeeded. Map items pass `checkpoint=False`:
+        # their template nodes run once per item.
+        context = store.get_execution_context() if checkpoint else None
+        if context is not None and not context.checkpoint:
+            context = None
+        done = context.resumed_nodes if context is not None else ()
+        blocks = []
+        pc = start
+        try:
+            while pc < end:
+                step = steps[pc]
+                op = step.op
+                if op == OP_NODE:
+                    node = step.node
+                    if not done or node.id not in done:
+                        await node._execute_step(store)
+                        if context is not None:
+                            context.checkpoint_node(node, store)
+                    pc += 1
+                elif op == OP_BRANCH:
+                    step.node._record_node_event(store, "started", "Node execution started")
+                    blocks.append(step.node)
+                    pc = step.table.get(step.node.select_branch(store), step.default)
+                elif op == OP_JUMP:
+                    pc = step.target
+                elif op == OP_EXIT:
+                    blocks.pop()
+                    step.node._record_node_event(store, "succeeded", "Node execution succeeded")
+                    pc += 1
+                elif op == OP_PARALLEL:
+                    if not done or step.node.id not in done:
+                        await self._execute_parallel(step, store, checkpoint)
+                        if context is not None:
+                            context.checkpoint_node(step.node, store)
+                    pc += 1
+                elif op == OP_MAP:
+                    if not done or step.node.id not in done:
+                        await self._execute_map(step, store)
+                        if context is not None:
+                            context.checkpoint_node(step.node, store)
+                    pc += 1
+                else:
+                    raise RuntimeError(f"Unknown plan step: {op}")
+        except asyncio.CancelledError:
+            for node in reversed(blocks):
+                node._record_node_event(store, "cancelled", "Node execution cancelled")
+            raise
+        except Exception as exc:
+            for node in reversed(blocks):
+                node._record_node_event(store, "failed", f"Node execution failed: {exc}")
+            raise
+        return store
+
+    async def execute_dag(self, plan: ExecutionPlan, store):
+        units = plan.dag()
+        waiting = [len(unit.deps) for unit in units]
+        dependents = [[] for _ in units]
+        for position, unit in enumerate(units):
+            for dep in unit.deps:
+                dependents[dep].append(position)
+
+        ready = [position for position, count in enumerate(waiting) if count == 0]
+        running = {}
+        try:
+            while ready or running:
+                for position in ready:
+                    unit = units[position]
+                    task = asyncio.create_task(self.execute_plan(plan, store, unit.start, unit.stop))
+                    running[task] = position
+                ready = []
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    position = running.pop(task)
+                    exc = task.exception()
+                    if exc is not None:
+                        # Fail fast with the original error, as sequential mode does.
+                        raise exc
+                    for dependent in dependents[position]:
+                        waiting[dependent] -= 1
+                        if waiting[dependent] == 0:
+                            ready.append(dependent)
+        finally:
+            # Cancel units still in flight and let them record their events.
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+        return store
+
+    async def _execute_parallel(self, step, store, checkpoint=True):
+        node = step.node
+        node._record_node_event(store, "started", "Node execution started")
+        try:
+            # Each branch runs on a copy-on-write overlay to avoid concurrent
+            # writes on the shared store; merging then applies only its writes.
+            tasks = [
+                asyncio.create_task(self.execute_plan(branch, store.overlay(), checkpoint=checkpoint))
+                for branch in step.branches
+            ]
+            task_to_branch = {task: branch for task, branch in zip(tasks, node.nodes)}
+            pending = set(tasks)
+            completed = {}
+
+            try:
+                while pending:
+                    # Fail fast: as soon as one branch errors, cancel the rest.
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+                    for task in done:
+                        branch = task_to_branch[task]
+                        exc = task.exception()
+                        if exc is not None:
+                            for pending_task in pending:
+                                pending_task.cancel()
+                            if pending:
+                                await asyncio.gather(*pending, return_exceptions=True)
+                            branch_id = branch.id or branch.__class__.__name__
+                            raise RuntimeError(f"Parallel branch '{branch_id}' failed") from exc
+                        completed[task] = task.result()
+            finally:
+                # Ensure no background branch task leaks out of this node lifetime.
+                for task in pending:
+                    task.cancel()
+
+            # Merge by declaration order for deterministic overwrite/keep behavior.
+            for task in tasks:
+                store.merge(completed[task], on_conflict=node.on_conflict)
+        except asyncio.CancelledError:
+            node._record_node_event(store, "cancelled", "Node execution cancelled")
+            raise
+        except Exception as exc:
+            node._record_node_event(store, "failed", f"Node execution failed: {exc}")
+            raise
+        node._record_node_event(store, "succeeded", "Node execution succeeded")
+
+    async def _execute_map(self, step, store):
+        node = step.node
+        template = step.branches[0]
+        node._record_node_event(store, "started", "Node execution started")
+        try:
+            items = node.resolve_items(store)
+            # Workers share one iterator, so at most `concurrency` item stores
+            # are alive at once and each is dropped as soon as it is collected.
+            iterator = enumerate(items)
+            results = []
+
+            async def worker():
+                for index, item in iterator:
+                    results.append(None)
+                    branch_store = store.overlay()
+                    node.bind_item(branch_store, item)
+                    try:
+                        await self.execute_plan(template, branch_store, checkpoint=False)
+                        results[index] = node.collect_result(branch_store)
+                    except Exception as exc:
+                        raise RuntimeError(f"Map '{node.id}' item {index} failed") from exc
+
+            size = len(items) if hasattr(items, "__len__") else node.concurrency
+            workers = [asyncio.create_task(worker()) for _ in range(max(1, min(node.concurrency, size)))]
+            try:
+                done, pending = await asyncio.wait(workers, return_when=asyncio.FIRST_EXCEPTION)
+                for task in done:
+                    exc = task.exception()
+                    if exc is not None:
+                        # Fail fast like Parallel: cancel remaining items.
+                        for pending_task in pending:
+                            pending_task.cancel()
+                        if pending:
+                            await asyncio.gather(*pending, return_exceptions=True)
+                        raise exc
+            finally:
+                for task in workers:
+                    task.cancel()
+
+            store.set_node_result(node.id, results)
+        except asyncio.CancelledError:
+            node._record_node_event(store, "cancelled", "Node execution cancelled")
+            raise
+        except Exception as exc:
+            node._record_node_event(store, "failed", f"Node execution failed: {exc}")
+            raise
+        node._record_node_event(store, "succeeded", "Node execution succeeded")
@@ -0,0 +1,140 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+
+# Lifecycle events are never dropped and are delivered ahead of queued data events.
+CONTROL_EVENTS = frozenset({"flow_state", "node_state"})
+STREAM_POLICIES = ("block", "drop_oldest", "coalesce")
+
+# Returned by `StreamBuffer.get` once the buffer is closed and drained.
+CLOSED = object()
+
+
+@dataclass(frozen=True)
+class CoalesceRule:
+    # Emission-time batching for one event name: consecutive events from the
+    # same node are merged until `window` seconds pass or the merged `field`
+    # text reaches `max_size` characters. Used via ExecutionContext.coalesce.
+    window: float = 0.05
+    max_size: int = 1024
+    field: str = "text"
+
+
+class StreamBuffer:
+    """Live event buffer between a running flow and one stream consumer.
+
+    Without `maxsize` this is a plain FIFO. With it, control events go to
+    their own queue, are always accepted and are delivered ahead of any data
+    backlog. Data events (tokens and other custom events) never exceed
+    `maxsize`; when the backlog is full the policy decides what happens to a
+    new event:
+
+    - "block": `put` waits for room; `put_nowait` raises `asyncio.QueueFull`.
+    - "drop_oldest": the oldest queued `token` event is discarded, or the
+      oldest data event when no token is queued.
+    - "coalesce": a new `token` is merged into the queued `token` before it
+      when both come from the same node and carry `{"text": ...}` payloads;
+      other events make room as under "drop_oldest".
+    """
+
+    def __init__(self, maxsize=None, policy="block"):
+        if policy not in STREAM_POLICIES:
+            raise ValueError(f"Unsupported stream policy: {policy}")
+        self.maxsize = maxsize or 0
+        self.policy = policy
+        self.dropped = 0
+        self.coalesced = 0
+        self._control = deque()
+        self._data = deque()
+        self._closed = False
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+
+    def __len__(self):
+        return len(self._control) + len(self._data)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def full(self):
+        return bool(self.maxsize) and len(self._data) >= self.maxsize
+
+    def put_nowait(self, item):
+        if self._closed:
+            return
+        if self.maxsize and item.event in CONTROL_EVENTS:
+            self._control.append(item)
+        elif not self.full():
+            self._data.append(item)
+        elif self.policy == "block":
+            raise asyncio.QueueFull
+        elif self.policy == "coalesce" and self._coalesce(item):
+            return
+        else:
+            self._drop_oldest()
+            self._data.append(item)
+        self._readable.set()
+        self._update_writable()
+
+    async def put(self, item):
+        # Only the block policy makes producers wait; control events never do.
+        while self.policy == "block" and item.event not in CONTROL_EVENTS and self.full() and not self._closed:
+            await self._writable.wait()
+        self.put_nowait(item)
+
+    async def wait_writable(self):
+        while self.policy == "block" and self.full() and not self._closed:
+            await self._writable.wait()
+
+    async def get(self):
+        while True:
+            if self._control:
+                return self._control.popleft()
+            if self._data:
+                item = self._data.popleft()
+                self._update_writable()
+                return item
+            if self._closed:
+                return CLOSED
+            self._readable.clear()
+            await self._readable.wait()
+
+    def close(self):
+        self._closed = True
+        self._readable.set()
+        self._writable.set()
+
+    def _update_writable(self):
+        if self.full() and not self._closed:
+            self._writable.clear()
+        else:
+            self._writable.set()
+
+    def _drop_oldest(self):
+        # Tokens go first; other data events only when no token is queued.
+        for index, queued in enumerate(self._data):
+            if queued.event == "token":
+                del self._data[index]
+                break
+        else:
+            self._data.popleft()
+        self.dropped += 1
+
+    def _coalesce(self, item):
+        if item.event != "token" or not self._data:
+            return False
+        last = self._data[-1]
+        if last.event != "token" or last.node_id != item.node_id:
+            return False
+        if not isinstance(last.data, dict) or not isinstance(item.data, dict):
+            return False
+        if not isinstance(last.data.get("text"), str) or not isinstance(item.data.get("text"), str):
+            return False
+        # The merged event keeps the newest position so clients can resume after it.
+        self._data[-1] = item.replace(
+            data={**last.data, **item.data, "text": last.data["text"] + item.data["text"]},
+        )
+        self.coalesced += 1
+        return True
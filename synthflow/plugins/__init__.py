@@ -1,5 +1,6 @@
 from synthflow.plugins.cache import Cache
+from synthflow.plugins.disk_cache import DiskCache
 from synthflow.plugins.retry import Retry
 from synthflow.plugins.timeout import Timeout
 
-__all__ = ["Retry", "Timeout", "Cache"]
+__all__ = ["Retry", "Timeout", "Cache", "DiskCache"]
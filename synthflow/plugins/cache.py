@@ -1,9 +1,190 @@
+import asyncio
+import pickle
+import sys
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+def cache_key(node, args, kwargs):
+    """Default key: the node (its id, else its params) plus the resolved call inputs.
+
+    Lists, dicts and sets are frozen recursively; any other unhashable input
+    raises TypeError, which makes `Cache` skip caching for that call.
+    """
+    owner = node.id if node.id is not None else _freeze(node.params)
+    return (type(node).__qualname__, owner, _freeze(args), _freeze(kwargs))
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return (dict, frozenset((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return (frozenset, frozenset(_freeze(item) for item in value))
+    hash(value)
+    return value
+
+
 class Cache:
-    def __init__(self):
-        self._store = {}
+    """Memoize node results across runs: `node.use(Cache(max_entries=512, ttl=60))`.
+
+    Entries are keyed by `key(node, args, kwargs)` (default `cache_key`) and
+    evicted least-recently-used once `max_entries` or `max_bytes` is exceeded;
+    `sizeof(value)` measures an entry for the byte budget. With `ttl`, entries
+    expire that many seconds after they were stored.
+
+    `l2` adds a slower shared tier, e.g. `DiskCache`, consulted on L1 misses
+    under its own key (`l2.key(node, args, kwargs)`) and filled with every
+    computed result. An L2 that fails to read or write (OSError, pickling
+    errors) is skipped for that call and counted in `l2_errors`.
+
+    Concurrent calls for a key that is being computed wait for that single
+    computation instead of running the node again (`coalesced` counts them);
+    failures are shared with the waiters but never cached. Cached values are
+    returned as-is, so nodes should not mutate results they receive.
+    """
 
-    def get(self, key):
-        return self._store.get(key)
+    # Keys need the resolved inputs; see PluginChain.
+    wants_inputs = True
+
+    def __init__(self, max_entries=1024, max_bytes=None, ttl=None, key=None, sizeof=sys.getsizeof, l2=None):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("Cache max_entries must be >= 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("Cache ttl must be > 0")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.key = key or cache_key
+        self.sizeof = sizeof
+        self.l2 = l2
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.coalesced = 0
+        self.uncacheable = 0
+        self.l2_errors = 0
+        # key -> (value, expires_at, nbytes), least recently used first.
+        self._entries = OrderedDict()
+        self._inflight = {}
+
+    @property
+    def entries(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        entry = self._lookup(key)
+        return default if entry is None else entry[0]
 
     def set(self, key, value):
-        self._store[key] = value
+        self.invalidate(key)
+        nbytes = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        self._entries[key] = (value, expires_at, nbytes)
+        self.nbytes += nbytes
+        self._evict()
+
+    def invalidate(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= entry[2]
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
+
+    async def run(self, call_next, store, node, args, kwargs):
+        try:
+            key = self.key(node, args, kwargs)
+            hash(key)
+        except TypeError:
+            self.uncacheable += 1
+            return await call_next()
+
+        while True:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            flight = self._inflight.get(key)
+            if flight is None:
+                break
+            self.coalesced += 1
+            # `wait` never cancels the flight, and raises CancelledError only
+            # when this waiter itself is cancelled; on any Python version.
+            await asyncio.wait((flight,))
+            if not flight.cancelled():
+                return flight.result()
+            # Only the computing call was cancelled; the next waiter takes over.
+
+        self.misses += 1
+        flight = asyncio.get_running_loop().create_future()
+        self._inflight[key] = flight
+        try:
+            value = await self._compute(call_next, node, args, kwargs)
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as exc:
+            flight.set_exception(exc)
+            # Mark retrieved: with no waiters nobody else would, and asyncio logs it.
+            flight.exception()
+            raise
+        else:
+            self.set(key, value)
+            flight.set_result(value)
+            return value
+        finally:
+            del self._inflight[key]
+
+    async def _compute(self, call_next, node, args, kwargs):
+        l2 = self.l2
+        if l2 is None:
+            return await call_next()
+        try:
+            l2_key = l2.key(node, args, kwargs)
+        except TypeError:
+            return await call_next()
+        # Disk tiers block on I/O, so they are used from a worker thread. A
+        # broken tier only costs its hit rate; the node result still counts.
+        try:
+            value = await asyncio.to_thread(l2.get, l2_key, _MISSING)
+        except (OSError, pickle.PickleError):
+            self.l2_errors += 1
+            value = _MISSING
+        if value is _MISSING:
+            value = await call_next()
+            try:
+                await asyncio.to_thread(l2.set, l2_key, value)
+            except (OSError, pickle.PickleError):
+                self.l2_errors += 1
+        return value
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at = entry[1]
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.invalidate(key)
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _evict(self):
+        entries = self._entries
+        while entries and (
+            (self.max_entries is not None and len(entries) > self.max_entries)
+            or (self.max_bytes is not None and self.nbytes > self.max_bytes)
+        ):
+            _, (_, _, nbytes) = entries.popitem(last=False)
+            self.nbytes -= nbytes
+            self.evictions += 1
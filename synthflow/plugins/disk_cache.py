@@ -0,0 +1,207 @@
+import dataclasses
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+_LOCK_NAME = ".lock"
+_TEMP_PREFIX = ".tmp-"
+# Temp files this old were left behind by a crashed writer.
+_STALE_TEMP_SECONDS = 3600
+
+
+def stable_hash(*parts) -> str:
+    """Hex digest of `parts` that is identical across processes and runs.
+
+    Dicts and sets are hashed independent of their order; dataclasses by
+    class and fields; other objects by class and pickle (they must pickle
+    deterministically). Raises TypeError for values that cannot be encoded.
+    """
+    return hashlib.blake2b(_encode(parts), digest_size=20).hexdigest()
+
+
+def _encode(value) -> bytes:
+    if value is None:
+        return b"N"
+    if isinstance(value, bool):
+        return b"B1" if value else b"B0"
+    if isinstance(value, int):
+        return _framed(b"I", repr(value).encode())
+    if isinstance(value, float):
+        return _framed(b"F", value.hex().encode())
+    if isinstance(value, str):
+        return _framed(b"S", value.encode("utf-8", "surrogatepass"))
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return _framed(b"Y", bytes(value))
+    if isinstance(value, (list, tuple)):
+        return _framed(b"L" if isinstance(value, list) else b"T", b"".join(map(_encode, value)))
+    if isinstance(value, dict):
+        items = sorted(_encode(key) + _encode(item) for key, item in value.items())
+        return _framed(b"D", b"".join(items))
+    if isinstance(value, (set, frozenset)):
+        return _framed(b"E", b"".join(sorted(map(_encode, value))))
+    name = _qualified_name(type(value)).encode()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = {field.name: getattr(value, field.name) for field in dataclasses.fields(value)}
+        return _framed(b"C", _framed(b"", name) + _encode(fields))
+    try:
+        payload = pickle.dumps(value, protocol=5)
+    except Exception as exc:
+        raise TypeError(f"Cannot hash {type(value).__name__} for the disk cache: {exc}") from exc
+    return _framed(b"P", _framed(b"", name) + payload)
+
+
+def _framed(tag: bytes, payload: bytes) -> bytes:
+    # Length-prefixed so adjacent values can never run into each other.
+    return tag + len(payload).to_bytes(8, "little") + payload
+
+
+def _qualified_name(cls) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+class DiskCache:
+    """Content-addressed node results on disk, shared by every process using `directory`.
+
+    Use it as the second tier of a `Cache`: `Cache(l2=DiskCache("cache/"))`.
+    Entries are keyed by `stable_hash` of the node class, its params and the
+    resolved inputs (plus `namespace`, bump it when node code changes) and
+    stored as pickles, one file each, written atomically via rename. Reads are
+    lock-free; a hit refreshes the file's mtime, and once roughly a tenth of
+    `max_bytes` was written, the writer takes an exclusive file lock and
+    removes the least recently used entries until the directory is back under
+    90% of `max_bytes`. Only point it at a directory you trust: entries are
+    unpickled on read.
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30, namespace=""):
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        os.makedirs(self.directory, exist_ok=True)
+        self._written = 0
+        self._scan_every = max(1, max_bytes // 10) if max_bytes is not None else None
+
+    def key(self, node, args, kwargs) -> str:
+        return stable_hash(self.namespace, _qualified_name(type(node)), node.params, args, kwargs)
+
+    def get(self, key, default=None):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                value = pickle.load(handle)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except (EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            # Unreadable entry, e.g. from an incompatible version: recompute it.
+            self._unlink(path)
+            self.misses += 1
+            return default
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        try:
+            payload = pickle.dumps(value, protocol=5)
+        except Exception:
+            return False
+        path = self._path(key)
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(prefix=_TEMP_PREFIX, dir=folder)
+        try:
+            with os.fdopen(descriptor, "wb") as handle:
+                handle.write(payload)
+            os.replace(temp_path, path)
+        except BaseException:
+            self._unlink(temp_path)
+            raise
+        self.writes += 1
+        self._written += len(payload)
+        if self._scan_every is not None and self._written >= self._scan_every:
+            self._written = 0
+            self.evict()
+        return True
+
+    def invalidate(self, key):
+        self._unlink(self._path(key))
+
+    @property
+    def nbytes(self) -> int:
+        return sum(size for _, _, size in self._scan())
+
+    def evict(self, target_bytes=None):
+        """Remove least recently used entries until at most `target_bytes` remain."""
+        if target_bytes is None:
+            if self.max_bytes is None:
+                return 0
+            target_bytes = self.max_bytes * 9 // 10
+        removed = 0
+        with self._lock():
+            entries = self._scan()
+            total = sum(size for _, _, size in entries)
+            entries.sort(key=lambda entry: entry[1])
+            for path, _, size in entries:
+                if total <= target_bytes:
+                    break
+                if self._unlink(path):
+                    total -= size
+                    removed += 1
+        self.evictions += removed
+        return removed
+
+    def _scan(self):
+        entries = []
+        stale_before = time.time() - _STALE_TEMP_SECONDS
+        for folder in os.scandir(self.directory):
+            if not folder.is_dir():
+                continue
+            for entry in os.scandir(folder.path):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.startswith(_TEMP_PREFIX):
+                    if stat.st_mtime < stale_before:
+                        self._unlink(entry.path)
+                    continue
+                entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+    @contextmanager
+    def _lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(self.directory, _LOCK_NAME), "a+b") as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def _unlink(self, path):
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            return False
+        return True
@@ -1,12 +1,35 @@
-from synthflow.runtime.models import ArtifactRecord, NodeTraceRecord, RunRecord, RuntimeEvent, WorkflowSnapshot
-from synthflow.runtime.store import InMemoryRunStore, RunStore
+from synthflow.runtime.log import EventLog, EventRetention, event_nbytes
+from synthflow.runtime.models import (
+    ArtifactRecord,
+    EventPage,
+    NodeCheckpoint,
+    NodeTraceRecord,
+    RunClock,
+    RunRecord,
+    RuntimeEvent,
+    WorkflowSnapshot,
+)
+from synthflow.runtime.segments import SegmentedRunStore
+from synthflow.runtime.sqlite import SQLiteRunStore
+from synthflow.runtime.store import InMemoryRunStore, RunRetention, RunStore
+from synthflow.runtime.writebehind import WriteBehindRunStore
 
 __all__ = [
     "ArtifactRecord",
+    "EventLog",
+    "EventPage",
+    "EventRetention",
+    "NodeCheckpoint",
     "NodeTraceRecord",
+    "RunClock",
     "RunRecord",
+    "RunRetention",
     "RuntimeEvent",
     "WorkflowSnapshot",
+    "event_nbytes",
     "InMemoryRunStore",
     "RunStore",
+    "SegmentedRunStore",
+    "SQLiteRunStore",
+    "WriteBehindRunStore",
 ]
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import sys
+from bisect import bisect_right
+from dataclasses import dataclass
+from operator import attrgetter
+
+from synthflow.runtime.models import TERMINAL_STATES, EventPage, RuntimeEvent
+
+_sequence_id = attrgetter("sequence_id")
+# Record object plus its sequence id and monotonic ns ints.
+_RECORD_NBYTES = sys.getsizeof(RuntimeEvent("", 0)) + 2 * sys.getsizeof(2**62)
+
+
+def event_nbytes(event: RuntimeEvent) -> int:
+    """Approximate resident size of an event: record, payload and its string values."""
+    data = event.data
+    if data is None:
+        return _RECORD_NBYTES
+    size = _RECORD_NBYTES + sys.getsizeof(data)
+    if isinstance(data, dict):
+        for value in data.values():
+            if isinstance(value, str):
+                size += sys.getsizeof(value)
+    return size
+
+
+@dataclass(frozen=True)
+class EventRetention:
+    # `max_events` keeps only the newest N events of a run (a ring buffer).
+    # `drop_token_payloads` clears the `data` of a node's `token` events once
+    # that node finishes; sequence ids stay contiguous for replay cursors.
+    max_events: int | None = None
+    drop_token_payloads: bool = False
+
+
+class EventLog:
+    """Per-run event sequence, as kept by the execution context and in-memory stores.
+
+    The context and `InMemoryRunStore` each hold their own log, each with its
+    own retention, but append the same `RuntimeEvent` objects, so a payload
+    is not copied. Other views (node events, stream history, store replay)
+    read from a log rather than keeping copies.
+    """
+
+    def __init__(self, retention: EventRetention | None = None, measure: bool = False):
+        self.retention = retention or EventRetention()
+        # With `measure`, `nbytes` tracks event_nbytes() of the retained events.
+        self.measure = measure
+        self.nbytes = 0
+        self._events: list[RuntimeEvent | None] = []
+        # Evicted ring-buffer slots are trimmed lazily so appends stay O(1) amortized.
+        self._head = 0
+        # Absolute index of `_events[0]`; lets per-node token indexes survive trimming.
+        self._base = 0
+        self._tokens: dict[str, list[int]] = {}
+
+    def __len__(self):
+        return len(self._events) - self._head
+
+    def __iter__(self):
+        for index in range(self._head, len(self._events)):
+            yield self._events[index]
+
+    def append(self, event: RuntimeEvent):
+        self._events.append(event)
+        if self.measure:
+            self.nbytes += event_nbytes(event)
+        retention = self.retention
+        if retention.drop_token_payloads and event.node_id is not None:
+            if event.event == "token":
+                position = self._base + len(self._events) - 1
+                self._tokens.setdefault(event.node_id, []).append(position)
+            elif event.event == "node_state" and (event.data or {}).get("state") in TERMINAL_STATES:
+                self._drop_token_payloads(event.node_id)
+        if retention.max_events is not None and len(self) > retention.max_events:
+            self._evict_oldest()
+
+    def events(self) -> list[RuntimeEvent]:
+        return self._events[self._head:]
+
+    def page(self, after_sequence_id: int | None = None, limit: int | None = None) -> EventPage:
+        # Sequence ids only grow, so the cursor is found by bisection and only
+        # the requested slice is copied.
+        events = self._events
+        start = self._head
+        if after_sequence_id is not None:
+            start = bisect_right(events, after_sequence_id, lo=start, key=_sequence_id)
+        stop = len(events) if limit is None else min(len(events), start + limit)
+        page = events[start:stop]
+        cursor = page[-1].sequence_id if page else after_sequence_id
+        return EventPage(events=page, next_cursor=cursor, has_more=stop < len(events))
+
+    def _evict_oldest(self):
+        if self.measure:
+            self.nbytes -= event_nbytes(self._events[self._head])
+        self._events[self._head] = None
+        self._head += 1
+        if self._head >= len(self._events) // 2:
+            del self._events[: self._head]
+            self._base += self._head
+            self._head = 0
+
+    def _drop_token_payloads(self, node_id: str):
+        # Replace rather than mutate: live stream consumers may still hold the
+        # original event objects and must see the full payload.
+        first = self._base + self._head
+        for position in self._tokens.pop(node_id, ()):
+            if position < first:
+                continue
+            index = position - self._base
+            event = self._events[index]
+            if event is not None and event.data is not None:
+                self._events[index] = event.replace(data=None)
+                if self.measure:
+                    self.nbytes -= event_nbytes(event) - _RECORD_NBYTES
@@ -1,8 +1,16 @@
+import importlib
+import time
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
+_UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
 
-@dataclass
+# Node and run states after which nothing more runs.
+TERMINAL_STATES = frozenset({"succeeded", "failed", "cancelled"})
+
+
+@dataclass(slots=True)
 class ArtifactRecord:
     artifact_id: str
     name: str
@@ -12,7 +20,7 @@ class ArtifactRecord:
     metadata: dict = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class NodeTraceRecord:
     run_id: str
     node_id: str
@@ -26,18 +34,121 @@ class NodeTraceRecord:
     error_summary: str | None = None
 
 
-@dataclass
+class RunClock:
+    """Wall-clock anchor for one run.
+
+    Events only record `time.monotonic_ns()`; the anchor turns that into an
+    aware `datetime` when a timestamp is actually read.
+    """
+
+    __slots__ = ("wall", "monotonic_ns", "wall_ns")
+
+    def __init__(self, wall: datetime | None = None, monotonic_ns: int | None = None):
+        self.monotonic_ns = time.monotonic_ns() if monotonic_ns is None else monotonic_ns
+        self.wall = wall or datetime.now(timezone.utc)
+        # Nanoseconds since the Unix epoch at the anchor, for compact storage.
+        self.wall_ns = (self.wall - _UNIX_EPOCH) // _MICROSECOND * 1000
+
+    def to_datetime(self, monotonic_ns: int) -> datetime:
+        return self.wall + timedelta(microseconds=(monotonic_ns - self.monotonic_ns) // 1000)
+
+    def to_epoch_ns(self, monotonic_ns: int) -> int:
+        return self.wall_ns + monotonic_ns - self.monotonic_ns
+
+    def now(self) -> datetime:
+        return self.to_datetime(time.monotonic_ns())
+
+
+# Clock for events loaded from storage: their `monotonic_ns` is Unix epoch ns.
+EPOCH_CLOCK = RunClock(_UNIX_EPOCH, 0)
+
+
 class RuntimeEvent:
-    run_id: str
-    sequence_id: int
-    timestamp: datetime
-    event: str
-    data: object = None
-    node_id: str | None = None
-    node_type: str | None = None
+    """One event of a run, as streamed, kept in memory and persisted.
+
+    Slotted rather than a dataclass: runs can produce many thousands of these.
+    Passing `timestamp` (e.g. when loading from storage) anchors the event to
+    its own clock; the execution context passes its run clock instead.
+    """
+
+    __slots__ = ("run_id", "sequence_id", "event", "data", "node_id", "node_type", "monotonic_ns", "clock")
+
+    def __init__(
+        self,
+        run_id: str,
+        sequence_id: int,
+        timestamp: datetime | None = None,
+        event: str = "",
+        data: object = None,
+        node_id: str | None = None,
+        node_type: str | None = None,
+        monotonic_ns: int = 0,
+        clock: RunClock | None = None,
+    ):
+        self.run_id = run_id
+        self.sequence_id = sequence_id
+        self.event = event
+        self.data = data
+        self.node_id = node_id
+        self.node_type = node_type
+        self.monotonic_ns = monotonic_ns
+        if timestamp is not None:
+            clock = RunClock(timestamp, monotonic_ns)
+        self.clock = clock
+
+    @property
+    def timestamp(self) -> datetime | None:
+        clock = self.clock
+        if clock is None:
+            return None
+        return clock.to_datetime(self.monotonic_ns)
+
+    @property
+    def epoch_ns(self) -> int | None:
+        clock = self.clock
+        if clock is None:
+            return None
+        return clock.to_epoch_ns(self.monotonic_ns)
 
+    def replace(self, **changes) -> "RuntimeEvent":
+        clone = RuntimeEvent.__new__(RuntimeEvent)
+        for name in RuntimeEvent.__slots__:
+            setattr(clone, name, changes.get(name, getattr(self, name)))
+        return clone
 
-@dataclass
+    def __eq__(self, other):
+        if not isinstance(other, RuntimeEvent):
+            return NotImplemented
+        return (
+            self.run_id == other.run_id
+            and self.sequence_id == other.sequence_id
+            and self.event == other.event
+            and self.data == other.data
+            and self.node_id == other.node_id
+            and self.node_type == other.node_type
+            and self.timestamp == other.timestamp
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (
+            f"RuntimeEvent(run_id={self.run_id!r}, sequence_id={self.sequence_id!r}, "
+            f"timestamp={self.timestamp!r}, event={self.event!r}, data={self.data!r}, "
+            f"node_id={self.node_id!r}, node_type={self.node_type!r})"
+        )
+
+
+@dataclass(slots=True)
+class EventPage:
+    # One page of a run's events. Pass `next_cursor` back as
+    # `after_sequence_id` to continue; it stays put once the client caught up.
+    events: list[RuntimeEvent]
+    next_cursor: int | None
+    has_more: bool = False
+
+
+@dataclass(slots=True)
 class RunRecord:
     run_id: str
     flow_name: str
@@ -50,7 +161,62 @@ class RunRecord:
     artifacts: list[ArtifactRecord] = field(default_factory=list)
 
 
-@dataclass
+# Checkpoint id under which a run's seeded inputs are saved.
+INPUTS_CHECKPOINT = "__inputs__"
+
+
+@dataclass(slots=True)
+class NodeCheckpoint:
+    # What a succeeded node wrote to the DataStore: its node result (if any)
+    # and its typed outputs. `Flow.resume` restores these instead of running
+    # the node again.
+    node_id: str
+    result: object = None
+    has_result: bool = False
+    outputs: dict = field(default_factory=dict)
+
+    def to_row(self) -> tuple:
+        # Picklable form for durable stores. Type keys travel by name, as in
+        # DataStore snapshots, so classes are resolved by import on load.
+        outputs = [(*encode_type_key(key), value) for key, value in self.outputs.items()]
+        return self.node_id, self.result, self.has_result, outputs
+
+    @classmethod
+    def from_row(cls, row, types: dict | None = None) -> "NodeCheckpoint":
+        node_id, result, has_result, outputs = row
+        types = {} if types is None else types
+        return cls(
+            node_id,
+            result,
+            has_result,
+            {decode_type_key(is_type, key, types): value for is_type, key, value in outputs},
+        )
+
+
+def encode_type_key(key) -> tuple:
+    """DataStore key as `(is_type, key)`, with classes written as "module:qualname"."""
+    if isinstance(key, type):
+        if "<locals>" in key.__qualname__:
+            raise TypeError(f"Cannot persist a value keyed by local class {key.__qualname__}")
+        return True, f"{key.__module__}:{key.__qualname__}"
+    return False, key
+
+
+def decode_type_key(is_type: bool, key, types: dict):
+    # `types` caches resolved names across the keys of one load.
+    if not is_type:
+        return key
+    resolved = types.get(key)
+    if resolved is None:
+        module_name, _, qualname = key.partition(":")
+        resolved = importlib.import_module(module_name)
+        for part in qualname.split("."):
+            resolved = getattr(resolved, part)
+        types[key] = resolved
+    return resolved
+
+
+@dataclass(slots=True)
 class WorkflowSnapshot:
     run_id: str
     flow_name: str
@@ -65,4 +231,7 @@ class WorkflowSnapshot:
     failed_nodes: list[str] = field(default_factory=list)
     node_statuses: dict[str, str] = field(default_factory=dict)
     artifacts: list[ArtifactRecord] = field(default_factory=list)
+    # First "started" and last terminal transition per node.
+    node_started_at: dict[str, datetime] = field(default_factory=dict)
+    node_finished_at: dict[str, datetime] = field(default_factory=dict)
 
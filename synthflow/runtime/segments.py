@@ -0,0 +1,620 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+import threading
+from bisect import bisect_right
+from dataclasses import asdict, replace
+from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+from urllib.parse import quote
+
+from synthflow.runtime.models import (
+    EPOCH_CLOCK,
+    TERMINAL_STATES,
+    ArtifactRecord,
+    EventPage,
+    NodeCheckpoint,
+    RunRecord,
+    RuntimeEvent,
+    WorkflowSnapshot,
+)
+from synthflow.runtime.store import RunStore
+
+# Record header: total record size, sequence_id, epoch ns timestamp and the
+# byte lengths of run_id, event name and node_id. They are followed by those
+# strings and a JSON `[data, node_type]` payload, so scans can skip or route
+# records without decoding JSON.
+_HEADER = struct.Struct("<IqqHHH")
+_NO_TIMESTAMP = -(2**63)
+_NO_NODE = 0xFFFF
+_MANIFEST = "MANIFEST"
+_RUNS = "runs.jsonl"
+_CHECKPOINTS = "checkpoints"
+_json_decode = json.JSONDecoder().decode
+
+
+class _Segment:
+    __slots__ = ("name", "path", "size", "live", "map", "mapped")
+
+    def __init__(self, name: str, path: str, size: int = 0):
+        self.name = name
+        self.path = path
+        self.size = size
+        # Bytes that still belong to runs in the store; the rest is garbage.
+        self.live = 0
+        self.map: mmap.mmap | None = None
+        self.mapped = 0
+
+
+class _SegmentRun:
+    # Per-run position data rebuilt from the segments on open.
+    __slots__ = (
+        "record",
+        "segments",
+        "index",
+        "count",
+        "last_sequence_id",
+        "current_node_id",
+        "node_statuses",
+        "node_started",
+        "node_finished",
+    )
+
+    def __init__(self):
+        self.record: RunRecord | None = None
+        self.reset_positions()
+
+    def reset_positions(self):
+        # [segment, offset of this run's first record, offset of its last], in log order.
+        self.segments: list[list] = []
+        # Sparse (sequence_id, position in `segments`, offset) entries.
+        self.index: list[tuple[int, int, int]] = []
+        self.count = 0
+        self.last_sequence_id = 0
+        self.current_node_id: str | None = None
+        self.node_statuses: dict[str, str] = {}
+        self.node_started: dict[str, int] = {}
+        self.node_finished: dict[str, int] = {}
+
+
+class SegmentedRunStore(RunStore):
+    """File-backed RunStore built on append-only, length-prefixed segments.
+
+    Events are appended to the active segment, which is sealed once it grows
+    past `segment_bytes`. A sparse in-memory index (each run's first record in
+    every segment plus every `index_every`-th event) locates the start of a
+    read, and readers scan memory-mapped segments from there. `compact()`
+    rewrites sealed segments without deleted runs, grouping each run's events
+    together. Run records live in a small `runs.jsonl` journal and node
+    checkpoints in one append-only pickle file per run under `checkpoints/`.
+
+    Writes are buffered and flushed before reads, on run updates and on
+    `close()`; pass `fsync=True` to also fsync at those points.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 64 << 20,
+        index_every: int = 64,
+        fsync: bool = False,
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.index_every = index_every
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        self._runs: dict[str, _SegmentRun] = {}
+        self._segments: list[_Segment] = []
+        self._next_segment = 0
+        os.makedirs(os.path.join(directory, _CHECKPOINTS), exist_ok=True)
+        self._load_runs()
+        self._load_segments()
+        self._file = open(self._segments[-1].path, "ab")
+        self._runs_file = open(os.path.join(directory, _RUNS), "a", encoding="utf-8")
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments)
+
+    @property
+    def garbage_bytes(self) -> int:
+        # Bytes of deleted runs that `compact()` would reclaim (sealed or not).
+        return sum(segment.size - segment.live for segment in self._segments)
+
+    def create_run(self, run: RunRecord):
+        with self._lock:
+            entry = self._entry(run.run_id)
+            entry.record = replace(run)
+            self._journal(entry.record)
+
+    def update_run(self, run_id: str, **updates):
+        with self._lock:
+            entry = self._runs.get(run_id)
+            if entry is None or entry.record is None:
+                return None
+            for key, value in updates.items():
+                setattr(entry.record, key, value)
+            self._journal(entry.record)
+            self.flush()
+            return self._current(entry)
+
+    def get_run(self, run_id: str) -> RunRecord | None:
+        with self._lock:
+            entry = self._runs.get(run_id)
+            if entry is None or entry.record is None:
+                return None
+            return self._current(entry)
+
+    def delete_run(self, run_id: str):
+        """Forget a run; its bytes are reclaimed by the next `compact()`."""
+        with self._lock:
+            entry = self._runs.pop(run_id, None)
+            if entry is None:
+                return
+            self._file.flush()
+            run_bytes = run_id.encode()
+            for segment, first, last in entry.segments:
+                segment.live -= sum(size for _, size in self._run_records(segment, first, last, run_bytes))
+            self._deleted.add(run_id)
+            self._unlink_checkpoints(run_id)
+            self._runs_file.write(json.dumps({"run_id": run_id, "deleted": True}) + "\n")
+
+    def append_event(self, event: RuntimeEvent):
+        run_bytes = event.run_id.encode()
+        event_bytes = event.event.encode()
+        node_bytes = b"" if event.node_id is None else event.node_id.encode()
+        payload = json.dumps([event.data, event.node_type], default=repr, separators=(",", ":")).encode()
+        timestamp_ns = event.epoch_ns
+        size = _HEADER.size + len(run_bytes) + len(event_bytes) + len(node_bytes) + len(payload)
+        header = _HEADER.pack(
+            size,
+            event.sequence_id,
+            _NO_TIMESTAMP if timestamp_ns is None else timestamp_ns,
+            len(run_bytes),
+            len(event_bytes),
+            _NO_NODE if event.node_id is None else len(node_bytes),
+        )
+        with self._lock:
+            segment = self._segments[-1]
+            offset = segment.size
+            self._file.write(b"".join((header, run_bytes, event_bytes, node_bytes, payload)))
+            segment.size += size
+            self._track(
+                self._entry(event.run_id),
+                segment,
+                offset,
+                size,
+                event.sequence_id,
+                timestamp_ns,
+                event.event,
+                event.node_id,
+                event.data,
+            )
+            if segment.size >= self.segment_bytes:
+                self._rotate()
+
+    def list_events(self, run_id: str, after_sequence_id: int | None = None) -> list[RuntimeEvent]:
+        return self.page_events(run_id, after_sequence_id=after_sequence_id).events
+
+    def page_events(
+        self, run_id: str, after_sequence_id: int | None = None, limit: int | None = None
+    ) -> EventPage:
+        after = -1 if after_sequence_id is None else after_sequence_id
+        with self._lock:
+            entry = self._runs.get(run_id)
+            if entry is None or not entry.index:
+                return EventPage(events=[], next_cursor=after_sequence_id)
+            self._file.flush()
+            # Start from the last indexed record at or before the cursor.
+            position = max(bisect_right(entry.index, after, key=itemgetter(0)) - 1, 0)
+            _, segment_position, offset = entry.index[position]
+            wanted = None if limit is None else limit + 1
+            events = list(islice(self._iter_events(entry, run_id, segment_position, offset, after), wanted))
+        has_more = wanted is not None and len(events) == wanted
+        if has_more:
+            events.pop()
+        cursor = events[-1].sequence_id if events else after_sequence_id
+        return EventPage(events=events, next_cursor=cursor, has_more=has_more)
+
+    def get_snapshot(self, run_id: str) -> WorkflowSnapshot | None:
+        with self._lock:
+            entry = self._runs.get(run_id)
+            if entry is None or entry.record is None:
+                return None
+            run = self._current(entry)
+            node_statuses = dict(entry.node_statuses)
+            started = dict(entry.node_started)
+            finished = dict(entry.node_finished)
+        return WorkflowSnapshot(
+            run_id=run.run_id,
+            flow_name=run.flow_name,
+            status=run.status,
+            started_at=run.started_at,
+            finished_at=run.finished_at,
+            error=run.error,
+            current_node_id=run.current_node_id,
+            last_sequence_id=run.last_sequence_id,
+            active_nodes=[node_id for node_id, state in node_statuses.items() if state == "started"],
+            completed_nodes=[node_id for node_id, state in node_statuses.items() if state == "succeeded"],
+            failed_nodes=[node_id for node_id, state in node_statuses.items() if state == "failed"],
+            node_statuses=node_statuses,
+            artifacts=list(run.artifacts),
+            node_started_at={node_id: EPOCH_CLOCK.to_datetime(ns) for node_id, ns in started.items()},
+            node_finished_at={node_id: EPOCH_CLOCK.to_datetime(ns) for node_id, ns in finished.items()},
+        )
+
+    def compact(self) -> int:
+        """Rewrite sealed segments without deleted runs; returns bytes reclaimed.
+
+        Each run's sealed events are written contiguously, so replaying a
+        finished run afterwards reads one region instead of many.
+        """
+        with self._lock:
+            sealed = self._segments[:-1]
+            if not sealed:
+                return 0
+            self._file.flush()
+            before = sum(segment.size for segment in sealed)
+            active = self._segments[-1]
+            outputs = []
+            writer = None
+            for run_id, entry in self._runs.items():
+                run_bytes = run_id.encode()
+                for segment, first, last in entry.segments:
+                    if segment is active:
+                        continue
+                    mm = self._map(segment)
+                    for offset, size in self._run_records(segment, first, last, run_bytes):
+                        if writer is None or outputs[-1].size >= self.segment_bytes:
+                            if writer is not None:
+                                self._seal(writer)
+                            outputs.append(self._new_segment())
+                            writer = open(outputs[-1].path + ".tmp", "wb")
+                        writer.write(mm[offset : offset + size])
+                        outputs[-1].size += size
+            if writer is not None:
+                self._seal(writer)
+
+            # Outputs only become visible through the manifest swap below.
+            for output in outputs:
+                os.replace(output.path + ".tmp", output.path)
+            self._write_manifest([segment.name for segment in outputs + self._segments[-1:]])
+            for segment in sealed:
+                self._unmap(segment)
+                os.remove(segment.path)
+            self._rewrite_runs_journal()
+            # Positions moved, so rebuild the index from the compacted log.
+            self._load_segments()
+            return before - sum(segment.size for segment in outputs)
+
+    def save_checkpoint(self, run_id: str, checkpoint: NodeCheckpoint):
+        try:
+            payload = pickle.dumps(checkpoint.to_row(), protocol=5)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Not checkpointed: the node simply runs again on resume.
+            return
+        with self._lock:
+            with open(self._checkpoint_path(run_id), "ab") as handle:
+                handle.write(payload)
+                if self.fsync:
+                    handle.flush()
+                    os.fsync(handle.fileno())
+
+    def load_checkpoints(self, run_id: str) -> dict[str, NodeCheckpoint]:
+        checkpoints = {}
+        types = {}
+        try:
+            handle = open(self._checkpoint_path(run_id), "rb")
+        except FileNotFoundError:
+            return checkpoints
+        with handle:
+            while True:
+                try:
+                    checkpoint = NodeCheckpoint.from_row(pickle.load(handle), types)
+                except EOFError:
+                    break
+                except pickle.UnpicklingError:
+                    # Torn tail from a crash mid-write; earlier checkpoints stand.
+                    break
+                checkpoints[checkpoint.node_id] = checkpoint
+        return checkpoints
+
+    def delete_checkpoints(self, run_id: str):
+        with self._lock:
+            self._unlink_checkpoints(run_id)
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+            self._runs_file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+                os.fsync(self._runs_file.fileno())
+
+    def close(self):
+        with self._lock:
+            if self._file.closed:
+                return
+            self.flush()
+            self._file.close()
+            self._runs_file.close()
+            for segment in self._segments:
+                self._unmap(segment)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _checkpoint_path(self, run_id: str) -> str:
+        return os.path.join(self.directory, _CHECKPOINTS, quote(run_id, safe=""))
+
+    def _unlink_checkpoints(self, run_id: str):
+        try:
+            os.unlink(self._checkpoint_path(run_id))
+        except FileNotFoundError:
+            pass
+
+    def _entry(self, run_id: str) -> _SegmentRun:
+        entry = self._runs.get(run_id)
+        if entry is None:
+            entry = self._runs[run_id] = _SegmentRun()
+        return entry
+
+    def _current(self, entry: _SegmentRun) -> RunRecord:
+        # Records are kept mutable here, so callers always get a copy.
+        record = entry.record
+        return replace(
+            record,
+            last_sequence_id=max(record.last_sequence_id, entry.last_sequence_id),
+            current_node_id=entry.current_node_id or record.current_node_id,
+        )
+
+    def _track(self, entry, segment, offset, size, sequence_id, timestamp_ns, event, node_id, data):
+        if not entry.segments or entry.segments[-1][0] is not segment:
+            entry.segments.append([segment, offset, offset])
+            entry.index.append((sequence_id, len(entry.segments) - 1, offset))
+        else:
+            entry.segments[-1][2] = offset
+            if entry.count % self.index_every == 0:
+                entry.index.append((sequence_id, len(entry.segments) - 1, offset))
+        entry.count += 1
+        segment.live += size
+        entry.last_sequence_id = sequence_id
+        if node_id is None:
+            return
+        entry.current_node_id = node_id
+        if event == "node_state":
+            state = (data or {}).get("state")
+            entry.node_statuses[node_id] = state
+            if timestamp_ns is None:
+                return
+            if state == "started":
+                entry.node_started.setdefault(node_id, timestamp_ns)
+            elif state in TERMINAL_STATES:
+                entry.node_finished[node_id] = timestamp_ns
+
+    def _iter_events(self, entry, run_id, segment_position, offset, after):
+        run_bytes = run_id.encode()
+        run_end = _HEADER.size + len(run_bytes)
+        unpack = _HEADER.unpack_from
+        for position in range(segment_position, len(entry.segments)):
+            segment, first, last = entry.segments[position]
+            mm = self._map(segment)
+            record = offset if position == segment_position else first
+            while record <= last:
+                size, sequence_id, timestamp_ns, run_len, event_len, node_len = unpack(mm, record)
+                # Other runs' records are skipped on their header alone.
+                if (
+                    sequence_id > after
+                    and run_len == len(run_bytes)
+                    and mm[record + _HEADER.size : record + run_end] == run_bytes
+                ):
+                    cursor = record + run_end + event_len
+                    event = mm[record + run_end : cursor].decode()
+                    node_id = None
+                    if node_len != _NO_NODE:
+                        node_id = mm[cursor : cursor + node_len].decode()
+                        cursor += node_len
+                    data, node_type = _json_decode(mm[cursor : record + size].decode())
+                    yield _decode_event(run_id, sequence_id, timestamp_ns, event, data, node_id, node_type)
+                record += size
+
+    def _run_records(self, segment, start, last, run_bytes):
+        # (offset, size) of this run's records, skipping others by header only.
+        mm = self._map(segment)
+        offset = start
+        while offset <= last:
+            size, _, _, run_len, _, _ = _HEADER.unpack_from(mm, offset)
+            cursor = offset + _HEADER.size
+            if mm[cursor : cursor + run_len] == run_bytes:
+                yield offset, size
+            offset += size
+
+    def _map(self, segment) -> mmap.mmap:
+        # Sealed segments are mapped once; the active one is remapped as it grows.
+        if segment.map is None or segment.mapped < segment.size:
+            self._unmap(segment)
+            with open(segment.path, "rb") as handle:
+                segment.map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            segment.mapped = len(segment.map)
+        return segment.map
+
+    def _unmap(self, segment):
+        if segment.map is not None:
+            segment.map.close()
+            segment.map = None
+            segment.mapped = 0
+
+    def _rotate(self):
+        self._seal(self._file)
+        segment = self._new_segment()
+        self._segments.append(segment)
+        # The manifest names the new segment before anything is written to it.
+        self._write_manifest([item.name for item in self._segments])
+        self._file = open(segment.path, "ab")
+
+    def _seal(self, handle):
+        handle.flush()
+        if self.fsync:
+            os.fsync(handle.fileno())
+        handle.close()
+
+    def _new_segment(self) -> _Segment:
+        name = f"seg-{self._next_segment:08d}.log"
+        self._next_segment += 1
+        return _Segment(name, os.path.join(self.directory, name))
+
+    def _write_manifest(self, names):
+        path = os.path.join(self.directory, _MANIFEST)
+        with open(path + ".tmp", "w", encoding="utf-8") as handle:
+            json.dump(names, handle)
+            handle.flush()
+            if self.fsync:
+                os.fsync(handle.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _load_segments(self):
+        # Rebuild segment and per-run position state by scanning every record
+        # once; JSON is only decoded for node_state records.
+        for segment in self._segments:
+            self._unmap(segment)
+        for entry in self._runs.values():
+            entry.reset_positions()
+
+        manifest = os.path.join(self.directory, _MANIFEST)
+        names = []
+        if os.path.exists(manifest):
+            with open(manifest, encoding="utf-8") as handle:
+                names = json.load(handle)
+        for name in os.listdir(self.directory):
+            # Leftovers of an interrupted rotation or compaction.
+            if name.startswith("seg-") and name not in names:
+                os.remove(os.path.join(self.directory, name))
+        self._segments = [_Segment(name, os.path.join(self.directory, name)) for name in names]
+        if names:
+            self._next_segment = max(self._next_segment, *(int(name[4:12]) + 1 for name in names))
+        if not self._segments:
+            self._segments.append(self._new_segment())
+            open(self._segments[0].path, "ab").close()
+            self._write_manifest([self._segments[0].name])
+
+        for segment in self._segments:
+            segment.size = os.path.getsize(segment.path)
+            segment.live = 0
+            if segment.size:
+                self._index_segment(segment)
+
+    def _index_segment(self, segment):
+        mm = self._map(segment)
+        offset = 0
+        while offset + _HEADER.size <= segment.size:
+            size, sequence_id, timestamp_ns, run_len, event_len, node_len = _HEADER.unpack_from(mm, offset)
+            if size < _HEADER.size or offset + size > segment.size:
+                break
+            cursor = offset + _HEADER.size
+            run_id = mm[cursor : cursor + run_len].decode()
+            cursor += run_len
+            event = mm[cursor : cursor + event_len].decode()
+            cursor += event_len
+            node_id = None
+            data = None
+            if node_len != _NO_NODE:
+                node_id = mm[cursor : cursor + node_len].decode()
+                cursor += node_len
+                if event == "node_state":
+                    data = json.loads(mm[cursor : offset + size])[0]
+            if run_id not in self._deleted:
+                self._track(
+                    self._entry(run_id),
+                    segment,
+                    offset,
+                    size,
+                    sequence_id,
+                    None if timestamp_ns == _NO_TIMESTAMP else timestamp_ns,
+                    event,
+                    node_id,
+                    data,
+                )
+            offset += size
+        if offset < segment.size:
+            # A record torn by a crash: drop it so appends continue cleanly.
+            self._unmap(segment)
+            with open(segment.path, "r+b") as handle:
+                handle.truncate(offset)
+            segment.size = offset
+
+    def _load_runs(self):
+        self._deleted = set()
+        path = os.path.join(self.directory, _RUNS)
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    values = json.loads(line)
+                except ValueError:
+                    continue
+                run_id = values["run_id"]
+                if values.get("deleted"):
+                    self._runs.pop(run_id, None)
+                    self._deleted.add(run_id)
+                    continue
+                self._deleted.discard(run_id)
+                self._entry(run_id).record = _decode_run(values)
+
+    def _journal(self, record: RunRecord):
+        self._runs_file.write(json.dumps(_encode_run(record), default=repr) + "\n")
+
+    def _rewrite_runs_journal(self):
+        path = os.path.join(self.directory, _RUNS)
+        self._runs_file.close()
+        with open(path + ".tmp", "w", encoding="utf-8") as handle:
+            for entry in self._runs.values():
+                if entry.record is not None:
+                    handle.write(json.dumps(_encode_run(entry.record), default=repr) + "\n")
+            # Tombstones stay: deleted runs may still have events in the active segment.
+            for run_id in self._deleted:
+                handle.write(json.dumps({"run_id": run_id, "deleted": True}) + "\n")
+        os.replace(path + ".tmp", path)
+        self._runs_file = open(path, "a", encoding="utf-8")
+
+
+def _encode_run(record: RunRecord) -> dict:
+    values = asdict(record)
+    for name in ("started_at", "finished_at"):
+        if values[name] is not None:
+            values[name] = values[name].isoformat()
+    return values
+
+
+def _decode_run(values: dict) -> RunRecord:
+    for name in ("started_at", "finished_at"):
+        if values.get(name) is not None:
+            values[name] = datetime.fromisoformat(values[name])
+    values["artifacts"] = [ArtifactRecord(**artifact) for artifact in values.get("artifacts", ())]
+    return RunRecord(**values)
+
+
+def _decode_event(run_id, sequence_id, timestamp_ns, event, data, node_id, node_type) -> RuntimeEvent:
+    # Decoded strings are fresh objects; intern the highly repetitive ones.
+    has_time = timestamp_ns != _NO_TIMESTAMP
+    return RuntimeEvent(
+        run_id,
+        sequence_id,
+        None,
+        sys.intern(event),
+        data,
+        None if node_id is None else sys.intern(node_id),
+        None if node_type is None else sys.intern(node_type),
+        timestamp_ns if has_time else 0,
+        EPOCH_CLOCK if has_time else None,
+    )
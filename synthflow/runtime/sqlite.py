@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import json
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import asdict
+from datetime import datetime
+
+from synthflow.runtime.models import (
+    EPOCH_CLOCK,
+    TERMINAL_STATES,
+    ArtifactRecord,
+    EventPage,
+    NodeCheckpoint,
+    RunRecord,
+    RuntimeEvent,
+    WorkflowSnapshot,
+)
+from synthflow.runtime.store import RunStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    flow_name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    error TEXT,
+    current_node_id TEXT,
+    last_sequence_id INTEGER NOT NULL DEFAULT 0,
+    artifacts TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS events (
+    run_id TEXT NOT NULL,
+    sequence_id INTEGER NOT NULL,
+    timestamp_ns INTEGER,
+    event TEXT NOT NULL,
+    data TEXT,
+    node_id TEXT,
+    node_type TEXT,
+    PRIMARY KEY (run_id, sequence_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS nodes (
+    run_id TEXT NOT NULL,
+    node_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    state TEXT,
+    started_ns INTEGER,
+    finished_ns INTEGER,
+    PRIMARY KEY (run_id, node_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS checkpoints (
+    run_id TEXT NOT NULL,
+    node_id TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    PRIMARY KEY (run_id, node_id)
+) WITHOUT ROWID;
+"""
+
+_RUN_COLUMNS = (
+    "run_id",
+    "flow_name",
+    "status",
+    "started_at",
+    "finished_at",
+    "error",
+    "current_node_id",
+    "last_sequence_id",
+    "artifacts",
+)
+
+# First start is kept, the latest terminal transition wins; `position` keeps
+# the order in which nodes first appeared, like the in-memory snapshot.
+_UPSERT_NODE = """
+INSERT INTO nodes (run_id, node_id, position, state, started_ns, finished_ns)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (run_id, node_id) DO UPDATE SET
+    state = excluded.state,
+    started_ns = COALESCE(nodes.started_ns, excluded.started_ns),
+    finished_ns = COALESCE(excluded.finished_ns, nodes.finished_ns)
+"""
+
+
+class SQLiteRunStore(RunStore):
+    """Durable RunStore on a SQLite database in WAL mode.
+
+    Events are group-committed: appends are buffered and written in one
+    transaction once `batch_size` events are pending or `flush_interval`
+    seconds after the first one, so token streams do not pay a commit per
+    event. Reads and run updates flush first, so callers always see their own
+    writes; other processes see events once their batch is committed.
+
+    Event payloads are stored as JSON; values JSON cannot encode are stored as
+    their `repr`. Node checkpoints are pickled with their type keys written as
+    "module:qualname" (see `NodeCheckpoint.to_row`); a node whose outputs
+    cannot be encoded is not checkpointed and simply runs again on resume.
+    """
+
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 0.05):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # One connection shared by the loop, worker threads emitting events and
+        # the flusher thread; every use holds `_lock`.
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._pending: list[RuntimeEvent] = []
+        self._deadline = 0.0
+        self._closed = False
+        self.commits = 0
+        self._flusher = threading.Thread(target=self._flush_loop, name="synthflow-sqlite-flush", daemon=True)
+        self._flusher.start()
+
+    def create_run(self, run: RunRecord):
+        row = _encode_run(run)
+        with self._lock:
+            self._flush_locked()
+            placeholders = ", ".join("?" for _ in _RUN_COLUMNS)
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(_RUN_COLUMNS)}) VALUES ({placeholders})", row
+            )
+
+    def update_run(self, run_id: str, **updates):
+        if updates:
+            values = _encode_updates(updates)
+            with self._lock:
+                self._flush_locked()
+                assignments = ", ".join(f"{key} = ?" for key in values)
+                self._conn.execute(
+                    f"UPDATE runs SET {assignments} WHERE run_id = ?", (*values.values(), run_id)
+                )
+        return self.get_run(run_id)
+
+    def get_run(self, run_id: str) -> RunRecord | None:
+        with self._lock:
+            self._flush_locked()
+            row = self._conn.execute(
+                f"SELECT {', '.join(_RUN_COLUMNS)} FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return None if row is None else _run_from_row(row)
+
+    def append_event(self, event: RuntimeEvent):
+        with self._wake:
+            if self._closed:
+                raise RuntimeError("SQLiteRunStore is closed")
+            self._pending.append(event)
+            if len(self._pending) == 1:
+                self._deadline = time.monotonic() + self.flush_interval
+                self._wake.notify()
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def list_events(self, run_id: str, after_sequence_id: int | None = None) -> list[RuntimeEvent]:
+        return self.page_events(run_id, after_sequence_id=after_sequence_id).events
+
+    def page_events(
+        self, run_id: str, after_sequence_id: int | None = None, limit: int | None = None
+    ) -> EventPage:
+        # Served by the (run_id, sequence_id) primary key; one extra row tells
+        # whether another page follows.
+        with self._lock:
+            self._flush_locked()
+            rows = self._conn.execute(
+                "SELECT sequence_id, timestamp_ns, event, data, node_id, node_type FROM events "
+                "WHERE run_id = ? AND sequence_id > ? ORDER BY sequence_id LIMIT ?",
+                (run_id, -1 if after_sequence_id is None else after_sequence_id, -1 if limit is None else limit + 1),
+            ).fetchall()
+        has_more = limit is not None and len(rows) > limit
+        events = [_event_from_row(run_id, row) for row in (rows[:limit] if has_more else rows)]
+        cursor = events[-1].sequence_id if events else after_sequence_id
+        return EventPage(events=events, next_cursor=cursor, has_more=has_more)
+
+    def get_snapshot(self, run_id: str) -> WorkflowSnapshot | None:
+        run = self.get_run(run_id)
+        if run is None:
+            return None
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT node_id, state, started_ns, finished_ns FROM nodes WHERE run_id = ? ORDER BY position",
+                (run_id,),
+            ).fetchall()
+
+        node_statuses = {node_id: state for node_id, state, _, _ in rows}
+        return WorkflowSnapshot(
+            run_id=run.run_id,
+            flow_name=run.flow_name,
+            status=run.status,
+            started_at=run.started_at,
+            finished_at=run.finished_at,
+            error=run.error,
+            current_node_id=run.current_node_id,
+            last_sequence_id=run.last_sequence_id,
+            active_nodes=[node_id for node_id, state in node_statuses.items() if state == "started"],
+            completed_nodes=[node_id for node_id, state in node_statuses.items() if state == "succeeded"],
+            failed_nodes=[node_id for node_id, state in node_statuses.items() if state == "failed"],
+            node_statuses=node_statuses,
+            artifacts=list(run.artifacts),
+            node_started_at={row[0]: EPOCH_CLOCK.to_datetime(row[2]) for row in rows if row[2] is not None},
+            node_finished_at={row[0]: EPOCH_CLOCK.to_datetime(row[3]) for row in rows if row[3] is not None},
+        )
+
+    def save_checkpoint(self, run_id: str, checkpoint: NodeCheckpoint):
+        payload = _pickle_checkpoint(checkpoint)
+        if payload is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (run_id, node_id, payload) VALUES (?, ?, ?)",
+                (run_id, checkpoint.node_id, payload),
+            )
+
+    def load_checkpoints(self, run_id: str) -> dict[str, NodeCheckpoint]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT node_id, payload FROM checkpoints WHERE run_id = ?", (run_id,)
+            ).fetchall()
+        types = {}
+        return {node_id: NodeCheckpoint.from_row(pickle.loads(payload), types) for node_id, payload in rows}
+
+    def delete_checkpoints(self, run_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM checkpoints WHERE run_id = ?", (run_id,))
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._wake:
+            if self._closed:
+                return
+            self._closed = True
+            self._flush_locked()
+            self._wake.notify()
+        self._flusher.join()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _flush_loop(self):
+        with self._wake:
+            while not self._closed:
+                if not self._pending:
+                    self._wake.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._wake.wait(remaining)
+                    continue
+                self._flush_locked()
+
+    def _flush_locked(self):
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = []
+        event_rows = []
+        node_rows = []
+        positions = {}
+        for event in pending:
+            timestamp_ns = event.epoch_ns
+            event_rows.append(
+                (
+                    event.run_id,
+                    event.sequence_id,
+                    timestamp_ns,
+                    event.event,
+                    None if event.data is None else json.dumps(event.data, default=repr),
+                    event.node_id,
+                    event.node_type,
+                )
+            )
+            node_id = event.node_id
+            if node_id is None and event.run_id in positions:
+                node_id = positions[event.run_id][1]
+            positions[event.run_id] = (event.sequence_id, node_id)
+            if event.event == "node_state" and event.node_id is not None:
+                state = (event.data or {}).get("state")
+                node_rows.append(
+                    (
+                        event.run_id,
+                        event.node_id,
+                        event.sequence_id,
+                        state,
+                        timestamp_ns if state == "started" else None,
+                        timestamp_ns if state in TERMINAL_STATES else None,
+                    )
+                )
+
+        conn = self._conn
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO events "
+                "(run_id, sequence_id, timestamp_ns, event, data, node_id, node_type) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                event_rows,
+            )
+            if node_rows:
+                conn.executemany(_UPSERT_NODE, node_rows)
+            conn.executemany(
+                "UPDATE runs SET last_sequence_id = ?, current_node_id = COALESCE(?, current_node_id) "
+                "WHERE run_id = ?",
+                [(sequence_id, node_id, run_id) for run_id, (sequence_id, node_id) in positions.items()],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.commits += 1
+
+
+def _pickle_checkpoint(checkpoint: NodeCheckpoint) -> bytes | None:
+    try:
+        return pickle.dumps(checkpoint.to_row(), protocol=5)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return None
+
+
+def _encode_run(run: RunRecord) -> tuple:
+    return tuple(_encode_run_value(name, getattr(run, name)) for name in _RUN_COLUMNS)
+
+
+def _encode_updates(updates: dict) -> dict:
+    unknown = set(updates) - set(_RUN_COLUMNS)
+    if unknown:
+        raise AttributeError(f"RunRecord has no field(s): {', '.join(sorted(unknown))}")
+    return {name: _encode_run_value(name, value) for name, value in updates.items()}
+
+
+def _encode_run_value(name, value):
+    if name == "artifacts":
+        return json.dumps([asdict(artifact) for artifact in value or ()], default=repr)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _run_from_row(row) -> RunRecord:
+    values = dict(zip(_RUN_COLUMNS, row))
+    for name in ("started_at", "finished_at"):
+        if values[name] is not None:
+            values[name] = datetime.fromisoformat(values[name])
+    values["artifacts"] = [ArtifactRecord(**artifact) for artifact in json.loads(values["artifacts"])]
+    return RunRecord(**values)
+
+
+def _event_from_row(run_id, row) -> RuntimeEvent:
+    sequence_id, timestamp_ns, event, data, node_id, node_type = row
+    # Decoded strings are fresh objects; intern the highly repetitive ones.
+    return RuntimeEvent(
+        run_id,
+        sequence_id,
+        None,
+        sys.intern(event),
+        None if data is None else json.loads(data),
+        None if node_id is None else sys.intern(node_id),
+        None if node_type is None else sys.intern(node_type),
+        timestamp_ns or 0,
+        None if timestamp_ns is None else EPOCH_CLOCK,
+    )
@@ -1,8 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import replace
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 
-from synthflow.runtime.models import RunRecord, RuntimeEvent, WorkflowSnapshot
+from synthflow.runtime.log import EventLog, EventRetention
+from synthflow.runtime.models import (
+    TERMINAL_STATES,
+    EventPage,
+    NodeCheckpoint,
+    RunRecord,
+    RuntimeEvent,
+    WorkflowSnapshot,
+)
 
 
 class RunStore:
@@ -10,6 +20,8 @@ class RunStore:
         raise NotImplementedError
 
     def update_run(self, run_id: str, **updates):
+        # Returns the updated record, or None for an unknown run. Write-behind
+        # wrappers may return None before the update is applied.
         raise NotImplementedError
 
     def get_run(self, run_id: str) -> RunRecord | None:
@@ -21,68 +33,202 @@ class RunStore:
     def list_events(self, run_id: str, after_sequence_id: int | None = None) -> list[RuntimeEvent]:
         raise NotImplementedError
 
+    def page_events(
+        self, run_id: str, after_sequence_id: int | None = None, limit: int | None = None
+    ) -> EventPage:
+        # Generic fallback; stores with an index override this.
+        events = self.list_events(run_id, after_sequence_id=after_sequence_id)
+        page = events if limit is None else events[:limit]
+        cursor = page[-1].sequence_id if page else after_sequence_id
+        return EventPage(events=page, next_cursor=cursor, has_more=len(page) < len(events))
+
     def get_snapshot(self, run_id: str) -> WorkflowSnapshot | None:
         raise NotImplementedError
 
+    def save_checkpoint(self, run_id: str, checkpoint: NodeCheckpoint):
+        # Only needed by flows created with `checkpoint=True`; a later save
+        # for the same node replaces the earlier one.
+        raise NotImplementedError
+
+    def load_checkpoints(self, run_id: str) -> dict[str, NodeCheckpoint]:
+        raise NotImplementedError
+
+    def delete_checkpoints(self, run_id: str):
+        # Called once a checkpointed run succeeded: it can no longer be resumed.
+        raise NotImplementedError
+
+    def has_run(self, run_id: str) -> bool:
+        # Existence check for the event loop; stores whose `get_run` waits on
+        # other threads answer it without waiting.
+        return self.get_run(run_id) is not None
+
+    # Reads for callers on the event loop. They run inline by default; stores
+    # whose reads wait on other threads (see WriteBehindRunStore) offload them.
+    async def aget_run(self, run_id: str) -> RunRecord | None:
+        return self.get_run(run_id)
+
+    async def apage_events(
+        self, run_id: str, after_sequence_id: int | None = None, limit: int | None = None
+    ) -> EventPage:
+        return self.page_events(run_id, after_sequence_id=after_sequence_id, limit=limit)
+
+    async def aload_checkpoints(self, run_id: str) -> dict[str, NodeCheckpoint]:
+        return self.load_checkpoints(run_id)
+
+
+@dataclass(frozen=True)
+class RunRetention:
+    # Limits on the runs an InMemoryRunStore keeps. Only finished runs are
+    # evicted; `ttl_seconds` counts from when a run finished. Event bytes are
+    # the approximate size reported by `event_nbytes`.
+    max_runs: int | None = None
+    ttl_seconds: float | None = None
+    max_event_bytes: int | None = None
+    # "lru" evicts the least recently read finished run first,
+    # "oldest_finished" the run that finished first.
+    evict: str = "lru"
+
+    def __post_init__(self):
+        if self.evict not in ("lru", "oldest_finished"):
+            raise ValueError(f"Unsupported eviction policy: {self.evict}")
+
+
+class _RunEntry:
+    # Everything the in-memory store keeps for one run_id. Node state is
+    # folded in as events arrive so snapshots never replay the log.
+    __slots__ = (
+        "record",
+        "log",
+        "last_sequence_id",
+        "current_node_id",
+        "node_statuses",
+        "node_started",
+        "node_finished",
+        "checkpoints",
+    )
+
+    def __init__(self, log: EventLog):
+        self.record: RunRecord | None = None
+        self.log = log
+        self.last_sequence_id = 0
+        self.current_node_id: str | None = None
+        self.node_statuses: dict[str, str] = {}
+        # node_id -> the event carrying the first start / last terminal state;
+        # timestamps are only materialized when a snapshot is taken.
+        self.node_started: dict[str, RuntimeEvent] = {}
+        self.node_finished: dict[str, RuntimeEvent] = {}
+        self.checkpoints: dict[str, NodeCheckpoint] = {}
+
+    def track_node(self, event: RuntimeEvent):
+        state = (event.data or {}).get("state")
+        node_id = event.node_id
+        self.node_statuses[node_id] = state
+        if state == "started":
+            self.node_started.setdefault(node_id, event)
+        elif state in TERMINAL_STATES:
+            self.node_finished[node_id] = event
+
 
 class InMemoryRunStore(RunStore):
-    def __init__(self):
-        self._runs: dict[str, RunRecord] = {}
-        self._events: dict[str, list[RuntimeEvent]] = {}
+    # Run records are replaced on update rather than mutated, so the store can
+    # hand out the stored record itself; treat returned records as read-only.
+    def __init__(self, retention: EventRetention | None = None, run_retention: RunRetention | None = None):
+        self._runs: dict[str, _RunEntry] = {}
+        self.retention = retention
+        self.run_retention = run_retention or RunRetention()
+        # Finished run ids in finish order (TTL and "oldest_finished") and, for
+        # "lru", in read order; ordered dicts keep eviction O(1).
+        self._finished: OrderedDict[str, float] = OrderedDict()
+        self._recency: OrderedDict[str, None] | None = (
+            OrderedDict() if self.run_retention.evict == "lru" else None
+        )
+        self.evicted_runs = 0
+        self.expired_runs = 0
+        self.resident_event_bytes = 0
+
+    @property
+    def resident_runs(self) -> int:
+        return len(self._runs)
 
     def create_run(self, run: RunRecord):
-        self._runs[run.run_id] = replace(run)
-        self._events.setdefault(run.run_id, [])
+        self._expire()
+        entry = self._runs.get(run.run_id)
+        if entry is None:
+            entry = self._runs[run.run_id] = _RunEntry(EventLog(self.retention, measure=True))
+        entry.record = replace(run)
+        entry.last_sequence_id = run.last_sequence_id
+        entry.current_node_id = run.current_node_id
+        self._track_finished(run.run_id, run.status)
+        if self.run_retention.max_runs is not None:
+            self._enforce_limits()
 
     def update_run(self, run_id: str, **updates):
-        run = self._runs.get(run_id)
-        if run is None:
+        self._expire()
+        entry = self._runs.get(run_id)
+        if entry is None or entry.record is None:
             return None
-        for key, value in updates.items():
-            setattr(run, key, value)
-        return replace(run)
+        record = entry.record = replace(self._current(entry), **updates)
+        entry.last_sequence_id = record.last_sequence_id
+        entry.current_node_id = record.current_node_id
+        self._track_finished(run_id, record.status)
+        return record
 
     def get_run(self, run_id: str) -> RunRecord | None:
-        run = self._runs.get(run_id)
-        if run is None:
+        self._expire()
+        entry = self._runs.get(run_id)
+        if entry is None or entry.record is None:
             return None
-        return replace(run)
+        self._touch(run_id)
+        return self._current(entry)
 
     def append_event(self, event: RuntimeEvent):
-        bucket = self._events.setdefault(event.run_id, [])
-        bucket.append(event)
-        run = self._runs.get(event.run_id)
-        if run is not None:
-            # Keep lightweight run metadata in sync so callers do not need to
-            # scan the full event log just to know the latest position/state.
-            run.last_sequence_id = event.sequence_id
-            if event.node_id is not None:
-                run.current_node_id = event.node_id
+        # Events are the objects the execution context produced, not copies.
+        entry = self._runs.get(event.run_id)
+        if entry is None:
+            # Unknown or already evicted run: keeping it would leak an entry
+            # that no retention limit ever tracks.
+            return
+        log = entry.log
+        before = log.nbytes
+        log.append(event)
+        self.resident_event_bytes += log.nbytes - before
+        budget = self.run_retention.max_event_bytes
+        if budget is not None and self.resident_event_bytes > budget:
+            self._enforce_limits()
+        # Track the latest position/node here and fold it into the record only
+        # when someone reads it, instead of rebuilding it per event.
+        entry.last_sequence_id = event.sequence_id
+        if event.node_id is not None:
+            entry.current_node_id = event.node_id
+            if event.event == "node_state":
+                entry.track_node(event)
 
     def list_events(self, run_id: str, after_sequence_id: int | None = None) -> list[RuntimeEvent]:
-        events = self._events.get(run_id, [])
-        if after_sequence_id is None:
-            return list(events)
-        return [event for event in events if event.sequence_id > after_sequence_id]
+        return self.page_events(run_id, after_sequence_id=after_sequence_id).events
+
+    def page_events(
+        self, run_id: str, after_sequence_id: int | None = None, limit: int | None = None
+    ) -> EventPage:
+        self._expire()
+        entry = self._runs.get(run_id)
+        if entry is None:
+            return EventPage(events=[], next_cursor=after_sequence_id)
+        self._touch(run_id)
+        return entry.log.page(after_sequence_id, limit)
 
     def get_snapshot(self, run_id: str) -> WorkflowSnapshot | None:
-        run = self._runs.get(run_id)
-        if run is None:
+        self._expire()
+        entry = self._runs.get(run_id)
+        if entry is None or entry.record is None:
             return None
+        self._touch(run_id)
+        run = self._current(entry)
 
-        # The first snapshot implementation is intentionally derived from the
-        # persisted event log so it stays simple and backend-agnostic.
-        node_statuses: dict[str, str] = {}
+        node_statuses = dict(entry.node_statuses)
         active_nodes: list[str] = []
         completed_nodes: list[str] = []
         failed_nodes: list[str] = []
 
-        for event in self._events.get(run_id, []):
-            if event.event != "node_state" or event.node_id is None:
-                continue
-            state = (event.data or {}).get("state")
-            node_statuses[event.node_id] = state
-
         for node_id, state in node_statuses.items():
             if state == "started":
                 active_nodes.append(node_id)
@@ -105,4 +251,82 @@ class InMemoryRunStore(RunStore):
             failed_nodes=failed_nodes,
             node_statuses=node_statuses,
             artifacts=list(run.artifacts),
+            node_started_at={node_id: event.timestamp for node_id, event in entry.node_started.items()},
+            node_finished_at={node_id: event.timestamp for node_id, event in entry.node_finished.items()},
         )
+
+    def save_checkpoint(self, run_id: str, checkpoint: NodeCheckpoint):
+        entry = self._runs.get(run_id)
+        if entry is not None:
+            entry.checkpoints[checkpoint.node_id] = checkpoint
+
+    def load_checkpoints(self, run_id: str) -> dict[str, NodeCheckpoint]:
+        self._expire()
+        entry = self._runs.get(run_id)
+        return {} if entry is None else dict(entry.checkpoints)
+
+    def delete_checkpoints(self, run_id: str):
+        entry = self._runs.get(run_id)
+        if entry is not None:
+            entry.checkpoints = {}
+
+    def _track_finished(self, run_id: str, status: str):
+        if status in TERMINAL_STATES:
+            if run_id not in self._finished:
+                self._finished[run_id] = time.monotonic()
+                if self._recency is not None:
+                    self._recency[run_id] = None
+                self._enforce_limits()
+        elif run_id in self._finished:
+            # A finished run that starts again (e.g. resumed) is no longer evictable.
+            del self._finished[run_id]
+            if self._recency is not None:
+                self._recency.pop(run_id, None)
+
+    def _touch(self, run_id: str):
+        if self._recency is not None and run_id in self._recency:
+            self._recency.move_to_end(run_id)
+
+    def _enforce_limits(self):
+        limits = self.run_retention
+        order = self._recency if self._recency is not None else self._finished
+        while order and (
+            (limits.max_runs is not None and len(self._runs) > limits.max_runs)
+            or (limits.max_event_bytes is not None and self.resident_event_bytes > limits.max_event_bytes)
+        ):
+            self._drop(next(iter(order)))
+            self.evicted_runs += 1
+
+    def _expire(self):
+        ttl = self.run_retention.ttl_seconds
+        if ttl is None:
+            return
+        # Finish order means only the front can have expired.
+        deadline = time.monotonic() - ttl
+        finished = self._finished
+        while finished:
+            run_id, finished_at = next(iter(finished.items()))
+            if finished_at > deadline:
+                break
+            self._drop(run_id)
+            self.expired_runs += 1
+
+    def _drop(self, run_id: str):
+        entry = self._runs.pop(run_id)
+        self.resident_event_bytes -= entry.log.nbytes
+        self._finished.pop(run_id, None)
+        if self._recency is not None:
+            self._recency.pop(run_id, None)
+
+    def _current(self, entry: _RunEntry) -> RunRecord:
+        record = entry.record
+        if (
+            record.last_sequence_id != entry.last_sequence_id
+            or record.current_node_id != entry.current_node_id
+        ):
+            record = entry.record = replace(
+                record,
+                last_sequence_id=entry.last_sequence_id,
+                current_node_id=entry.current_node_id,
+            )
+        return record
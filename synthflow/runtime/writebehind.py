@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+
+from synthflow.runtime.models import EventPage, NodeCheckpoint, RunRecord, RuntimeEvent, WorkflowSnapshot
+from synthflow.runtime.store import RunStore
+
+_CREATE = 0
+_UPDATE = 1
+_APPEND = 2
+_CHECKPOINT = 3
+_DELETE_CHECKPOINTS = 4
+
+
+class WriteBehindRunStore(RunStore):
+    """Wrap any RunStore so writes never block the caller on I/O.
+
+    `create_run`, `update_run` and `append_event` only enqueue; a background
+    thread applies them to the wrapped store in order, up to `batch_size` per
+    batch. Reads flush first, so they see every earlier write; the async
+    reads (`aget_run`, `apage_events`, ...) flush and read in a worker thread
+    so the event loop never waits on the queue, and `has_run` answers from
+    the queue without flushing. Call `flush()`
+    / `await aflush()` for durability at a run boundary and `close()` /
+    `await aclose()` when done; both re-raise the first error the wrapped
+    store reported.
+
+    Unlike the stores it wraps, `update_run` always returns None rather than
+    the updated record: the update has not been applied when it returns, and
+    waiting for it would block on I/O. Call `get_run` (which flushes) when the
+    updated record is needed.
+    """
+
+    def __init__(self, store: RunStore, batch_size: int = 512):
+        self.store = store
+        self.batch_size = batch_size
+        self._queue: deque = deque()
+        self._wake = threading.Event()
+        self._idle = threading.Condition()
+        self._busy = False
+        self._closing = False
+        # The batch being applied, so `has_run` sees writes that left the queue.
+        self._applying: list = []
+        self._batch_started: float | None = None
+        self.error: BaseException | None = None
+        self.applied = 0
+        self.batches = 0
+        self.max_flush_lag = 0.0
+        self._worker = threading.Thread(target=self._run, name="synthflow-write-behind", daemon=True)
+        self._worker.start()
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    @property
+    def flush_lag(self) -> float:
+        """Seconds the oldest write not yet persisted has been waiting."""
+        oldest = self._batch_started
+        if oldest is None:
+            queue = self._queue
+            try:
+                oldest = queue[0][2]
+            except IndexError:
+                return 0.0
+        return max(0.0, time.monotonic() - oldest)
+
+    def create_run(self, run: RunRecord):
+        self._enqueue(_CREATE, run)
+
+    def update_run(self, run_id: str, **updates):
+        self._enqueue(_UPDATE, (run_id, updates))
+        return None
+
+    def append_event(self, event: RuntimeEvent):
+        self._enqueue(_APPEND, event)
+
+    def save_checkpoint(self, run_id: str, checkpoint: NodeCheckpoint):
+        self._enqueue(_CHECKPOINT, (run_id, checkpoint))
+
+    def delete_checkpoints(self, run_id: str):
+        self._enqueue(_DELETE_CHECKPOINTS, run_id)
+
+    def load_checkpoints(self, run_id: str) -> dict[str, NodeCheckpoint]:
+        self.flush()
+        return self.store.load_checkpoints(run_id)
+
+    def get_run(self, run_id: str) -> RunRecord | None:
+        self.flush()
+        return self.store.get_run(run_id)
+
+    def list_events(self, run_id: str, after_sequence_id: int | None = None) -> list[RuntimeEvent]:
+        self.flush()
+        return self.store.list_events(run_id, after_sequence_id=after_sequence_id)
+
+    def page_events(
+        self, run_id: str, after_sequence_id: int | None = None, limit: int | None = None
+    ) -> EventPage:
+        self.flush()
+        return self.store.page_events(run_id, after_sequence_id=after_sequence_id, limit=limit)
+
+    def get_snapshot(self, run_id: str) -> WorkflowSnapshot | None:
+        self.flush()
+        return self.store.get_snapshot(run_id)
+
+    def has_run(self, run_id: str) -> bool:
+        with self._idle:
+            # A batch stays in `_applying` until it was fully applied, so a run
+            # created before this call is either pending here or already stored.
+            for kind, payload, _ in (*self._applying, *self._queue):
+                if kind == _CREATE and payload.run_id == run_id:
+                    return True
+        return self.store.has_run(run_id)
+
+    async def aget_run(self, run_id: str) -> RunRecord | None:
+        return await asyncio.to_thread(self.get_run, run_id)
+
+    async def apage_events(
+        self, run_id: str, after_sequence_id: int | None = None, limit: int | None = None
+    ) -> EventPage:
+        return await asyncio.to_thread(self.page_events, run_id, after_sequence_id, limit)
+
+    async def aload_checkpoints(self, run_id: str) -> dict[str, NodeCheckpoint]:
+        return await asyncio.to_thread(self.load_checkpoints, run_id)
+
+    def flush(self):
+        """Block until every write enqueued so far reached the wrapped store."""
+        with self._idle:
+            while self._queue or self._busy:
+                self._wake.set()
+                self._idle.wait()
+        self._raise_error()
+
+    async def aflush(self):
+        await asyncio.to_thread(self.flush)
+
+    def close(self):
+        with self._idle:
+            closing, self._closing = self._closing, True
+        if not closing:
+            self._wake.set()
+            self._worker.join()
+            close = getattr(self.store, "close", None)
+            if close is not None:
+                close()
+        self._raise_error()
+
+    async def aclose(self):
+        await asyncio.to_thread(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _enqueue(self, kind, payload):
+        # Checked and appended under the lock `close` sets `_closing` under, so
+        # a write either lands before the worker's final drain or is refused.
+        with self._idle:
+            if self._closing:
+                raise RuntimeError("WriteBehindRunStore is closed")
+            self._queue.append((kind, payload, time.monotonic()))
+        # Only wake the worker when it may be waiting.
+        if not self._wake.is_set():
+            self._wake.set()
+
+    def _run(self):
+        queue = self._queue
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            while True:
+                with self._idle:
+                    if not queue:
+                        self._busy = False
+                        self._applying = []
+                        self._batch_started = None
+                        self._idle.notify_all()
+                        break
+                    self._busy = True
+                    batch = self._applying = [queue.popleft() for _ in range(min(len(queue), self.batch_size))]
+                    self._batch_started = batch[0][2]
+                self._apply(batch)
+            if self._closing and not queue:
+                return
+
+    def _apply(self, batch):
+        store = self.store
+        for kind, payload, _ in batch:
+            try:
+                if kind == _APPEND:
+                    store.append_event(payload)
+                elif kind == _UPDATE:
+                    run_id, updates = payload
+                    store.update_run(run_id, **updates)
+                elif kind == _CHECKPOINT:
+                    store.save_checkpoint(*payload)
+                elif kind == _DELETE_CHECKPOINTS:
+                    store.delete_checkpoints(payload)
+                else:
+                    store.create_run(payload)
+            except Exception as exc:
+                # Keep applying later writes; the first failure surfaces on flush/close.
+                if self.error is None:
+                    self.error = exc
+        lag = time.monotonic() - batch[0][2]
+        if lag > self.max_flush_lag:
+            self.max_flush_lag = lag
+        self.applied += len(batch)
+        self.batches += 1
+
+    def _raise_error(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise RuntimeError("Write-behind run store failed to persist writes") from error
@@ -1,4 +1,5 @@
 from synthflow.core.condition import If, Switch
+from synthflow.core.mapping import Map
 from synthflow.core.parallel import Parallel
 
 
@@ -50,6 +51,8 @@ def _children(node):
     if isinstance(node, Parallel):
         for idx, sub in enumerate(node.nodes, start=1):
             children.append((f"parallel-{idx}", sub))
+    if isinstance(node, Map):
+        children.append(("map", node.template))
     if isinstance(node, If):
         children.append(("then", node.then_node))
         if node.else_node:
@@ -0,0 +1,224 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from synthflow.core.flow import Flow
+from synthflow.core.node import Node
+from synthflow.core.ref import ResultRef
+from synthflow.plugins import cache as cache_module
+from synthflow.plugins.cache import Cache
+from synthflow.plugins.disk_cache import DiskCache, stable_hash
+
+
+class Lookup(Node):
+    def __init__(self, id=None, **params):
+        super().__init__(id=id, **params)
+        self.calls = 0
+
+    async def run(self, query, model=None):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return query.upper()
+
+
+class Failing(Node):
+    def __init__(self, id=None, **params):
+        super().__init__(id=id, **params)
+        self.calls = 0
+
+    async def run(self, query):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("backend down")
+
+
+class CachePluginTests(unittest.IsolatedAsyncioTestCase):
+    async def test_results_are_reused_across_runs_by_resolved_inputs(self):
+        cache = Cache()
+        node = Lookup(id="lookup").input(ResultRef("query")).use(cache)
+        flow = Flow(node)
+
+        first = await flow.run(inputs={"query": "a"})
+        second = await flow.run(inputs={"query": "a"})
+        third = await flow.run(inputs={"query": "b"})
+
+        self.assertEqual(
+            [store.get_node_result("lookup") for store in (first, second, third)], ["A", "A", "B"]
+        )
+        self.assertEqual(node.calls, 2)
+        self.assertEqual((cache.hits, cache.misses, cache.entries), (1, 2, 2))
+
+    async def test_concurrent_runs_share_one_inflight_computation(self):
+        cache = Cache()
+        node = Lookup(id="lookup").input(ResultRef("query")).use(cache)
+        batch = Flow(node).run_many([{"query": "same"}] * 5, concurrency=5)
+
+        results = [context.store.get_node_result("lookup") async for _, context in batch]
+
+        self.assertEqual(results, ["SAME"] * 5)
+        self.assertEqual(node.calls, 1)
+        self.assertEqual((cache.misses, cache.coalesced), (1, 4))
+
+    async def test_failures_are_shared_with_waiters_but_not_cached(self):
+        cache = Cache()
+        node = Failing(id="failing").input(ResultRef("query")).use(cache)
+        batch = Flow(node).run_many([{"query": "x"}] * 3, concurrency=3)
+
+        states = [context.state.value async for _, context in batch]
+
+        self.assertEqual(states, ["failed"] * 3)
+        self.assertEqual(node.calls, 1)
+        self.assertEqual(cache.entries, 0)
+
+    async def test_cancelled_waiter_or_computation_only_cancels_itself(self):
+        cache = Cache()
+        node = Lookup(id="lookup")
+
+        async def call():
+            return await cache.run(lambda: node.run("q"), None, node, ("q",), {})
+
+        owner = asyncio.create_task(call())
+        waiter = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        self.assertEqual(await owner, "Q")
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        cache.clear()
+        owner = asyncio.create_task(call())
+        waiter = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        owner.cancel()
+        # The waiter takes over the computation instead of being cancelled too.
+        self.assertEqual(await waiter, "Q")
+        self.assertTrue(owner.cancelled())
+
+        cache.clear()
+        owner = asyncio.create_task(call())
+        waiter = asyncio.create_task(call())
+        await asyncio.sleep(0)
+        # Cancelling both (e.g. the whole batch) must not make the waiter recompute.
+        owner.cancel()
+        waiter.cancel()
+        await asyncio.gather(owner, waiter, return_exceptions=True)
+        self.assertTrue(waiter.cancelled())
+        self.assertEqual((node.calls, cache.entries), (4, 0))
+
+    async def test_lru_budget_and_ttl_eviction(self):
+        cache = Cache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+        self.assertEqual(cache.evictions, 1)
+
+        sized = Cache(max_entries=None, max_bytes=10, sizeof=len)
+        sized.set("a", "x" * 6)
+        sized.set("b", "x" * 6)
+        sized.set("huge", "x" * 11)
+        self.assertEqual((sized.get("a"), sized.entries, sized.nbytes), (None, 1, 6))
+
+        expiring = Cache(ttl=5)
+        with mock.patch.object(cache_module.time, "monotonic", return_value=100.0):
+            expiring.set("a", 1)
+        with mock.patch.object(cache_module.time, "monotonic", return_value=105.0):
+            self.assertIsNone(expiring.get("a"))
+        self.assertEqual((expiring.expirations, expiring.entries), (1, 0))
+
+    async def test_custom_key_and_unhashable_inputs(self):
+        cache = Cache(key=lambda node, args, kwargs: args[0].lower())
+        node = Lookup(id="lookup").input(ResultRef("query")).use(cache)
+        flow = Flow(node)
+        await flow.run(inputs={"query": "Hi"})
+        await flow.run(inputs={"query": "hI"})
+        self.assertEqual(node.calls, 1)
+
+        default = Cache()
+        node = Lookup(id="lookup").input(ResultRef("query")).use(default)
+        await Flow(node).run(inputs={"query": Unhashable("q")})
+        self.assertEqual((default.uncacheable, default.entries), (1, 0))
+
+
+class DiskCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    async def test_unchanged_rerun_hits_disk_tier_from_a_fresh_process(self):
+        def build():
+            cache = Cache(l2=DiskCache(self.directory.name))
+            return cache, Lookup(id="lookup", model="small").input(ResultRef("query")).use(cache)
+
+        cache, node = build()
+        await Flow(node).run(inputs={"query": "a"})
+        # New L1 and node instances stand in for the next nightly process.
+        cache, node = build()
+        store = await Flow(node).run(inputs={"query": "a"})
+
+        self.assertEqual(store.get_node_result("lookup"), "A")
+        self.assertEqual(node.calls, 0)
+        self.assertEqual((cache.misses, cache.l2.hits), (1, 1))
+
+        changed = Lookup(id="lookup", model="large").input(ResultRef("query")).use(cache)
+        await Flow(changed).run(inputs={"query": "a"})
+        self.assertEqual(changed.calls, 1)
+
+    async def test_failing_disk_tier_falls_back_to_computing(self):
+        disk = DiskCache(self.directory.name)
+        cache = Cache(l2=disk)
+        node = Lookup(id="lookup").input(ResultRef("query")).use(cache)
+
+        with mock.patch.object(disk, "get", side_effect=PermissionError("denied")), mock.patch.object(
+            disk, "set", side_effect=OSError(28, "No space left on device")
+        ):
+            store = await Flow(node).run(inputs={"query": "a"})
+
+        self.assertEqual(store.get_node_result("lookup"), "A")
+        self.assertEqual((node.calls, cache.l2_errors), (1, 2))
+        self.assertEqual(cache.get(cache.key(node, ("a",), {})), "A")
+
+    def test_stable_hash_ignores_ordering_and_hash_seed(self):
+        value = {"b": [1, 2.5, None], "a": {"x", "y"}}
+        self.assertEqual(stable_hash(value), stable_hash({"a": {"y", "x"}, "b": [1, 2.5, None]}))
+        self.assertNotEqual(stable_hash([1, 2]), stable_hash((1, 2)))
+
+        script = "from synthflow.plugins.disk_cache import stable_hash; print(stable_hash({'b': [1, 2.5, None], 'a': {'x', 'y'}}))"
+        digests = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                env={**os.environ, "PYTHONHASHSEED": seed},
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+            for seed in ("1", "2")
+        }
+        self.assertEqual(digests, {stable_hash(value)})
+
+    def test_size_eviction_removes_least_recently_used_entries(self):
+        cache = DiskCache(self.directory.name, max_bytes=None)
+        for index, key in enumerate(("aa01", "bb02", "cc03")):
+            cache.set(key, b"x" * 1000)
+            os.utime(cache._path(key), (index, index))
+        cache.get("aa01")
+
+        removed = cache.evict(target_bytes=2500)
+
+        self.assertEqual(removed, 1)
+        self.assertIsNone(cache.get("bb02"))
+        self.assertEqual(cache.get("aa01"), b"x" * 1000)
+        self.assertFalse([name for name in os.listdir(os.path.join(self.directory.name, "aa")) if name.startswith(".tmp")])
+
+
+class Unhashable(str):
+    __hash__ = None
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,11 @@
 import asyncio
 import unittest
+from unittest import mock
 
 from synthflow.core.condition import IF, SWITCH
-from synthflow.core.dsl import PARALLEL
+from synthflow.core.dsl import MAP, PARALLEL
 from synthflow.core.flow import Flow
+from synthflow.core import middleware
 from synthflow.core.node import Node, ResultRef
 from synthflow.plugins.retry import Retry
 from synthflow.plugins.timeout import Timeout
@@ -105,6 +107,22 @@ class SleepProbe(Node):
             raise
 
 
+class SlowDouble(Node):
+    def __init__(self, tracker, id=None):
+        super().__init__(id=id)
+        self.tracker = tracker
+
+    async def run(self, value):
+        self.tracker["active"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["active"])
+        # Later items finish first so ordering must come from the item index.
+        await asyncio.sleep(0.01 * (5 - value))
+        self.tracker["active"] -= 1
+        if value == self.tracker.get("fail_on"):
+            raise ValueError("bad item")
+        return value * 2
+
+
 class CoreBehaviorTests(unittest.IsolatedAsyncioTestCase):
     async def test_parallel_runs_branches_and_merges_results(self):
         flow = Flow(
@@ -221,3 +239,84 @@ class CoreBehaviorTests(unittest.IsolatedAsyncioTestCase):
         )
         with self.assertRaises(ValueError):
             await flow.run()
+
+    async def test_plugin_chain_supports_callable_forms_in_registration_order(self):
+        calls = []
+
+        async def outer(call_next, store, node):
+            calls.append(("outer", node.id))
+            return await call_next()
+
+        def middle(call_next, store):
+            calls.append(("middle", store is not None))
+            return call_next()
+
+        async def inner(call_next):
+            calls.append(("inner",))
+            return f"{await call_next()}!"
+
+        node = ValueNode(id="plugged").input("value").use(outer).use(middle).use(inner)
+        store = await Flow(node).run()
+
+        self.assertEqual(store.get_node_result("plugged"), "value!")
+        self.assertEqual(calls, [("outer", "plugged"), ("middle", True), ("inner",)])
+
+    async def test_plugins_opt_in_to_resolved_inputs(self):
+        seen = []
+
+        class Audit:
+            wants_inputs = True
+
+            async def run(self, call_next, store, node, args, kwargs):
+                seen.append((node.id, args, kwargs))
+                return await call_next()
+
+        class Tagged:
+            # Extra optional parameters do not change the calling convention.
+            async def run(self, call_next, store, node, label="tag", suffix="!"):
+                return f"{await call_next()}{suffix}"
+
+        node = ValueNode(id="plugged").input("value").use(Audit()).use(Tagged())
+        store = await Flow(node).run()
+
+        self.assertEqual(store.get_node_result("plugged"), "value!")
+        self.assertEqual(seen, [("plugged", ("value",), {})])
+
+    async def test_plugin_signatures_resolved_once_across_runs(self):
+        node = Flaky(id="flaky").use(Retry(retries=2, delay=0))
+        flow = Flow(node)
+
+        with mock.patch.object(middleware.inspect, "signature", wraps=middleware.inspect.signature) as signature:
+            await flow.run()
+            node.attempts = 0
+            await flow.run()
+
+        signature.assert_not_called()
+
+    async def test_map_runs_template_per_item_in_order_with_bounded_concurrency(self):
+        tracker = {"active": 0, "peak": 0}
+        flow = Flow(
+            FlagSeed(id="items").input([1, 2, 3, 4])
+            >> MAP(
+                ResultRef("items"),
+                SlowDouble(tracker, id="double").input(ResultRef("doubled")),
+                concurrency=2,
+                id="doubled",
+            )
+            >> ValueNode(id="after").input(ResultRef("doubled"))
+        )
+
+        store = await flow.run()
+
+        self.assertEqual(store.get_node_result("after"), [2, 4, 6, 8])
+        self.assertEqual(tracker["peak"], 2)
+        self.assertIsNone(store.get_node_result("double"))
+
+    async def test_map_propagates_item_failure(self):
+        tracker = {"active": 0, "peak": 0, "fail_on": 3}
+        flow = Flow(
+            MAP([1, 2, 3, 4], SlowDouble(tracker, id="double").input(ResultRef("doubled")), id="doubled")
+        )
+
+        with self.assertRaises(RuntimeError):
+            await flow.run()
@@ -0,0 +1,120 @@
+import asyncio
+import time
+import unittest
+
+from synthflow.core.condition import IF
+from synthflow.core.flow import Flow
+from synthflow.core.node import Node, ResultRef
+from synthflow.execution.engine import Engine
+from synthflow.execution.scheduler import Scheduler
+
+
+class Fetch(Node):
+    async def run(self, value):
+        await asyncio.sleep(0.05)
+        return value
+
+
+class Combine(Node):
+    async def run(self, *values):
+        return sum(values)
+
+
+class Boom(Node):
+    async def run(self):
+        raise RuntimeError("boom")
+
+
+class Report:
+    pass
+
+
+class Produce(Node):
+    outputs = [Report]
+
+    async def run(self, value):
+        await asyncio.sleep(0.01)
+        return value
+
+
+class ReadReport(Node):
+    inputs = [Report]
+
+    async def run(self, Report):
+        return Report
+
+
+class SwapReport(Node):
+    # No declared outputs: the dict result writes the Report channel.
+    async def run(self):
+        await asyncio.sleep(0.02)
+        return {Report: "swapped"}
+
+
+def dag_flow(start):
+    return Flow(start, engine=Engine(scheduler=Scheduler(mode="dag")))
+
+
+class DagSchedulerTests(unittest.IsolatedAsyncioTestCase):
+    async def test_independent_nodes_overlap(self):
+        flow = dag_flow(
+            Fetch(id="a").input(1)
+            >> Fetch(id="b").input(2)
+            >> Fetch(id="c").input(3)
+            >> Combine(id="total").input(ResultRef("a"), ResultRef("b"), ResultRef("c"))
+        )
+
+        started = time.perf_counter()
+        store = await flow.run()
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(store.get_node_result("total"), 6)
+        self.assertLess(elapsed, 0.12)
+        self.assertEqual([unit.deps for unit in flow.plan.dag()], [(), (), (), (0, 1, 2)])
+
+    async def test_typed_channel_writes_keep_declared_order(self):
+        flow = dag_flow(
+            Produce(id="first").input("first")
+            >> ReadReport(id="read_first")
+            >> Produce(id="second").input("second")
+            >> ReadReport(id="read_second")
+        )
+
+        store = await flow.run()
+
+        self.assertEqual(store.get_node_result("read_first"), "first")
+        self.assertEqual(store.get_node_result("read_second"), "second")
+
+    async def test_dict_returning_writer_orders_typed_readers_around_it(self):
+        flow = dag_flow(
+            Produce(id="first").input("first")
+            >> ReadReport(id="read_first")
+            >> SwapReport(id="swap")
+            >> ReadReport(id="read_swapped")
+        )
+
+        store = await flow.run()
+
+        self.assertEqual(store.get_node_result("read_first"), "first")
+        self.assertEqual(store.get_node_result("read_swapped"), "swapped")
+        self.assertEqual([unit.deps for unit in flow.plan.dag()], [(), (0,), (0, 1), (0, 1, 2)])
+
+    async def test_conditional_acts_as_barrier(self):
+        flow = dag_flow(
+            Fetch(id="a").input(1)
+            >> IF(condition=lambda store: store.get_node_result("a") == 1, then_node=Fetch(id="then").input("yes"), id="check")
+            >> Fetch(id="after").input(2)
+        )
+
+        store = await flow.run()
+
+        self.assertEqual(store.get_node_result("then"), "yes")
+        self.assertEqual([unit.deps for unit in flow.plan.dag()], [(), (0,), (1,)])
+
+    async def test_failure_cancels_running_units(self):
+        flow = dag_flow(Fetch(id="slow").input(1) >> Boom(id="boom"))
+
+        with self.assertRaises(RuntimeError):
+            await flow.run()
+
+        self.assertIn(("slow", "cancelled"), [(event.node_id, event.state) for event in flow.last_execution.node_events])
@@ -0,0 +1,129 @@
+import unittest
+
+from synthflow.core.datastore import MISSING, DataStore
+from synthflow.core.node import Node
+from synthflow.core.snapshot import SourceRef, StoreSnapshot, StoreSnapshotter, restore_snapshot
+
+
+class Price:
+    pass
+
+
+class Total:
+    pass
+
+
+class Source(Node):
+    async def run(self):
+        return None
+
+
+class DataStoreOverlayTests(unittest.TestCase):
+    def test_overlay_reads_through_and_keeps_writes_local(self):
+        parent = DataStore()
+        parent.set(Price, 10, source=Source(id="price"))
+        parent.set_node_result("price", 10)
+
+        branch = parent.overlay()
+        branch.set(Total, 30, source=Source(id="total"))
+        branch.set_node_result("total", 30)
+
+        self.assertEqual(branch.get(Price), 10)
+        self.assertEqual(branch.lookup_result("price"), 10)
+        self.assertEqual(branch.get_from_node("total"), 30)
+        self.assertFalse(parent.has(Total))
+        self.assertIs(parent.lookup_result("total"), MISSING)
+        self.assertEqual(list(branch._data), [Total])
+
+    def test_merge_applies_only_branch_writes(self):
+        parent = DataStore()
+        parent.set(Price, 10, source=Source(id="price"))
+
+        first = parent.overlay()
+        first.set(Price, 12, source=Source(id="repricer"))
+        second = parent.overlay()
+        second.set(Total, 30, source=Source(id="total"))
+
+        parent.merge(first)
+        parent.merge(second, on_conflict="error")
+
+        # The untouched second branch must not revert the first branch's write.
+        self.assertEqual(parent.get(Price), 12)
+        self.assertEqual(parent.get(Total), 30)
+        self.assertEqual(parent.get_from_node("repricer"), 12)
+
+    def test_copy_of_overlay_is_flat_and_independent(self):
+        parent = DataStore()
+        parent.set(Price, 10, source=Source(id="price"))
+        branch = parent.overlay()
+        branch.set(Total, 30, source=Source(id="total"))
+
+        flat = branch.copy()
+        parent.set(Price, 99)
+
+        self.assertEqual(flat.get(Price), 10)
+        self.assertEqual(flat.get(Total), 30)
+        self.assertEqual(flat.get_from_node("price"), 10)
+
+
+class DataStoreSnapshotTests(unittest.TestCase):
+    def test_full_and_delta_snapshots_round_trip_through_bytes(self):
+        price = Source(id="price")
+        store = DataStore()
+        store.seed({"request": "q"})
+        store.set(Price, 10, source=price)
+        store.set_node_result("price", 10)
+        snapshotter = StoreSnapshotter(store)
+        full = snapshotter.snapshot()
+
+        branch = store.overlay()
+        branch.set(Total, 30, source=Source(id="total"))
+        branch.set_node_result("total", 30)
+        snapshotter.store = branch
+        delta = snapshotter.snapshot()
+
+        # Type keys and sources are names and ids, never pickled classes or nodes.
+        self.assertNotIn(b"Source", full.payload)
+        self.assertEqual((full.base, delta.base), (None, full.sequence))
+        self.assertNotIn(b"request", delta.payload)
+
+        restored = restore_snapshot(
+            [StoreSnapshot.from_bytes(full.to_bytes()), StoreSnapshot.from_bytes(delta.to_bytes())],
+            nodes={"price": price},
+        )
+        self.assertEqual((restored.get(Price), restored.get(Total)), (10, 30))
+        self.assertEqual(restored.lookup_result("request"), "q")
+        self.assertEqual(restored.get_from_node("total"), 30)
+        self.assertIs(restored._source[Price], price)
+        self.assertEqual(restored._source[Total], SourceRef("total"))
+
+        with self.assertRaises(ValueError):
+            restore_snapshot([delta])
+
+    def test_large_bytes_travel_out_of_band(self):
+        blob = b"x" * (1 << 20)
+        store = DataStore()
+        store.set(Price, blob, source=Source(id="price"))
+
+        snapshot = StoreSnapshotter(store, out_of_band_threshold=1024).snapshot()
+
+        # One buffer even though the value is also the node's typed output.
+        self.assertEqual(len(snapshot.buffers), 1)
+        self.assertLess(len(snapshot.payload), 1024)
+        self.assertIs(restore_snapshot([snapshot]).get(Price), blob)
+        self.assertEqual(restore_snapshot([StoreSnapshot.from_bytes(snapshot.to_bytes())]).get(Price), blob)
+
+    def test_unchanged_store_gives_an_empty_delta(self):
+        store = DataStore()
+        store.set(Price, [1, 2], source=Source(id="price"))
+        snapshotter = StoreSnapshotter(store)
+        snapshotter.snapshot()
+        store.set_node_result("price", 3)
+
+        delta = snapshotter.snapshot()
+        restored = restore_snapshot([snapshotter.snapshot(full=True)])
+
+        self.assertLess(len(delta.payload), 64)
+        self.assertEqual(restored.get(Price), [1, 2])
+        self.assertEqual(restored.get_node_result("price"), 3)
+
@@ -0,0 +1,84 @@
+import asyncio
+import unittest
+
+from synthflow.core.flow import Flow
+from synthflow.core.node import Node
+
+
+class Talker(Node):
+    def __init__(self, id=None, count=20, **params):
+        super().__init__(id=id, **params)
+        self.count = count
+        self.gate = asyncio.Event()
+
+    async def run(self):
+        for index in range(self.count):
+            self.emit_event("token", {"text": str(index)})
+            if index == self.count // 2:
+                await self.gate.wait()
+            await asyncio.sleep(0)
+        return "said"
+
+
+async def collect(subscription):
+    return [event async for event in subscription]
+
+
+def sequence_ids(events):
+    return [event.sequence_id for event in events]
+
+
+class EventHubTests(unittest.IsolatedAsyncioTestCase):
+    async def test_subscribers_replay_then_follow_live_events(self):
+        talker = Talker(id="talker")
+        flow = Flow(talker)
+        task = asyncio.create_task(flow.run(return_context=True))
+        while flow.last_execution is None or len(flow.last_execution.stream_events) < 5:
+            await asyncio.sleep(0)
+        run_id = flow.last_execution.run_id
+
+        early = asyncio.create_task(collect(flow.subscribe(run_id)))
+        resumed = asyncio.create_task(collect(flow.subscribe(run_id, after_sequence_id=3)))
+        await asyncio.sleep(0)
+        self.assertEqual(flow.hub.subscriber_count(run_id), 2)
+        talker.gate.set()
+        context = await task
+
+        expected = sequence_ids(context.stream_events)
+        self.assertEqual(sequence_ids(await early), expected)
+        self.assertEqual(sequence_ids(await resumed), expected[3:])
+        self.assertFalse(flow.hub.is_live(run_id))
+
+    async def test_slow_subscriber_resyncs_from_store_without_gaps(self):
+        talker = Talker(id="talker", count=200)
+        talker.gate.set()
+        flow = Flow(talker)
+        task = asyncio.create_task(flow.run(return_context=True))
+        while flow.last_execution is None:
+            await asyncio.sleep(0)
+        subscription = flow.subscribe(flow.last_execution.run_id, max_buffer=4)
+
+        received = []
+        async for event in subscription:
+            received.append(event)
+            # Far slower than the run, so the small buffer keeps overflowing.
+            await asyncio.sleep(0.001)
+        context = await task
+
+        self.assertEqual(sequence_ids(received), sequence_ids(context.stream_events))
+        self.assertGreater(subscription.resyncs, 0)
+
+    async def test_finished_runs_replay_and_unknown_runs_raise(self):
+        talker = Talker(id="talker", count=4)
+        talker.gate.set()
+        flow = Flow(talker)
+        context = await flow.run(return_context=True)
+
+        events = await collect(flow.subscribe(context.run_id, after_sequence_id=2))
+        self.assertEqual(sequence_ids(events), sequence_ids(context.stream_events)[2:])
+        with self.assertRaises(KeyError):
+            flow.subscribe("missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,15 @@
 import asyncio
+import sys
+import threading
 import unittest
+from unittest import mock
 
 from synthflow.core.flow import Flow
-from synthflow.core.node import Node
+from synthflow.core.node import Node, ResultRef
 from synthflow.runtime.store import InMemoryRunStore
-from synthflow.execution.context import ExecutionState
+from synthflow.execution.context import ExecutionContext, ExecutionState
+from synthflow.execution.stream import CoalesceRule, StreamBuffer
+from synthflow.runtime.models import RuntimeEvent
 
 
 class SuccessNode(Node):
@@ -31,6 +36,20 @@ class StreamingNode(Node):
         return "hello"
 
 
+class BurstNode(Node):
+    async def run(self):
+        for index in range(10):
+            self.emit_event("token", {"text": str(index)})
+        return "burst"
+
+
+class PacedNode(Node):
+    async def run(self):
+        for index in range(10):
+            await self.emit_event_async("token", {"text": str(index)})
+        return "paced"
+
+
 class ExecutionEngineTests(unittest.IsolatedAsyncioTestCase):
     async def test_flow_exposes_success_execution_context(self):
         flow = Flow(SuccessNode(id="success"))
@@ -132,3 +151,216 @@ class ExecutionEngineTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(snapshot.status, "succeeded")
         self.assertEqual(snapshot.completed_nodes, ["success"])
         self.assertEqual(snapshot.last_sequence_id, 4)
+
+    def test_concurrent_emitters_get_unique_ordered_sequence_ids(self):
+        run_store = InMemoryRunStore()
+        context = ExecutionContext(run_id="threads", run_store=run_store, stream_enabled=False)
+        context.initialize_run()
+
+        def emit():
+            for index in range(500):
+                context.emit_stream_event("token", {"text": str(index)}, node_id="worker")
+
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=emit) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        expected = list(range(1, 4001))
+        self.assertEqual([event.sequence_id for event in context.stream_events], expected)
+        self.assertEqual([event.sequence_id for event in run_store.list_events("threads")], expected)
+
+    async def test_run_many_limits_concurrency_and_reports_stats(self):
+        tracker = {"active": 0, "peak": 0}
+
+        class Echo(Node):
+            async def run(self, value):
+                tracker["active"] += 1
+                tracker["peak"] = max(tracker["peak"], tracker["active"])
+                await asyncio.sleep(0.01 * (value % 3))
+                tracker["active"] -= 1
+                if value == 4:
+                    raise RuntimeError("bad input")
+                return value * 10
+
+        flow = Flow(Echo(id="echo").input(ResultRef("value")))
+        batch = flow.run_many(({"value": value} for value in range(10)), concurrency=3)
+
+        results = {index: context async for index, context in batch}
+
+        self.assertEqual(sorted(results), list(range(10)))
+        self.assertLessEqual(tracker["peak"], 3)
+        self.assertEqual(results[7].store.get_node_result("echo"), 70)
+        self.assertEqual(results[4].state, ExecutionState.FAILED)
+        self.assertEqual((batch.stats.total, batch.stats.succeeded, batch.stats.failed), (10, 9, 1))
+        self.assertGreater(batch.stats.throughput, 0)
+        self.assertEqual(len({context.run_id for context in results.values()}), 10)
+        self.assertIsNotNone(flow.get_run(results[7].run_id))
+
+    async def test_run_many_surfaces_base_exceptions_instead_of_hanging(self):
+        class Abort(BaseException):
+            pass
+
+        class Aborting(Node):
+            async def run(self):
+                raise Abort()
+
+        batch = Flow(Aborting(id="aborting")).run_many([{}] * 3, concurrency=2)
+
+        async def consume():
+            return [item async for item in batch]
+
+        with self.assertRaises(Abort):
+            await asyncio.wait_for(consume(), timeout=2)
+
+    async def test_event_levels_control_recorded_events(self):
+        run_store = InMemoryRunStore()
+        counts = {}
+        for level in ("off", "flow", "node", "full"):
+            flow = Flow(StreamingNode(id="streaming"), run_store=run_store, event_level=level)
+            context = await flow.run(return_context=True)
+            events = run_store.list_events(context.run_id)
+            counts[level] = (len(context.events), len(context.node_events), len(events))
+            self.assertEqual(run_store.get_run(context.run_id).status, "succeeded")
+            self.assertEqual(context.store.get_node_result("streaming"), "hello")
+
+        self.assertEqual(counts["off"], (0, 0, 0))
+        self.assertEqual(counts["flow"], (2, 0, 2))
+        self.assertEqual(counts["node"], (2, 2, 4))
+        self.assertEqual(counts["full"], (2, 2, 6))
+
+    async def test_event_level_off_skips_node_observability(self):
+        flow = Flow(SuccessNode(id="success"), event_level="off")
+
+        with mock.patch.object(ExecutionContext, "record_node_event") as record:
+            await flow.run()
+
+        record.assert_not_called()
+
+    async def test_bounded_stream_drops_oldest_tokens_but_keeps_control_events(self):
+        flow = Flow(BurstNode(id="burst"))
+
+        events = []
+        async for event in flow.run_stream(max_queue_size=3, policy="drop_oldest"):
+            events.append(event)
+            await asyncio.sleep(0.01)
+
+        tokens = [event.data["text"] for event in events if event.event == "token"]
+        self.assertEqual(tokens[-3:], ["7", "8", "9"])
+        self.assertLess(len(tokens), 10)
+        self.assertEqual([event.event for event in events].count("node_state"), 2)
+        self.assertEqual([event.event for event in events].count("flow_state"), 2)
+        self.assertEqual(len(flow.last_execution.stream_events), 14)
+
+    async def test_bounded_stream_coalesces_token_backlog(self):
+        flow = Flow(BurstNode(id="burst"))
+
+        events = []
+        async for event in flow.run_stream(max_queue_size=2, policy="coalesce"):
+            events.append(event)
+            await asyncio.sleep(0.01)
+
+        text = "".join(event.data["text"] for event in events if event.event == "token")
+        self.assertEqual(text, "0123456789")
+        self.assertLess(len([event for event in events if event.event == "token"]), 10)
+
+    async def test_bounded_stream_blocks_async_emitters(self):
+        flow = Flow(PacedNode(id="paced"))
+
+        async for event in flow.run_stream(max_queue_size=2, policy="block"):
+            if event.event == "token":
+                self.assertLessEqual(flow.last_execution._stream_buffer.maxsize, 2)
+                self.assertLessEqual(len(flow.last_execution._stream_buffer._data), 2)
+            await asyncio.sleep(0.005)
+
+        tokens = [event.data["text"] for event in flow.last_execution.stream_events if event.event == "token"]
+        self.assertEqual(len(tokens), 10)
+
+    async def test_full_buffer_never_grows_past_maxsize(self):
+        def event(sequence_id, name="token", node_id="a"):
+            return RuntimeEvent("run", sequence_id, event=name, data={"text": "x"}, node_id=node_id)
+
+        for policy in ("block", "drop_oldest", "coalesce"):
+            buffer = StreamBuffer(maxsize=2, policy=policy)
+            # Neither tokens from alternating nodes nor custom events can be merged away.
+            for sequence_id in range(1, 9):
+                item = event(sequence_id, "progress" if sequence_id % 3 == 0 else "token", "ab"[sequence_id % 2])
+                try:
+                    buffer.put_nowait(item)
+                except asyncio.QueueFull:
+                    self.assertEqual(policy, "block")
+                self.assertLessEqual(len(buffer._data), 2, policy)
+            buffer.put_nowait(event(9, "node_state"))
+            self.assertEqual(len(buffer._control), 1)
+
+    async def test_sync_emitters_on_the_loop_do_not_fail_a_full_blocking_stream(self):
+        flow = Flow(BurstNode(id="burst"))
+
+        events = []
+        async for event in flow.run_stream(max_queue_size=2, policy="block"):
+            self.assertLessEqual(len(flow.last_execution._stream_buffer._data), 2)
+            events.append(event)
+            await asyncio.sleep(0.005)
+
+        self.assertEqual(flow.last_execution.state, ExecutionState.SUCCEEDED)
+        tokens = [event.data["text"] for event in events if event.event == "token"]
+        self.assertEqual(tokens, [str(index) for index in range(10)])
+
+    async def test_events_flushed_behind_a_coalesced_batch_wait_for_room(self):
+        class Typist(Node):
+            async def run(self):
+                for index in range(3):
+                    await self.emit_event_async("token", {"text": str(index)})
+                    # Flushes the pending token first, which takes the only slot.
+                    await self.emit_event_async("progress", {"step": index})
+                return "typed"
+
+        flow = Flow(Typist(id="typist"), coalesce={"token": CoalesceRule(window=10)})
+
+        events = []
+        async for event in flow.run_stream(max_queue_size=1, policy="block"):
+            self.assertLessEqual(len(flow.last_execution._stream_buffer._data), 1)
+            events.append(event)
+            await asyncio.sleep(0.005)
+
+        custom = [event for event in events if event.event in ("token", "progress")]
+        self.assertEqual([event.event for event in custom], ["token", "progress"] * 3)
+        sequence_ids = [event.sequence_id for event in custom]
+        self.assertEqual(sequence_ids, sorted(sequence_ids))
+
+    async def test_coalesced_tokens_match_between_stream_and_run_store(self):
+        run_store = InMemoryRunStore()
+        flow = Flow(
+            BurstNode(id="burst") >> StreamingNode(id="streaming"),
+            run_store=run_store,
+            coalesce={"token": CoalesceRule(window=0.05, max_size=4)},
+        )
+
+        events = [event async for event in flow.run_stream()]
+
+        tokens = [(event.node_id, event.data["text"]) for event in events if event.event == "token"]
+        self.assertEqual(tokens, [("burst", "0123"), ("burst", "4567"), ("burst", "89"), ("streaming", "hello")])
+        stored = run_store.list_events(flow.last_execution.run_id)
+        self.assertEqual([event.sequence_id for event in stored], [event.sequence_id for event in events])
+        self.assertEqual([event.sequence_id for event in events], list(range(1, len(events) + 1)))
+
+    async def test_coalesce_window_flushes_while_node_is_running(self):
+        class SlowTalker(Node):
+            async def run(self):
+                self.emit_event("token", {"text": "a"})
+                self.emit_event("token", {"text": "b"})
+                await asyncio.sleep(0.05)
+                self.emit_event("token", {"text": "c"})
+                return "done"
+
+        flow = Flow(SlowTalker(id="talker"), coalesce={"token": CoalesceRule(window=0.01)})
+
+        events = [event async for event in flow.run_stream()]
+
+        self.assertEqual([event.data["text"] for event in events if event.event == "token"], ["ab", "c"])
@@ -0,0 +1,155 @@
+import unittest
+
+from synthflow.core.condition import IF, SWITCH
+from synthflow.core.datastore import DataStore
+from synthflow.core.dsl import PARALLEL
+from synthflow.core.flow import Flow
+from synthflow.core.node import Node, ResultRef
+from synthflow.execution.plan import OP_BRANCH, OP_EXIT, OP_NODE, OP_PARALLEL, compile_plan
+
+
+class Increment(Node):
+    async def run(self, value=0):
+        return value + 1
+
+
+class ValueNode(Node):
+    async def run(self, value):
+        return value
+
+
+class Boom(Node):
+    async def run(self):
+        raise RuntimeError("boom")
+
+
+class ExecutionPlanTests(unittest.IsolatedAsyncioTestCase):
+    async def test_long_chain_runs_without_recursion(self):
+        count = 3000
+        nodes = [Increment(id="n0")]
+        for index in range(1, count):
+            nodes.append(Increment(id=f"n{index}").input(ResultRef(f"n{index - 1}")))
+        flow = Flow(nodes)
+
+        store = await flow.run()
+
+        self.assertEqual(len(flow.plan), count)
+        self.assertEqual(store.get_node_result(f"n{count - 1}"), count)
+
+    def test_compile_flattens_control_nodes(self):
+        start = (
+            ValueNode(id="seed").input(1)
+            >> IF(
+                condition=lambda store: True,
+                then_node=ValueNode(id="then").input("then"),
+                else_node=ValueNode(id="else").input("else"),
+                id="if_node",
+            )
+            >> PARALLEL(ValueNode(id="p1").input(1), ValueNode(id="p2").input(2), id="par")
+        )
+
+        plan = compile_plan(start)
+
+        self.assertEqual(
+            [step.op for step in plan.steps],
+            [OP_NODE, OP_BRANCH, OP_NODE, "jump", OP_NODE, OP_EXIT, OP_PARALLEL],
+        )
+        branch = plan.steps[1]
+        self.assertEqual(branch.table, {True: 2, False: 4})
+        self.assertEqual(len(plan.steps[-1].branches), 2)
+
+    def test_compile_rejects_cycles(self):
+        first = ValueNode(id="first").input(1)
+        second = ValueNode(id="second").input(2)
+        first.next_node = second
+        second.next_node = first
+
+        with self.assertRaises(ValueError):
+            compile_plan(first)
+
+    async def test_nested_branches_continue_after_exit(self):
+        flow = Flow(
+            ValueNode(id="selector").input("b")
+            >> SWITCH(
+                selector=lambda store: store.get_node_result("selector"),
+                cases={
+                    "a": ValueNode(id="case_a").input("A"),
+                    "b": IF(
+                        condition=lambda store: False,
+                        then_node=ValueNode(id="inner_then").input("then"),
+                        id="inner_if",
+                    )
+                    >> ValueNode(id="case_b").input("B"),
+                },
+                id="switch_node",
+            )
+            >> ValueNode(id="tail").input("tail")
+        )
+
+        store = await flow.run()
+
+        self.assertIsNone(store.get_node_result("case_a"))
+        self.assertIsNone(store.get_node_result("inner_then"))
+        self.assertEqual(store.get_node_result("case_b"), "B")
+        self.assertEqual(store.get_node_result("tail"), "tail")
+
+    async def test_branch_failure_is_reported_on_enclosing_control_node(self):
+        flow = Flow(IF(condition=lambda store: True, then_node=Boom(id="boom"), id="if_node"))
+
+        with self.assertRaises(RuntimeError):
+            await flow.run()
+
+        self.assertEqual(
+            [(event.node_id, event.state) for event in flow.last_execution.node_events],
+            [("if_node", "started"), ("boom", "started"), ("boom", "failed"), ("if_node", "failed")],
+        )
+
+    async def test_node_execute_runs_remaining_chain(self):
+        start = ValueNode(id="a").input(1) >> Increment(id="b").input(ResultRef("a"))
+
+        store = await start.execute(DataStore())
+
+        self.assertEqual(store.get_node_result("b"), 2)
+
+    async def test_flow_picks_up_wiring_added_after_construction(self):
+        start = ValueNode(id="a").input(1)
+        flow = Flow(start)
+        plan = flow.plan
+        start >> Increment(id="b").input(ResultRef("a"))
+
+        store = await flow.run()
+
+        self.assertIsNot(flow.plan, plan)
+        self.assertEqual(store.get_node_result("b"), 2)
+
+    async def test_flow_picks_up_rewired_branches(self):
+        branch = IF(condition=lambda store: True, then_node=ValueNode(id="old").input("old"), id="if_node")
+        flow = Flow(branch)
+        branch.then_node = ValueNode(id="new").input("new")
+
+        store = await flow.run()
+
+        self.assertIsNone(store.get_node_result("old"))
+        self.assertEqual(store.get_node_result("new"), "new")
+
+    async def test_unchanged_graph_keeps_its_plan(self):
+        flow = Flow(ValueNode(id="a").input(1) >> Increment(id="b").input(ResultRef("a")))
+        plan = flow.plan
+
+        await flow.run()
+        await flow.run()
+
+        self.assertIs(flow.plan, plan)
+
+    async def test_node_execute_reuses_its_plan_until_rewired(self):
+        start = ValueNode(id="a").input(1)
+        await start.execute(DataStore())
+        plan = start._execute_plan
+
+        await start.execute(DataStore())
+        self.assertIs(start._execute_plan, plan)
+
+        start >> Increment(id="b").input(ResultRef("a"))
+        store = await start.execute(DataStore())
+        self.assertIsNot(start._execute_plan, plan)
+        self.assertEqual(store.get_node_result("b"), 2)
@@ -0,0 +1,132 @@
+import asyncio
+import functools
+import os
+import threading
+import unittest
+
+from synthflow.core.flow import Flow
+from synthflow.core.node import Node, ResultRef
+from synthflow.plugins.retry import Retry
+
+
+class SyncParse(Node):
+    def run(self, payload):
+        self.emit_event("token", {"text": "parsed"})
+        return {"thread": threading.get_ident(), "size": len(payload)}
+
+
+class BlockingNode(Node):
+    def run(self):
+        threading.Event().wait(0.1)
+        return "blocked"
+
+
+class CpuSquare(Node):
+    executor = "process"
+
+    def run(self, value):
+        return {"pid": os.getpid(), "value": value * value}
+
+
+class AsyncInProcess(Node):
+    async def run(self, value):
+        return value + 1
+
+
+def traced(run):
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        return run(self, *args, **kwargs)
+
+    return wrapper
+
+
+class DecoratedAsync(Node):
+    @traced
+    async def run(self):
+        return asyncio.get_running_loop()
+
+
+class ReturnsCoroutine(Node):
+    executor = "thread"
+
+    def run(self):
+        return self._fetch()
+
+    async def _fetch(self):
+        return asyncio.get_running_loop()
+
+
+class FlakySync(Node):
+    def __init__(self, id=None):
+        super().__init__(id=id)
+        self.calls = 0
+
+    def run(self):
+        self.calls += 1
+        if self.calls < 2:
+            raise ValueError("retry me")
+        return "ok"
+
+
+class ExecutorTests(unittest.IsolatedAsyncioTestCase):
+    async def test_sync_node_runs_off_the_event_loop(self):
+        flow = Flow(SyncParse(id="parse").input("abc"))
+
+        events = [event async for event in flow.run_stream()]
+
+        result = flow.last_execution.store.get_node_result("parse")
+        self.assertNotEqual(result["thread"], threading.get_ident())
+        self.assertEqual(result["size"], 3)
+        self.assertIn("token", [event.event for event in events])
+
+    async def test_sync_node_does_not_block_concurrent_runs(self):
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(asyncio.get_running_loop().time())
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(Flow(BlockingNode(id="block")).run(), ticker())
+
+        self.assertEqual(len(ticks), 5)
+        self.assertLess(ticks[-1] - ticks[0], 0.09)
+
+    async def test_coroutines_run_on_the_callers_loop(self):
+        store = await Flow(DecoratedAsync(id="decorated") >> ReturnsCoroutine(id="returned")).run()
+
+        loop = asyncio.get_running_loop()
+        self.assertIs(store.get_node_result("decorated"), loop)
+        self.assertIs(store.get_node_result("returned"), loop)
+
+    async def test_exceptions_flow_through_plugins(self):
+        node = FlakySync(id="flaky").use(Retry(retries=1, delay=0))
+
+        store = await Flow(node).run()
+
+        self.assertEqual(store.get_node_result("flaky"), "ok")
+        self.assertEqual(node.calls, 2)
+
+    async def test_process_executor_runs_in_child_process(self):
+        flow = Flow(
+            CpuSquare(id="square").input(7)
+            >> AsyncInProcess(id="next").with_executor("process").input(ResultRef("square").map(lambda r: r["value"]))
+        )
+
+        store = await flow.run()
+
+        self.assertNotEqual(store.get_node_result("square")["pid"], os.getpid())
+        self.assertEqual(store.get_node_result("next"), 50)
+
+    async def test_process_executor_reports_unpicklable_arguments(self):
+        flow = Flow(CpuSquare(id="square").input(lambda: 1))
+
+        with self.assertRaises(TypeError) as caught:
+            await flow.run()
+
+        self.assertIn("square arguments cannot be sent to a process pool", str(caught.exception))
+
+    def test_unknown_executor_is_rejected(self):
+        with self.assertRaises(ValueError):
+            SyncParse(id="parse").with_executor("gpu")
@@ -1,6 +1,6 @@
 import unittest
 
-from synthflow.core.dsl import PARALLEL
+from synthflow.core.dsl import MAP, PARALLEL
 from synthflow.core.flow import Flow
 from synthflow.core.node import Node
 
@@ -44,3 +44,12 @@ class GraphvizOutputTests(unittest.TestCase):
         self.assertIn("Parallel(p1)", dot)
         self.assertIn("parallel-1", dot)
         self.assertIn("parallel-2", dot)
+
+    def test_to_graphviz_links_map_to_its_template(self):
+        flow = Flow(MAP([1, 2], A(id="item"), id="m1") >> C(id="c1"))
+        dot = flow.to_graphviz()
+
+        self.assertIn('n0 [label="Map(m1)"]', dot)
+        self.assertIn('n1 [label="A(item)"]', dot)
+        self.assertIn('n0 -> n1 [label="map"];', dot)
+        self.assertIn("C(c1)", dot)
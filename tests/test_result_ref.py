@@ -1,5 +1,6 @@
 import unittest
 
+from synthflow.core.datastore import MISSING, DataStore
 from synthflow.core.flow import Flow
 from synthflow.core.node import Node, ResultRef
 
@@ -9,11 +10,36 @@ class Produce(Node):
         return [10, 20, 30]
 
 
+class ProduceNone(Node):
+    async def run(self):
+        return None
+
+
+class Price:
+    pass
+
+
+class Quantity:
+    pass
+
+
+class ProduceTyped(Node):
+    outputs = [Price, Quantity]
+
+    async def run(self):
+        return (9.5, 3)
+
+
 class Consume(Node):
     async def run(self, value):
         return value
 
 
+class ConsumeMany(Node):
+    async def run(self, payload, constant, label=None):
+        return {"payload": payload, "constant": constant, "label": label}
+
+
 class ResultRefIndexTests(unittest.IsolatedAsyncioTestCase):
     async def test_output_index_zero_returns_first_item(self):
         flow = Flow(
@@ -37,3 +63,46 @@ class ResultRefIndexTests(unittest.IsolatedAsyncioTestCase):
         )
         with self.assertRaises(Exception):
             await flow.run()
+
+    async def test_none_result_resolves_instead_of_raising(self):
+        flow = Flow(
+            ProduceNone(id="producer")
+            >> Consume(id="consumer").input(ResultRef("producer"))
+        )
+        store = await flow.run()
+        self.assertTrue(store.has_node_result("consumer"))
+        self.assertIsNone(store.get_node_result("consumer"))
+
+    def test_lookup_result_uses_source_index(self):
+        store = DataStore()
+        producer = ProduceTyped(id="typed")
+        store.set(Price, 9.5, source=producer)
+        store.set(Quantity, 3, source=producer)
+
+        self.assertEqual(store.lookup_result("typed", Quantity), 3)
+        self.assertEqual(store.lookup_result("typed"), 9.5)
+        self.assertEqual(store.lookup_result("other", Quantity), 3)
+        self.assertIs(store.lookup_result("other"), MISSING)
+
+    async def test_chained_transforms_apply_in_order(self):
+        ref = ResultRef("producer").item(2).map(lambda value: value + 1).map(str)
+        self.assertEqual(len(ref.transforms), 3)
+
+        flow = Flow(Produce(id="producer") >> Consume(id="consumer").input(ref))
+        store = await flow.run()
+        self.assertEqual(store.get_node_result("consumer"), "31")
+
+    async def test_binder_fills_nested_refs_and_shares_constants(self):
+        constant = {"rows": [1, 2, 3]}
+        consumer = ConsumeMany(id="consumer").input(
+            {"first": ResultRef("producer").item(0), "rest": [ResultRef("producer", output_index=1), 99]},
+            constant,
+            label=("fixed", ResultRef("producer").item(2)),
+        )
+        flow = Flow(Produce(id="producer") >> consumer)
+
+        store = await flow.run()
+        result = store.get_node_result("consumer")
+        self.assertEqual(result["payload"], {"first": 10, "rest": [20, 99]})
+        self.assertEqual(result["label"], ("fixed", 30))
+        self.assertIs(result["constant"], constant)
@@ -0,0 +1,157 @@
+import os
+import pickle
+import tempfile
+import unittest
+from collections import Counter
+
+from synthflow.core.condition import IF
+from synthflow.core.dsl import PARALLEL
+from synthflow.core.flow import Flow
+from synthflow.core.node import Node, ResultRef
+from synthflow.runtime.segments import SegmentedRunStore
+from synthflow.runtime.sqlite import SQLiteRunStore
+from synthflow.runtime.store import InMemoryRunStore
+from synthflow.runtime.writebehind import WriteBehindRunStore
+
+
+class Total(int):
+    pass
+
+
+class Step(Node):
+    # Records every call; fails while its id is listed in `failing`.
+    outputs = []
+
+    def __init__(self, calls, failing, id=None, **params):
+        super().__init__(id=id, **params)
+        self.calls = calls
+        self.failing = failing
+
+    async def run(self, *values):
+        self.calls[self.id] += 1
+        if self.id in self.failing:
+            self.failing.discard(self.id)
+            raise RuntimeError(f"{self.id} failed")
+        return sum(values) + 1
+
+
+class Seed(Step):
+    outputs = [Total]
+
+
+def build(calls, failing, **options):
+    return Flow(
+        Seed(calls, failing, id="a").input(ResultRef("start"))
+        >> PARALLEL(
+            Step(calls, failing, id="b").input(ResultRef("a")),
+            Step(calls, failing, id="c").input(ResultRef("a")),
+            id="fan",
+        )
+        >> IF(
+            lambda store: store.get_node_result("b") > 0,
+            Step(calls, failing, id="d").input(ResultRef("c")) >> Step(calls, failing, id="e").input(ResultRef("d")),
+            id="check",
+        )
+        >> Step(calls, failing, id="f").input(ResultRef("e"), ResultRef("a")),
+        checkpoint=True,
+        **options,
+    )
+
+
+class ResumeTests(unittest.IsolatedAsyncioTestCase):
+    async def test_resume_skips_succeeded_nodes_across_parallel_and_if(self):
+        calls = Counter()
+        flow = build(calls, {"c", "e"})
+
+        with self.assertRaises(RuntimeError):
+            await flow.run(inputs={"start": 10})
+        run_id = flow.last_execution.run_id
+        with self.assertRaises(RuntimeError):
+            await flow.resume(run_id)
+        store = await flow.resume(run_id)
+
+        self.assertEqual(store.get_node_result("f"), 26)
+        # Typed outputs are restored along with node results.
+        self.assertEqual(store.get_from_node("a", Total), 11)
+        self.assertEqual(calls, Counter({"a": 1, "b": 1, "c": 2, "d": 1, "e": 2, "f": 1}))
+        run = flow.get_run(run_id)
+        self.assertEqual((run.status, run.error), ("succeeded", None))
+        sequence_ids = [event.sequence_id for event in flow.get_run_events(run_id)]
+        self.assertEqual(sequence_ids, list(range(1, len(sequence_ids) + 1)))
+        with self.assertRaises(ValueError):
+            await flow.resume(run_id)
+        self.assertEqual(flow.run_store.load_checkpoints(run_id), {})
+
+    async def test_runs_without_checkpointing_do_not_save_checkpoints(self):
+        calls = Counter()
+        flow = build(calls, set())
+        flow.checkpoint = False
+        context = await flow.run(inputs={"start": 1}, return_context=True)
+        self.assertEqual(flow.run_store.load_checkpoints(context.run_id), {})
+
+    async def test_runs_without_checkpoints_cannot_be_resumed(self):
+        calls = Counter()
+        flow = build(calls, {"a"})
+        flow.checkpoint = False
+        with self.assertRaises(RuntimeError):
+            await flow.run(inputs={"start": 10})
+
+        with self.assertRaisesRegex(ValueError, "no checkpoints"):
+            await flow.resume(flow.last_execution.run_id)
+        self.assertEqual(calls["a"], 1)
+
+    async def test_first_node_failure_resumes_with_seeded_inputs(self):
+        calls = Counter()
+        flow = build(calls, {"a"})
+        with self.assertRaises(RuntimeError):
+            await flow.run(inputs={"start": 10})
+
+        store = await flow.resume(flow.last_execution.run_id)
+
+        self.assertEqual(store.get_node_result("f"), 26)
+        self.assertEqual(calls["a"], 2)
+
+    async def test_succeeded_runs_drop_their_checkpoints_in_every_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            stores = {
+                "memory": InMemoryRunStore(),
+                "sqlite": SQLiteRunStore(os.path.join(directory, "runs.db")),
+                "segments": SegmentedRunStore(os.path.join(directory, "segments")),
+                "write-behind": WriteBehindRunStore(InMemoryRunStore()),
+            }
+            for name, run_store in stores.items():
+                with self.subTest(name):
+                    flow = build(Counter(), set(), run_store=run_store)
+                    context = await flow.run(inputs={"start": 1}, return_context=True)
+                    self.assertEqual(run_store.load_checkpoints(context.run_id), {})
+            for run_store in list(stores.values())[1:]:
+                run_store.close()
+
+    async def test_resume_from_a_reopened_sqlite_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "runs.db")
+            calls = Counter()
+            with SQLiteRunStore(path) as run_store:
+                flow = build(calls, {"f"}, run_store=run_store)
+                with self.assertRaises(RuntimeError):
+                    await flow.run(inputs={"start": 10})
+                run_id = flow.last_execution.run_id
+                (payload,) = run_store._conn.execute(
+                    "SELECT payload FROM checkpoints WHERE node_id = 'a'"
+                ).fetchone()
+
+            with SQLiteRunStore(path) as run_store:
+                store = await build(calls, set(), run_store=run_store).resume(run_id)
+                snapshot = run_store.get_snapshot(run_id)
+
+        self.assertEqual(store.get_node_result("f"), 26)
+        self.assertEqual(calls["a"], 1)
+        self.assertEqual(calls["f"], 2)
+        self.assertEqual(snapshot.status, "succeeded")
+        self.assertEqual(snapshot.node_statuses["f"], "succeeded")
+        # Type keys are stored by name, not as pickled class references.
+        self.assertEqual(pickle.loads(payload)[3], [(True, f"{Total.__module__}:Total", 11)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from synthflow.core.flow import Flow
+from synthflow.core.node import Node
+from synthflow.runtime.log import EventLog, EventRetention
+from synthflow.runtime.models import NodeCheckpoint, RunClock, RunRecord, RuntimeEvent
+from synthflow.runtime.store import InMemoryRunStore, RunRetention
+
+
+class Talker(Node):
+    async def run(self):
+        for index in range(5):
+            self.emit_event("token", {"text": str(index)})
+        return "said"
+
+
+def make_event(sequence_id, event="token", node_id="n", data=None, run_id="r"):
+    return RuntimeEvent(run_id=run_id, sequence_id=sequence_id, timestamp=None, event=event, data=data, node_id=node_id)
+
+
+def start_run(store, run_id, events=0):
+    store.create_run(RunRecord(run_id=run_id, flow_name="Flow", status="running"))
+    for sequence_id in range(1, events + 1):
+        store.append_event(make_event(sequence_id, data={"text": "x" * 100}, run_id=run_id))
+
+
+class EventLogTests(unittest.TestCase):
+    def test_ring_buffer_keeps_newest_events(self):
+        log = EventLog(EventRetention(max_events=3))
+        for sequence_id in range(1, 11):
+            log.append(make_event(sequence_id))
+
+        self.assertEqual([event.sequence_id for event in log], [8, 9, 10])
+        self.assertEqual(len(log), 3)
+
+    def test_token_payloads_dropped_when_node_finishes(self):
+        log = EventLog(EventRetention(drop_token_payloads=True))
+        token = make_event(1, data={"text": "hi"})
+        log.append(token)
+        log.append(make_event(2, data={"text": "!"}, node_id="other"))
+        log.append(make_event(3, event="node_state", data={"state": "succeeded", "message": ""}))
+
+        events = log.events()
+        self.assertIsNone(events[0].data)
+        self.assertEqual(events[1].data, {"text": "!"})
+        # The original object handed to live consumers is left intact.
+        self.assertEqual(token.data, {"text": "hi"})
+
+
+class EventPagingTests(unittest.TestCase):
+    def test_pages_follow_cursor_to_the_tail(self):
+        store = InMemoryRunStore()
+        start_run(store, "r")
+        for sequence_id in range(1, 11):
+            store.append_event(make_event(sequence_id))
+
+        first = store.page_events("r", limit=4)
+        second = store.page_events("r", after_sequence_id=first.next_cursor, limit=4)
+        last = store.page_events("r", after_sequence_id=8, limit=4)
+        idle = store.page_events("r", after_sequence_id=last.next_cursor, limit=4)
+
+        self.assertEqual([event.sequence_id for event in first.events], [1, 2, 3, 4])
+        self.assertTrue(first.has_more)
+        self.assertEqual([event.sequence_id for event in second.events], [5, 6, 7, 8])
+        self.assertEqual(([event.sequence_id for event in last.events], last.has_more), ([9, 10], False))
+        self.assertEqual((idle.events, idle.next_cursor), ([], 10))
+
+    def test_cursor_before_retained_window_starts_at_oldest_kept(self):
+        store = InMemoryRunStore(retention=EventRetention(max_events=3))
+        start_run(store, "r")
+        for sequence_id in range(1, 11):
+            store.append_event(make_event(sequence_id))
+
+        page = store.page_events("r", after_sequence_id=2)
+        self.assertEqual([event.sequence_id for event in page.events], [8, 9, 10])
+        self.assertEqual([event.sequence_id for event in store.list_events("r", after_sequence_id=9)], [10])
+
+
+class SnapshotTests(unittest.IsolatedAsyncioTestCase):
+    async def test_snapshot_tracks_nodes_beyond_retained_events(self):
+        run_store = InMemoryRunStore(retention=EventRetention(max_events=2))
+        flow = Flow([Talker(id="first"), Talker(id="second")], run_store=run_store)
+
+        context = await flow.run(return_context=True)
+        snapshot = run_store.get_snapshot(context.run_id)
+
+        self.assertEqual(snapshot.completed_nodes, ["first", "second"])
+        self.assertEqual(snapshot.node_statuses, {"first": "succeeded", "second": "succeeded"})
+        self.assertEqual(set(snapshot.node_started_at), {"first", "second"})
+        self.assertLessEqual(snapshot.node_started_at["first"], snapshot.node_finished_at["first"])
+        self.assertLessEqual(snapshot.node_finished_at["first"], snapshot.node_started_at["second"])
+        self.assertEqual(snapshot.last_sequence_id, context.stream_events[-1].sequence_id)
+
+
+class RunRetentionTests(unittest.TestCase):
+    def test_max_runs_evicts_least_recently_read_finished_run(self):
+        store = InMemoryRunStore(run_retention=RunRetention(max_runs=2))
+        start_run(store, "a")
+        start_run(store, "b")
+        store.update_run("a", status="succeeded")
+        store.update_run("b", status="succeeded")
+        store.get_run("a")
+
+        start_run(store, "c")
+
+        self.assertIsNone(store.get_run("b"))
+        self.assertIsNotNone(store.get_run("a"))
+        self.assertEqual((store.resident_runs, store.evicted_runs), (2, 1))
+
+    def test_oldest_finished_and_running_runs_are_kept(self):
+        store = InMemoryRunStore(run_retention=RunRetention(max_runs=1, evict="oldest_finished"))
+        start_run(store, "a")
+        start_run(store, "b")
+        self.assertEqual(store.resident_runs, 2)
+
+        store.update_run("b", status="failed")
+        self.assertIsNone(store.get_run("b"))
+        self.assertEqual(store.get_run("a").status, "running")
+
+    def test_ttl_expires_finished_runs(self):
+        store = InMemoryRunStore(run_retention=RunRetention(ttl_seconds=0))
+        start_run(store, "a", events=3)
+        store.update_run("a", status="succeeded")
+
+        self.assertIsNone(store.get_snapshot("a"))
+        self.assertEqual(store.list_events("a"), [])
+        self.assertEqual((store.expired_runs, store.resident_event_bytes), (1, 0))
+
+    def test_writes_for_unknown_or_evicted_runs_are_dropped(self):
+        store = InMemoryRunStore(run_retention=RunRetention(max_runs=1))
+        start_run(store, "a")
+        store.update_run("a", status="succeeded")
+        start_run(store, "b")
+
+        store.append_event(make_event(1, run_id="a"))
+        store.save_checkpoint("a", NodeCheckpoint("n", result=1, has_result=True))
+        store.append_event(make_event(1, run_id="never-created"))
+
+        self.assertEqual(store.resident_runs, 1)
+        self.assertEqual((store.list_events("a"), store.load_checkpoints("a")), ([], {}))
+        self.assertEqual(store.resident_event_bytes, 0)
+
+    def test_event_byte_budget_evicts_finished_runs(self):
+        store = InMemoryRunStore(run_retention=RunRetention(max_event_bytes=8_000))
+        start_run(store, "old", events=10)
+        store.update_run("old", status="succeeded")
+        used = store.resident_event_bytes
+
+        start_run(store, "live", events=20)
+
+        self.assertGreater(used, 0)
+        self.assertIsNone(store.get_run("old"))
+        self.assertEqual(len(store.list_events("live")), 20)
+        self.assertEqual(store.evicted_runs, 1)
+
+
+class EventModelTests(unittest.TestCase):
+    def test_timestamp_derived_from_run_clock(self):
+        anchor = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        clock = RunClock(anchor, monotonic_ns=1_000)
+        event = RuntimeEvent("r", 1, event="token", monotonic_ns=2_501_000, clock=clock)
+
+        self.assertFalse(hasattr(event, "__dict__"))
+        self.assertEqual(event.timestamp, anchor + timedelta(milliseconds=2.5))
+        self.assertEqual(RuntimeEvent("r", 1, anchor, "token").timestamp, anchor)
+
+    def test_store_returns_records_without_copying_per_read(self):
+        store = InMemoryRunStore()
+        store.create_run(RunRecord(run_id="r", flow_name="Flow", status="running"))
+        store.append_event(make_event(1))
+
+        first = store.get_run("r")
+        self.assertIs(store.get_run("r"), first)
+        self.assertEqual((first.last_sequence_id, first.current_node_id), (1, "n"))
+
+        store.append_event(make_event(2, node_id="m"))
+        self.assertEqual(store.get_run("r").current_node_id, "m")
+        self.assertEqual(first.current_node_id, "n")
+
+
+class RunStoreRetentionTests(unittest.IsolatedAsyncioTestCase):
+    async def test_flow_default_store_bound_is_configurable(self):
+        flow = Flow(Talker(id="talker"), max_runs=2)
+        run_ids = [(await flow.run(return_context=True)).run_id for _ in range(3)]
+
+        self.assertIsNone(flow.get_run(run_ids[0]))
+        self.assertEqual(flow.run_store.resident_runs, 2)
+        self.assertIsNone(Flow(Talker(id="talker"), max_runs=None).run_store.run_retention.max_runs)
+
+    async def test_context_and_store_share_event_objects(self):
+        run_store = InMemoryRunStore()
+        flow = Flow(Talker(id="talker"), run_store=run_store)
+
+        context = await flow.run(return_context=True)
+
+        stored = run_store.list_events(context.run_id)
+        self.assertEqual(len(stored), len(context.stream_events))
+        self.assertTrue(all(a is b for a, b in zip(stored, context.stream_events)))
+        self.assertEqual([event.state for event in context.node_events], ["started", "succeeded"])
+
+    async def test_store_and_context_retention_are_bounded(self):
+        run_store = InMemoryRunStore(retention=EventRetention(max_events=4))
+        flow = Flow(Talker(id="talker"), run_store=run_store, event_retention=EventRetention(drop_token_payloads=True))
+
+        events = [event async for event in flow.run_stream()]
+        context = flow.last_execution
+
+        self.assertEqual([event.data["text"] for event in events if event.event == "token"], list("01234"))
+        self.assertEqual(len(run_store.list_events(context.run_id)), 4)
+        self.assertTrue(all(event.data is None for event in context.stream_events if event.event == "token"))
+        self.assertEqual(run_store.get_snapshot(context.run_id).completed_nodes, ["talker"])
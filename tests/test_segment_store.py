@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from synthflow.core.flow import Flow
+from synthflow.core.node import Node
+from synthflow.runtime.segments import SegmentedRunStore
+
+
+class Talker(Node):
+    async def run(self):
+        for index in range(200):
+            self.emit_event("token", {"text": str(index)})
+        return "said"
+
+
+class SegmentedRunStoreTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def test_events_rotate_and_survive_reopening(self):
+        with SegmentedRunStore(self.path, segment_bytes=4096, index_every=8) as run_store:
+            flow = Flow([Talker(id="first"), Talker(id="second")], run_store=run_store)
+            first = await flow.run(return_context=True)
+            second = await flow.run(return_context=True)
+            self.assertGreater(run_store.segment_count, 2)
+            page = run_store.page_events(second.run_id, after_sequence_id=150, limit=5)
+
+        self.assertEqual([event.sequence_id for event in page.events], [151, 152, 153, 154, 155])
+        self.assertTrue(page.has_more)
+
+        with SegmentedRunStore(self.path, segment_bytes=4096) as reopened:
+            self.assertEqual(reopened.list_events(first.run_id), first.stream_events)
+            self.assertEqual(reopened.list_events(second.run_id, after_sequence_id=400), second.stream_events[400:])
+            snapshot = reopened.get_snapshot(second.run_id)
+            self.assertEqual(reopened.get_run(first.run_id).status, "succeeded")
+
+        self.assertEqual(snapshot.completed_nodes, ["first", "second"])
+        self.assertEqual(snapshot.last_sequence_id, second.stream_events[-1].sequence_id)
+        self.assertLessEqual(snapshot.node_finished_at["first"], snapshot.node_started_at["second"])
+
+    async def test_compaction_drops_deleted_runs(self):
+        with SegmentedRunStore(self.path, segment_bytes=4096) as run_store:
+            flow = Flow(Talker(id="talker"), run_store=run_store)
+            dropped = await flow.run(return_context=True)
+            kept = await flow.run(return_context=True)
+            segments = run_store.segment_count
+
+            run_store.delete_run(dropped.run_id)
+            self.assertGreater(run_store.garbage_bytes, 0)
+            reclaimed = run_store.compact()
+
+            self.assertGreater(reclaimed, 0)
+            self.assertLess(run_store.segment_count, segments)
+            self.assertEqual(run_store.list_events(kept.run_id), kept.stream_events)
+
+        with SegmentedRunStore(self.path) as reopened:
+            self.assertIsNone(reopened.get_run(dropped.run_id))
+            self.assertEqual(reopened.list_events(dropped.run_id), [])
+            self.assertEqual(reopened.list_events(kept.run_id), kept.stream_events)
+
+    async def test_torn_tail_record_is_discarded(self):
+        with SegmentedRunStore(self.path) as run_store:
+            context = await Flow(Talker(id="talker"), run_store=run_store).run(return_context=True)
+            active = run_store._segments[-1].path
+
+        size = os.path.getsize(active)
+        with open(active, "ab") as handle:
+            handle.write(b"\x40\x00\x00\x00partial")
+
+        with SegmentedRunStore(self.path) as reopened:
+            self.assertEqual(reopened.list_events(context.run_id), context.stream_events)
+        self.assertEqual(os.path.getsize(active), size)
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+from synthflow.core.flow import Flow
+from synthflow.core.node import Node
+from synthflow.runtime.models import ArtifactRecord
+from synthflow.runtime.sqlite import SQLiteRunStore
+
+
+class Talker(Node):
+    async def run(self):
+        for index in range(50):
+            self.emit_event("token", {"text": str(index)})
+        return "said"
+
+
+class Broken(Node):
+    async def run(self):
+        raise ValueError("boom")
+
+
+class SQLiteRunStoreTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "runs.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    async def test_run_survives_reopening_the_database(self):
+        with SQLiteRunStore(self.path, batch_size=16) as run_store:
+            flow = Flow([Talker(id="talker"), Broken(id="broken")], run_store=run_store)
+            with self.assertRaises(ValueError):
+                await flow.run()
+            context = flow.last_execution
+            run_store.update_run(context.run_id, artifacts=[ArtifactRecord("a1", "report", "ready")])
+            live_events = list(context.stream_events)
+            # Group commit: far fewer transactions than events.
+            self.assertLess(run_store.commits, len(live_events) // 4)
+
+        with SQLiteRunStore(self.path) as reopened:
+            run = reopened.get_run(context.run_id)
+            events = reopened.list_events(context.run_id)
+            snapshot = reopened.get_snapshot(context.run_id)
+
+        self.assertEqual(run.status, "failed")
+        self.assertEqual(run.started_at, context.started_at)
+        self.assertEqual(run.artifacts[0].name, "report")
+        self.assertEqual(events, live_events)
+        self.assertEqual(snapshot.node_statuses, {"talker": "succeeded", "broken": "failed"})
+        self.assertEqual(snapshot.failed_nodes, ["broken"])
+        self.assertEqual(snapshot.last_sequence_id, live_events[-1].sequence_id)
+        self.assertLessEqual(snapshot.node_finished_at["talker"], snapshot.node_started_at["broken"])
+
+    async def test_pages_by_sequence_id(self):
+        with SQLiteRunStore(self.path) as run_store:
+            context = await Flow(Talker(id="talker"), run_store=run_store).run(return_context=True)
+
+            first = run_store.page_events(context.run_id, limit=10)
+            rest = run_store.page_events(context.run_id, after_sequence_id=first.next_cursor)
+
+        self.assertTrue(first.has_more)
+        self.assertEqual([event.sequence_id for event in first.events], list(range(1, 11)))
+        self.assertFalse(rest.has_more)
+        self.assertEqual(rest.events[0].sequence_id, 11)
+        self.assertEqual(rest.next_cursor, context.stream_events[-1].sequence_id)
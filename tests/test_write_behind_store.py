@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from synthflow.core.flow import Flow
+from synthflow.core.node import Node
+from synthflow.runtime.models import RunRecord
+from synthflow.runtime.store import InMemoryRunStore
+from synthflow.runtime.writebehind import WriteBehindRunStore
+
+
+class Talker(Node):
+    async def run(self):
+        for index in range(20):
+            self.emit_event("token", {"text": str(index)})
+        return "said"
+
+
+class SlowStore(InMemoryRunStore):
+    def append_event(self, event):
+        time.sleep(0.005)
+        super().append_event(event)
+
+
+class FailingStore(InMemoryRunStore):
+    def append_event(self, event):
+        raise OSError("disk full")
+
+
+class WriteBehindRunStoreTests(unittest.IsolatedAsyncioTestCase):
+    async def test_run_does_not_wait_for_slow_persistence(self):
+        run_store = WriteBehindRunStore(SlowStore())
+        flow = Flow(Talker(id="talker"), run_store=run_store)
+
+        started = time.perf_counter()
+        context = await flow.run(return_context=True)
+        elapsed = time.perf_counter() - started
+
+        # ~25 events at 5ms each would take ~125ms if appends were synchronous.
+        self.assertLess(elapsed, 0.06)
+        self.assertGreater(run_store.pending, 0)
+        self.assertGreater(run_store.flush_lag, 0)
+
+        await run_store.aflush()
+        self.assertEqual((run_store.pending, run_store.flush_lag), (0, 0.0))
+        self.assertEqual(run_store.store.list_events(context.run_id), context.stream_events)
+        self.assertEqual(run_store.get_run(context.run_id).status, "succeeded")
+        self.assertGreater(run_store.max_flush_lag, 0)
+        await run_store.aclose()
+
+    def test_update_run_returns_none_until_read_back(self):
+        with WriteBehindRunStore(InMemoryRunStore()) as run_store:
+            run_store.create_run(RunRecord(run_id="r", flow_name="Flow", status="running"))
+
+            self.assertIsNone(run_store.update_run("r", status="succeeded"))
+            self.assertEqual(run_store.get_run("r").status, "succeeded")
+
+    async def test_persistence_errors_surface_on_flush(self):
+        run_store = WriteBehindRunStore(FailingStore())
+        await Flow(Talker(id="talker"), run_store=run_store).run()
+
+        with self.assertRaises(RuntimeError) as caught:
+            await run_store.aclose()
+        self.assertIsInstance(caught.exception.__cause__, OSError)
+
+    async def test_subscribers_replay_without_blocking_the_loop(self):
+        run_store = WriteBehindRunStore(SlowStore())
+        flow = Flow(Talker(id="talker"), run_store=run_store)
+        context = await flow.run(return_context=True)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        started = time.perf_counter()
+        subscription = flow.subscribe(context.run_id)
+        # The existence check answers from the queue instead of flushing ~125ms of writes.
+        self.assertLess(time.perf_counter() - started, 0.02)
+        events = [event async for event in subscription]
+        task.cancel()
+
+        self.assertEqual(events, context.stream_events)
+        self.assertGreater(ticks, 5)
+        await run_store.aclose()
+
+    def test_writes_racing_close_are_applied_or_refused(self):
+        run_store = WriteBehindRunStore(InMemoryRunStore())
+        accepted = []
+
+        def writer(prefix):
+            for index in range(2000):
+                run_id = f"{prefix}-{index}"
+                try:
+                    run_store.create_run(RunRecord(run_id=run_id, flow_name="Flow", status="running"))
+                except RuntimeError:
+                    return
+                accepted.append(run_id)
+
+        threads = [threading.Thread(target=writer, args=(name,)) for name in "abcd"]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.002)
+        run_store.close()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([run_id for run_id in accepted if run_store.store.get_run(run_id) is None], [])